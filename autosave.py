@@ -0,0 +1,70 @@
+# autosave.py
+# Background saving so slow disks don't stall the UI at day change.
+#
+# Each character has a single pending slot: a save submitted while an older
+# one for the same character is still waiting replaces it, so a burst of saves
+# costs one write. Characters are copied when submitted, and the worker only
+# ever writes that copy, so the game can keep changing the live object.
+import threading
+
+import saves
+
+def snapshot_character(character):
+    """Copy of the character that shares no mutable state with it.
+
+    Treasure objects are shared on purpose: the save journal recognises
+    already-saved treasures by identity.
+    """
+    return character.copy()
+
+class SaveWorker:
+    def __init__(self, dispatch=None, save=None):
+        # dispatch(fn) runs fn on the thread that should see save results;
+        # by default callbacks run on the worker thread itself
+        self.dispatch = dispatch or (lambda fn: fn())
+        self.save = save or saves.save_character
+        self.pending = {}  # Character name -> (snapshot, callbacks)
+        self.busy = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def submit(self, character, on_done=None):
+        """Queue a save of the character's current state.
+
+        on_done(ok, error) is called through dispatch once it's written.
+        """
+        snapshot = snapshot_character(character)
+        with self.condition:
+            callbacks = self.pending.pop(character.name, (None, []))[1]
+            if on_done:
+                callbacks.append(on_done)
+            self.pending[character.name] = (snapshot, callbacks)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="save-worker", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until every queued save has been written."""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+                name = next(iter(self.pending))
+                snapshot, callbacks = self.pending.pop(name)
+                self.busy = True
+
+            error = None
+            try:
+                self.save(snapshot)
+            except Exception as e:
+                error = e
+
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+            for callback in callbacks:
+                self.dispatch(lambda cb=callback: cb(error is None, error))
@@ -0,0 +1,89 @@
+# batch_sim.py
+# Vectorized version of engine.process_member_activities for balance sweeps.
+# Rolls for every camp, member and AP point are drawn at once as NumPy arrays,
+# so only aggregate numbers come back - no per-adventure report text.
+from dataclasses import dataclass
+
+import numpy as np
+
+import engine
+
+MEMBER_TYPES = [v['type'] for v in engine.VISITOR_TYPES]
+OUTCOMES = ['good', 'neutral', 'bad']
+NO_MEMBER = -1  # Mode code used to pad camps with fewer members
+
+_GATHER = engine.MEMBER_MODES.index('gather')
+_ADVENTURE = engine.MEMBER_MODES.index('adventure')
+
+_GATHER_CHANCE = np.array([engine.member_gather_chance(t) for t in MEMBER_TYPES])
+_ADVENTURE_CHANCE = np.array([engine.member_adventure_chance(t) for t in MEMBER_TYPES])
+
+@dataclass
+class BatchResult:
+    gathered: np.ndarray  # (camps, 3) resource deltas, ordered like engine.GATHERABLE_RESOURCES
+    outcomes: np.ndarray  # (camps, 3) adventure counts, ordered like OUTCOMES
+
+    def gathered_dict(self, camp: int) -> dict:
+        return dict(zip(engine.GATHERABLE_RESOURCES, self.gathered[camp].tolist()))
+
+    def outcomes_dict(self, camp: int) -> dict:
+        return dict(zip(OUTCOMES, self.outcomes[camp].tolist()))
+
+def camp_arrays(camps):
+    """Pack a list of camp_members lists into padded (types, modes, ap) arrays."""
+    width = max((len(members) for members in camps), default=0)
+    types = np.zeros((len(camps), width), dtype=np.int8)
+    modes = np.full((len(camps), width), NO_MEMBER, dtype=np.int8)
+    ap = np.zeros((len(camps), width), dtype=np.int16)
+
+    for i, members in enumerate(camps):
+        for j, member in enumerate(members):
+            types[i, j] = MEMBER_TYPES.index(member['type'])
+            modes[i, j] = engine.MEMBER_MODES.index(member['mode'])
+            ap[i, j] = member['ap']
+    return types, modes, ap
+
+def simulate_member_activities(types, modes, ap, rng=None) -> BatchResult:
+    """Run one day of member jobs for many camps at once.
+
+    types, modes and ap are (camps, members) integer arrays as built by
+    camp_arrays. rng may be a seed or a numpy Generator.
+    """
+    rng = np.random.default_rng(rng)
+    types = np.asarray(types)
+    modes = np.asarray(modes)
+    ap = np.asarray(ap)
+    n_camps = types.shape[0]
+    max_ap = int(ap.max()) if ap.size else 0
+
+    # Gathering: one attempt per AP point
+    steps = np.arange(max_ap)
+    active = (modes == _GATHER)[..., None] & (steps < ap[..., None])
+    shape = active.shape
+    resource = rng.integers(0, len(engine.GATHERABLE_RESOURCES), size=shape)
+    success = rng.random(shape) < _GATHER_CHANCE[types][..., None]
+    amount = rng.integers(1, 3, size=shape) * (active & success)
+
+    gathered = np.empty((n_camps, len(engine.GATHERABLE_RESOURCES)), dtype=np.int64)
+    for r in range(len(engine.GATHERABLE_RESOURCES)):
+        gathered[:, r] = (amount * (resource == r)).sum(axis=(1, 2))
+
+    # Adventures: one per 2 AP
+    steps = np.arange(max_ap // engine.ADVENTURE_AP_COST)
+    active = (modes == _ADVENTURE)[..., None] & (steps < (ap // engine.ADVENTURE_AP_COST)[..., None])
+    shape = active.shape
+    good = rng.random(shape) < _ADVENTURE_CHANCE[types][..., None]
+    neutral = ~good & (rng.random(shape) < engine.MEMBER_NEUTRAL_CHANCE)
+    bad = ~good & ~neutral
+
+    outcomes = np.stack([
+        (good & active).sum(axis=(1, 2)),
+        (neutral & active).sum(axis=(1, 2)),
+        (bad & active).sum(axis=(1, 2))
+    ], axis=1)
+
+    return BatchResult(gathered, outcomes)
+
+def simulate_camps(camps, rng=None) -> BatchResult:
+    """Convenience wrapper taking camp_members lists straight from characters."""
+    return simulate_member_activities(*camp_arrays(camps), rng=rng)
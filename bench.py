@@ -0,0 +1,217 @@
+# bench.py
+# Benchmarks for the game logic's hot paths, with a stored baseline to
+# compare against.
+#
+# Each benchmark builds its inputs once and returns a function to time plus
+# how many operations one call performs, so results are per operation
+# (one outcome roll, one day end, one save and load). The best of several
+# rounds is kept, which is the number least disturbed by other load.
+#
+#   python bench.py                 run everything and print the results
+#   python bench.py --save          run and write the baseline file
+#   python bench.py --compare       run and flag anything slower than the
+#                                   baseline by more than --threshold
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import catalog
+import engine
+import saves
+from character import CHARACTER_PRESETS, MEMBER_MODES
+
+BASELINE_FILE = Path(__file__).with_name('bench_baseline.json')
+DEFAULT_THRESHOLD = 0.10  # Fraction slower than the baseline that counts as a regression
+MIN_ROUND_TIME = 0.1  # Seconds per timed round
+ROUNDS = 5
+
+BENCHMARKS = {}  # Name -> function returning (callable, operations per call)
+
+def benchmark(name, **params):
+    """Register a benchmark. Given a list of values for a parameter, one
+    benchmark is registered per value, named e.g. "name[members=10]"."""
+    def register(func):
+        if not params:
+            BENCHMARKS[name] = func
+            return func
+        (param, values), = params.items()
+        for value in values:
+            BENCHMARKS[f"{name}[{param}={value}]"] = (lambda v: lambda: func(v))(value)
+        return func
+    return register
+
+def _character(rng, members=0, treasures=0):
+    character = engine.new_character("Bench", "Jack of All Trades")
+    for resource in character.resources:
+        character.resources[resource] = 50
+    for i in range(members):
+        character.camp_members.add(f"Member {i}", rng.choice(['Survivor', 'Scout', 'Trader']),
+                                   MEMBER_MODES[i % len(MEMBER_MODES)], 6)
+    locations = [location for location in catalog.CATALOG if location != catalog.TRADER]
+    for _ in range(treasures):
+        character.treasures.append(catalog.sample(rng.choice(locations), rng).make(rng.randint(1, 30)))
+    return character
+
+# --- Benchmarks ---
+
+@benchmark('character_from_presets')
+def _presets():
+    names = list(CHARACTER_PRESETS)
+
+    def run():
+        for name in names:
+            engine.new_character("Bench", name)
+    return run, len(names)
+
+@benchmark('determine_outcome')
+def _determine_outcome():
+    rng = random.Random(0)
+    base = _character(rng)
+    plan = [(location_type, location)
+            for location_type, locations in engine.LOCATIONS.items()
+            for location in locations] * 20
+
+    def run():
+        # A fresh copy each call so found treasures don't pile up between rounds
+        character = base.copy()
+        for location_type, location in plan:
+            engine.determine_outcome(character, location_type, location, rng)
+    return run, len(plan)
+
+@benchmark('process_member_activities', members=[1, 10, 100, 1000])
+def _member_activities(members):
+    rng = random.Random(0)
+    character = _character(rng, members=members)
+    return lambda: engine.process_member_activities(character, rng), 1
+
+@benchmark('get_valid_shop_trades')
+def _shop_trades():
+    rng = random.Random(0)
+    character = _character(rng)
+    for resource in character.shop_inventory:
+        character.shop_inventory[resource] = 5
+    return lambda: engine.get_valid_shop_trades(character, rng), 1
+
+@benchmark('save_load_round_trip', treasures=[10, 1000, 100000])
+def _round_trip(treasures):
+    rng = random.Random(0)
+    character = _character(rng, members=10, treasures=treasures)
+    save_dir = Path(tempfile.mkdtemp(prefix='bench-saves-'))
+    path = saves.save_path(character.name, save_dir)
+
+    def run():
+        # Without a file on disk the save is a full snapshot, not a journal append
+        path.unlink(missing_ok=True)
+        saves.save_character(character, save_dir)
+        saves.load_character(saves.entry_key({'name': character.name, 'file': path.name}, save_dir), save_dir)
+    run.cleanup = lambda: shutil.rmtree(save_dir, ignore_errors=True)
+    return run, 1
+
+# --- Running ---
+
+def measure(func, ops, min_time=MIN_ROUND_TIME, rounds=ROUNDS) -> dict:
+    """Microseconds per operation: best and median over the timed rounds."""
+    # Enough calls per round to fill min_time, like timeit.autorange. These
+    # runs also warm things up, so they aren't counted
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 10 if elapsed < min_time / 10 else 2
+
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        times.append(time.perf_counter() - start)
+    per_op = [t / (calls * ops) * 1e6 for t in times]
+    return {'best_us': round(min(per_op), 3), 'median_us': round(statistics.median(per_op), 3)}
+
+def run_benchmarks(names=None, min_time=MIN_ROUND_TIME) -> dict:
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        func, ops = setup()
+        try:
+            results[name] = measure(func, ops, min_time)
+        finally:
+            getattr(func, 'cleanup', lambda: None)()
+    return results
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'snapshot_format': saves.SNAPSHOT_FORMAT
+    }
+
+def save_baseline(results, path=BASELINE_FILE):
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=4)
+
+def load_baseline(path=BASELINE_FILE) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results, baseline) -> list:
+    """(name, baseline us, current us, change) for every benchmark in both,
+    with change as a fraction (0.25 = 25% slower)."""
+    rows = []
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+        if old:
+            rows.append((name, old['best_us'], result['best_us'], result['best_us'] / old['best_us'] - 1))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument('names', nargs='*', help="Only run benchmarks whose name contains one of these")
+    parser.add_argument('--save', action='store_true', help="Write the results as the baseline")
+    parser.add_argument('--compare', action='store_true', help="Compare the results with the baseline")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Fraction slower than the baseline that counts as a regression")
+    parser.add_argument('--min-time', type=float, default=MIN_ROUND_TIME,
+                        help="Seconds per timed round")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, args.min_time)
+
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        if baseline['environment'] != environment():
+            print(f"Note: baseline was recorded on {baseline['environment']}")
+        regressions = 0
+        for name, old, new, change in compare(results, baseline):
+            flag = ""
+            if change > args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{name:45} {old:12.3f}us {new:12.3f}us {change:+8.1%}{flag}")
+        if regressions:
+            print(f"{regressions} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+    else:
+        for name, result in results.items():
+            print(f"{name:45} {result['best_us']:12.3f}us (median {result['median_us']:.3f}us)")
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+# campaign.py
+# Monte Carlo runner that plays whole campaigns headlessly across all cores.
+#
+# Every campaign gets its own random.Random seeded from (seed, campaign index),
+# and campaigns are split into fixed-size chunks whose summaries are merged in
+# index order. The totals therefore don't depend on how many workers ran them.
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict
+
+import engine
+from character import CHARACTER_PRESETS
+
+PRESET_NAMES = list(CHARACTER_PRESETS.keys())
+DEFAULT_CHUNK_SIZE = 500
+
+@dataclass
+class CampaignSummary:
+    campaigns: int = 0
+    days: int = 0
+    short_days: int = 0  # Days where food or water ran out at upkeep
+    adventures: int = 0
+    members: int = 0
+    treasures: int = 0
+    treasure_value: int = 0
+    victories: int = 0
+    resources: Dict[str, int] = field(default_factory=lambda: {r: 0 for r in engine.ALL_RESOURCES})
+    outcomes: Dict[str, int] = field(default_factory=lambda: {
+        'exceptional': 0, 'good': 0, 'neutral': 0, 'bad': 0
+    })
+    objectives: Dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: 'CampaignSummary'):
+        self.campaigns += other.campaigns
+        self.days += other.days
+        self.short_days += other.short_days
+        self.adventures += other.adventures
+        self.members += other.members
+        self.treasures += other.treasures
+        self.treasure_value += other.treasure_value
+        self.victories += other.victories
+        for totals, extra in ((self.resources, other.resources),
+                              (self.outcomes, other.outcomes),
+                              (self.objectives, other.objectives)):
+            for key, value in extra.items():
+                totals[key] = totals.get(key, 0) + value
+        return self
+
+    def as_dict(self) -> dict:
+        n = max(self.campaigns, 1)
+        return {
+            'campaigns': self.campaigns,
+            'days': self.days,
+            'victory_rate': self.victories / n,
+            'short_day_rate': self.short_days / max(self.days, 1),
+            'mean_members': self.members / n,
+            'mean_treasures': self.treasures / n,
+            'mean_treasure_value': self.treasure_value / n,
+            'mean_resources': {r: v / n for r, v in self.resources.items()},
+            'adventure_outcomes': {k: v / max(self.adventures, 1) for k, v in self.outcomes.items()},
+            'objective_rates': {k: v / n for k, v in sorted(self.objectives.items())}
+        }
+
+def spend_action_points(character, rng, summary: CampaignSummary):
+    """Simple player policy: keep food and water stocked, build the shop when
+    affordable, and otherwise go on adventures."""
+    needed = len(character.camp_members) + 1
+    while character.current_ap > 0:
+        if "Shop Counter" not in character.base_upgrades:
+            if engine.build_shop_counter(character).success:
+                continue
+
+        low = min(('food', 'water'), key=lambda r: character.resources[r])
+        if character.resources[low] < needed or character.current_ap < engine.ADVENTURE_AP_COST:
+            resource = low if character.resources[low] < needed else 'wood'
+            engine.gather_resource(character, resource, rng)
+        else:
+            location_type = rng.choice(list(engine.LOCATIONS))
+            location = rng.choice(engine.LOCATIONS[location_type])
+            result = engine.start_adventure(character, location_type, location, rng)
+            summary.adventures += 1
+            summary.outcomes[result.outcome] += 1
+
+def play_campaign(preset_name: str, days: int, rng, summary: CampaignSummary):
+    character = engine.new_character("Sim", preset_name)
+
+    for _ in range(days):
+        spend_action_points(character, rng, summary)
+
+        engine.process_member_activities(character, rng)
+        needed = len(character.camp_members) + 1
+        if character.resources['food'] < needed or character.resources['water'] < needed:
+            summary.short_days += 1
+        engine.consume_daily_upkeep(character)
+
+        visitor = engine.roll_visitor(rng)
+        engine.try_recruit(character, visitor, visitor['join_chance'], rng)
+        character.refresh_day()
+
+    summary.campaigns += 1
+    summary.days += days
+    summary.members += len(character.camp_members)
+    summary.treasures += len(character.treasures)
+    summary.treasure_value += sum(t.value for t in character.treasures)
+    if all(character.objectives_completed.values()):
+        summary.victories += 1
+    for resource, amount in character.resources.items():
+        summary.resources[resource] += amount
+    for objective, done in character.objectives_completed.items():
+        summary.objectives[objective] = summary.objectives.get(objective, 0) + int(done)
+    return character
+
+def campaign_rng(seed: int, index: int) -> random.Random:
+    # String seeds are hashed with SHA-512, so the stream is the same in every process
+    return random.Random(f"{seed}:{index}")
+
+def run_chunk(preset_name, days, seed, start, stop) -> CampaignSummary:
+    summary = CampaignSummary()
+    for index in range(start, stop):
+        preset = preset_name or PRESET_NAMES[index % len(PRESET_NAMES)]
+        play_campaign(preset, days, campaign_rng(seed, index), summary)
+    return summary
+
+def _run_chunk(args):
+    return run_chunk(*args)
+
+def run_sweep(campaigns: int, days: int, preset_name: str = None, seed: int = 0,
+              workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> CampaignSummary:
+    """Play `campaigns` campaigns of `days` days each and merge the results.
+
+    With no preset the campaigns cycle through every entry of CHARACTER_PRESETS.
+    """
+    if preset_name is not None and preset_name not in CHARACTER_PRESETS:
+        raise ValueError(f"Unknown preset: {preset_name}")
+
+    chunks = [
+        (preset_name, days, seed, start, min(start + chunk_size, campaigns))
+        for start in range(0, campaigns, chunk_size)
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    total = CampaignSummary()
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            total.merge(run_chunk(*chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() yields in submission order, which keeps the merge deterministic
+            for summary in executor.map(_run_chunk, chunks):
+                total.merge(summary)
+    return total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Monte Carlo campaign sweeps.")
+    parser.add_argument('--campaigns', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--preset', choices=PRESET_NAMES, default=None,
+                        help="Preset to play (default: cycle through all presets)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    summary = run_sweep(args.campaigns, args.days, args.preset, args.seed,
+                        args.workers, args.chunk_size)
+    print(json.dumps(summary.as_dict(), indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+# catalog.py
+# Every treasure in the game, where it can turn up and how often.
+#
+# Each source (an adventure location, or "trader" for visitors selling
+# things) has a list of entries with a rarity tier. Sampling uses a
+# precomputed alias table per source, so picking a treasure costs two random
+# numbers no matter how many entries a source has. Treasures made from an
+# entry share its strings rather than each carrying their own copies.
+import random
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from character import Treasure
+
+RARITY_WEIGHTS = {
+    'common': 60,
+    'uncommon': 30,
+    'rare': 10
+}
+
+TRADER = 'trader'  # Source for treasures visitors offer to sell
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    name: str
+    category: str
+    value: int
+    location_found: str
+    description: str
+    rarity: str = 'common'
+    value_range: Optional[Tuple[int, int]] = None  # Value is rolled in this range when set
+
+    @property
+    def weight(self) -> int:
+        return RARITY_WEIGHTS[self.rarity]
+
+    @property
+    def mean_value(self) -> float:
+        if self.value_range:
+            return sum(self.value_range) / 2
+        return self.value
+
+    def roll_value(self, rng=random) -> int:
+        if self.value_range:
+            return rng.randint(*self.value_range)
+        return self.value
+
+    def make(self, day: int, value: Optional[int] = None) -> Treasure:
+        return Treasure(self.name, self.category, self.value if value is None else value,
+                        self.location_found, self.description, day)
+
+CATALOG = {
+    # City
+    'Hospital': [
+        CatalogEntry("Sealed Antibiotics", "Medical", 500, "Hospital", "A rare find of untouched medicine"),
+        CatalogEntry("Surgical Kit", "Medical", 650, "Hospital", "Sterile and complete", 'uncommon'),
+        CatalogEntry("Portable Defibrillator", "Medical", 900, "Hospital", "The battery still holds", 'rare')
+    ],
+    'Abandoned Mall': [
+        CatalogEntry("Working Laptop", "Electronics", 600, "Mall", "Still has some charge!"),
+        CatalogEntry("Designer Watch", "Luxury", 750, "Mall", "Ticking away like nothing happened", 'uncommon'),
+        CatalogEntry("Solar Generator", "Electronics", 1000, "Mall", "Boxed and never used", 'rare')
+    ],
+    'Residential District': [
+        CatalogEntry("Fine Jewelry", "Luxury", 400, "House", "Someone's precious memories..."),
+        CatalogEntry("Family Silverware", "Luxury", 500, "House", "Polished and wrapped in cloth", 'uncommon'),
+        CatalogEntry("Hidden Safe Cash", "Valuables", 800, "House", "Behind a painting, of course", 'rare')
+    ],
+    # Woods
+    'River Expedition': [
+        CatalogEntry("Gold Nuggets", "Valuables", 700, "River", "Nature's treasure!"),
+        CatalogEntry("Fishing Boat Motor", "Equipment", 800, "River", "Needs a little oil", 'uncommon'),
+        CatalogEntry("Sunken Strongbox", "Valuables", 1100, "River", "Whatever's inside, it's heavy", 'rare')
+    ],
+    'Ranger Station': [
+        CatalogEntry("Military GPS", "Electronics", 450, "Ranger Station", "Still works perfectly!"),
+        CatalogEntry("Long-Range Radio", "Electronics", 600, "Ranger Station", "Picks up distant chatter", 'uncommon'),
+        CatalogEntry("Hunting Rifle Scope", "Equipment", 850, "Ranger Station", "Crystal clear glass", 'rare')
+    ],
+    'Abandoned Campgrounds': [
+        CatalogEntry("Vintage Camping Gear", "Equipment", 350, "Campgrounds", "They don't make them like this anymore"),
+        CatalogEntry("Water Purifier", "Equipment", 500, "Campgrounds", "Makes any stream drinkable", 'uncommon'),
+        CatalogEntry("Trail Cache", "Supplies", 700, "Campgrounds", "Someone planned ahead", 'rare')
+    ],
+    # Visitors selling their finds
+    TRADER: [
+        CatalogEntry("Ancient Coin Collection", "Collectible", 200, "Purchased", "", value_range=(100, 300)),
+        CatalogEntry("Medical Supplies", "Medical", 300, "Purchased", "", value_range=(200, 400)),
+        CatalogEntry("Preserved Food Cache", "Supplies", 200, "Purchased", "", value_range=(150, 250)),
+        CatalogEntry("Rare Book", "Collectible", 100, "Purchased", "", value_range=(50, 150)),
+        CatalogEntry("Tool Set", "Equipment", 150, "Purchased", "", value_range=(100, 200))
+    ]
+}
+
+class _AliasTable:
+    """Walker's alias method: O(1) weighted sampling from a fixed list."""
+    def __init__(self, entries):
+        self.entries = entries
+        n = len(entries)
+        total = sum(e.weight for e in entries)
+        scaled = [e.weight * n / total for e in entries]
+        self.accept = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.accept[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def sample(self, rng):
+        i = int(rng.random() * len(self.entries))
+        return self.entries[i if rng.random() < self.accept[i] else self.alias[i]]
+
+_tables = {source: _AliasTable(entries) for source, entries in CATALOG.items()}
+_by_name = {entry.name: entry for entries in CATALOG.values() for entry in entries}
+_strings = {
+    text: text
+    for entries in CATALOG.values() for entry in entries
+    for text in (entry.name, entry.category, entry.location_found, entry.description)
+}
+
+def sample(source: str, rng=random) -> CatalogEntry:
+    """Weighted random entry for a location (or TRADER)."""
+    return _tables[source].sample(rng)
+
+def lookup(name: str) -> Optional[CatalogEntry]:
+    """Catalog entry for a treasure name, or None for treasures not in the catalog."""
+    return _by_name.get(name)
+
+def shared(text: str) -> str:
+    """The catalog's own copy of a string if it has one, so treasures loaded
+    from saves don't each hold duplicates."""
+    return _strings.get(text, text)
+
+def probabilities(source: str) -> dict:
+    """Entry -> chance of it being picked at this source."""
+    entries = CATALOG[source]
+    total = sum(e.weight for e in entries)
+    return {e: e.weight / total for e in entries}
+
+def expected_value(source: str) -> float:
+    return sum(p * e.mean_value for e, p in probabilities(source).items())
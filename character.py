@@ -1,54 +1,553 @@
 # character.py
-from dataclasses import dataclass, field
-from typing import Dict
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from enum import IntEnum
 
-@dataclass
-class Character:
+@dataclass(frozen=True, slots=True)
+class Treasure:
     name: str
-    endurance: int
-    scavenging: int
-    charisma: int
-    combat: int
-    crafting: int
-    resources: Dict[str, int] = field(default_factory=lambda: {
-        "wood": 0,
-        "water": 0,
-        "food": 0,
-        "rope": 5
-    })
-    base_upgrades: list[str] = field(default_factory=list)
-    current_ap: int = 0
-    current_day: int = 1
-    objectives_completed: Dict[str, bool] = field(default_factory=lambda: {
-        "gather_basics": False,
-        "build_shop": False,
-        "go_adventure": False
-    })
-    camp_members: list = field(default_factory=list)
-    shop_inventory: Dict[str, int] = field(default_factory=lambda: {
-        "wood": 0,
-        "water": 0,
-        "food": 0,
-        "rope": 0
-    })
-    shop_prices: Dict[str, Dict[str, float]] = field(default_factory=lambda: {
-        'food': {'water': 1, 'wood': 2, 'rope': 0.5},
-        'water': {'food': 1, 'wood': 2, 'rope': 0.5},
-        'wood': {'food': 0.5, 'water': 0.5, 'rope': 0.25},
-        'rope': {'food': 2, 'water': 2, 'wood': 4}
-    })
-    money: int = 100  # Starting money
-    treasures: list = field(default_factory=list)
-    shop_treasures: list = field(default_factory=list)
-    resource_values: Dict[str, int] = field(default_factory=lambda: {
-        "wood": 5,
-        "water": 8,
-        "food": 10,
-        "rope": 15
-    })
-
-    def __post_init__(self):
-        self.current_ap = self.action_points
+    category: str
+    value: int
+    location_found: str
+    description: str
+    day_found: int  # To track when it was found
+
+class TreasureInventory:
+    """Treasures in the order they were added, indexed by id, category and value.
+
+    Adding and removing are O(1) apart from keeping the value index sorted,
+    which is a bisect and a memmove. Equal treasures are interchangeable, so
+    remove(treasure) takes out the oldest one equal to it, like list.remove.
+    """
+    __slots__ = ('_items', '_ids', '_by_category', '_by_value', '_next_id', 'total_value')
+
+    def __init__(self, treasures=()):
+        self._items = {}  # Id -> Treasure, oldest first
+        self._ids = {}  # Treasure -> {id: None} for every equal copy held
+        self._by_category = {}  # Category -> {id: None}
+        self._by_value = []  # Sorted (value, id)
+        self._next_id = 0
+        self.total_value = 0
+        self.extend(treasures)
+
+    def add(self, treasure: Treasure) -> int:
+        tid = self._next_id
+        self._next_id += 1
+        self._items[tid] = treasure
+        self._ids.setdefault(treasure, {})[tid] = None
+        self._by_category.setdefault(treasure.category, {})[tid] = None
+        insort(self._by_value, (treasure.value, tid))
+        self.total_value += treasure.value
+        return tid
+
+    append = add
+
+    def extend(self, treasures):
+        for treasure in treasures:
+            self.add(treasure)
+
+    def pop(self, tid: int) -> Treasure:
+        """Remove and return the treasure with this id."""
+        treasure = self._items.pop(tid)
+        self._unindex(self._ids, treasure, tid)
+        self._unindex(self._by_category, treasure.category, tid)
+        del self._by_value[bisect_left(self._by_value, (treasure.value, tid))]
+        self.total_value -= treasure.value
+        return treasure
+
+    def remove(self, treasure: Treasure):
+        self.pop(self.id_of(treasure))
+
+    @staticmethod
+    def _unindex(index, key, tid):
+        ids = index[key]
+        del ids[tid]
+        if not ids:
+            del index[key]
+
+    def id_of(self, treasure: Treasure) -> int:
+        ids = self._ids.get(treasure)
+        if not ids:
+            raise ValueError(f"{treasure.name} is not in the inventory")
+        return next(iter(ids))
+
+    def get(self, tid: int) -> Treasure:
+        return self._items[tid]
+
+    def items(self):
+        """(id, treasure) pairs, oldest first."""
+        return self._items.items()
+
+    def categories(self) -> list:
+        return list(self._by_category)
+
+    def by_category(self, category: str) -> list:
+        return [self._items[tid] for tid in self._by_category.get(category, ())]
+
+    def by_value(self, low=None, high=None) -> list:
+        """Treasures worth between low and high (inclusive), cheapest first."""
+        start = 0 if low is None else bisect_left(self._by_value, (low, -1))
+        end = len(self._by_value) if high is None else bisect_right(self._by_value, (high, self._next_id))
+        return [self._items[tid] for _, tid in self._by_value[start:end]]
+
+    def most_valuable(self, count=1) -> list:
+        return [self._items[tid] for _, tid in reversed(self._by_value[-count:])] if count else []
+
+    def count(self, treasure: Treasure) -> int:
+        return len(self._ids.get(treasure, ()))
+
+    def __contains__(self, treasure):
+        return treasure in self._ids
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"TreasureInventory({list(self)!r})"
+
+MEMBER_MODES = ('guard', 'gather', 'adventure')
+_MODE_INDEX = {mode: i for i, mode in enumerate(MEMBER_MODES)}
+
+class Member(MutableMapping):
+    """Dict-style view of one camp member in a MemberRegistry."""
+    __slots__ = ('registry', 'id')
+    KEYS = ('name', 'type', 'mode', 'ap')
+
+    def __init__(self, registry, member_id):
+        self.registry = registry
+        self.id = member_id
+
+    def __getitem__(self, key):
+        r = self.registry
+        if key == 'name':
+            return r._names[self.id]
+        if key == 'type':
+            return r._types[self.id]
+        if key == 'mode':
+            return MEMBER_MODES[r._modes[self.id]]
+        if key == 'ap':
+            return r._ap[self.id]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        r = self.registry
+        if key == 'name':
+            r.rename(self.id, value)
+        elif key == 'type':
+            r._types[self.id] = value
+        elif key == 'mode':
+            r.set_mode(self.id, value)
+        elif key == 'ap':
+            r._ap[self.id] = value
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise TypeError("Camp members have a fixed set of keys")
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class MemberRegistry:
+    """Camp members stored column by column under stable integer ids.
+
+    Per-mode and per-name indexes mean finding the guards, or the member a
+    button belongs to, never scans the whole camp. Iterating gives Member
+    views in the order people joined.
+    """
+    __slots__ = ('_names', '_types', '_modes', '_ap', '_by_mode', '_by_name', '_count')
+
+    def __init__(self, members=()):
+        self._names = []  # None once a member has left
+        self._types = []
+        self._modes = array('b')  # Index into MEMBER_MODES
+        self._ap = array('h')
+        self._by_mode = [{} for _ in MEMBER_MODES]  # Mode index -> {id: None}
+        self._by_name = {}  # Name -> {id: None}
+        self._count = 0
+        self.extend(members)
+
+    def add(self, name: str, member_type: str, mode: str = 'gather', ap: int = 0) -> int:
+        member_id = len(self._names)
+        mode_index = _MODE_INDEX[mode]
+        self._names.append(name)
+        self._types.append(member_type)
+        self._modes.append(mode_index)
+        self._ap.append(ap)
+        self._by_mode[mode_index][member_id] = None
+        self._by_name.setdefault(name, {})[member_id] = None
+        self._count += 1
+        return member_id
+
+    def append(self, member) -> int:
+        """Add a member given as a dict with name, type, mode and ap."""
+        return self.add(member['name'], member['type'], member['mode'], member['ap'])
+
+    def extend(self, members):
+        for member in members:
+            self.append(member)
+
+    def remove(self, member_id: int):
+        name = self._names[member_id]
+        if name is None:
+            raise KeyError(member_id)
+        del self._by_mode[self._modes[member_id]][member_id]
+        self._unname(name, member_id)
+        self._names[member_id] = None
+        self._count -= 1
+
+    def _unname(self, name, member_id):
+        ids = self._by_name[name]
+        del ids[member_id]
+        if not ids:
+            del self._by_name[name]
+
+    def rename(self, member_id: int, name: str):
+        self._unname(self._names[member_id], member_id)
+        self._names[member_id] = name
+        self._by_name.setdefault(name, {})[member_id] = None
+
+    def set_mode(self, member_id: int, mode: str):
+        new = _MODE_INDEX[mode]
+        old = self._modes[member_id]
+        if new != old:
+            del self._by_mode[old][member_id]
+            self._by_mode[new][member_id] = None
+            self._modes[member_id] = new
+
+    def get(self, member_id: int) -> Member:
+        if member_id >= len(self._names) or self._names[member_id] is None:
+            raise KeyError(member_id)
+        return Member(self, member_id)
+
+    def ids_in_mode(self, mode: str) -> list:
+        # Sorted so members in a mode keep the order they joined in
+        return sorted(self._by_mode[_MODE_INDEX[mode]])
+
+    def in_mode(self, mode: str) -> list:
+        return [Member(self, i) for i in self.ids_in_mode(mode)]
+
+    def count_in_mode(self, mode: str) -> int:
+        return len(self._by_mode[_MODE_INDEX[mode]])
+
+    def named(self, name: str) -> list:
+        return [Member(self, i) for i in self._by_name.get(name, ())]
+
+    def as_dicts(self) -> list:
+        return [dict(member) for member in self]
+
+    def copy(self) -> 'MemberRegistry':
+        """Independent copy that keeps every member's id."""
+        clone = MemberRegistry()
+        clone._names = list(self._names)
+        clone._types = list(self._types)
+        clone._modes = array('b', self._modes)
+        clone._ap = array('h', self._ap)
+        clone._by_mode = [dict(ids) for ids in self._by_mode]
+        clone._by_name = {name: dict(ids) for name, ids in self._by_name.items()}
+        clone._count = self._count
+        return clone
+
+    def __iter__(self):
+        return (Member(self, i) for i, name in enumerate(self._names) if name is not None)
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"MemberRegistry({self.as_dicts()!r})"
+
+class Resource(IntEnum):
+    WOOD = 0
+    WATER = 1
+    FOOD = 2
+    ROPE = 3
+
+RESOURCE_NAMES = tuple(r.name.lower() for r in Resource)
+RESOURCE_INDEX = {name: r for name, r in zip(RESOURCE_NAMES, Resource)}
+RESOURCE_INDEX.update({r: r for r in Resource})
+OBJECTIVES = ("gather_basics", "build_shop", "go_adventure", "recruit_member", "three_members")
+
+DEFAULT_RESOURCES = {"wood": 0, "water": 0, "food": 0, "rope": 5}
+DEFAULT_SHOP_PRICES = {
+    'food': {'water': 1, 'wood': 2, 'rope': 0.5},
+    'water': {'food': 1, 'wood': 2, 'rope': 0.5},
+    'wood': {'food': 0.5, 'water': 0.5, 'rope': 0.25},
+    'rope': {'food': 2, 'water': 2, 'wood': 4}
+}
+DEFAULT_RESOURCE_VALUES = {"wood": 5, "water": 8, "food": 10, "rope": 15}
+
+_NO_PRICE = float('nan')
+
+# The tables below are dict-style views onto flat arrays held by Character.
+# They behave like the dicts they replace, except that the set of keys is fixed.
+
+class ResourceTable(MutableMapping):
+    """Amount per resource, keyed by name or Resource."""
+    __slots__ = ('_data', '_offset')
+    KEYS = RESOURCE_NAMES
+    INDEX = RESOURCE_INDEX
+
+    def __init__(self, data, offset=0):
+        self._data = data
+        self._offset = offset
+
+    def __getitem__(self, key):
+        return self._data[self._offset + self.INDEX[key]]
+
+    def __setitem__(self, key, value):
+        self._data[self._offset + self.INDEX[key]] = value
+
+    def __delitem__(self, key):
+        raise TypeError(f"{type(self).__name__} has a fixed set of keys")
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def copy(self) -> dict:
+        return dict(self)
+
+class ObjectiveTable(ResourceTable):
+    __slots__ = ()
+    KEYS = OBJECTIVES
+    INDEX = {name: i for i, name in enumerate(OBJECTIVES)}
+
+    def __getitem__(self, key):
+        return bool(super().__getitem__(key))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, bool(value))
+
+class PriceRow(ResourceTable):
+    """What one resource sells for in each other resource; unpriced pairs are left out."""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        rate = super().__getitem__(key)
+        if rate != rate:  # NaN, not offered
+            raise KeyError(key)
+        # The array holds doubles; whole prices come back as the ints they were
+        return int(rate) if rate.is_integer() else rate
+
+    def __delitem__(self, key):
+        self._data[self._offset + self.INDEX[key]] = _NO_PRICE
+
+    def __iter__(self):
+        return (r for i, r in enumerate(RESOURCE_NAMES) if self._data[self._offset + i] == self._data[self._offset + i])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+class PriceTable(MutableMapping):
+    """shop_prices[sell][pay] as a resource-by-resource matrix."""
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        row = PriceRow(self._data, RESOURCE_INDEX[key] * len(Resource))
+        if not row:
+            raise KeyError(key)
+        return row
+
+    def __setitem__(self, key, rates):
+        row = PriceRow(self._data, RESOURCE_INDEX[key] * len(Resource))
+        for pay in RESOURCE_NAMES:
+            row[pay] = rates.get(pay, _NO_PRICE)
+
+    def __delitem__(self, key):
+        self[key] = {}
+
+    def __iter__(self):
+        return (r for r in RESOURCE_NAMES if PriceRow(self._data, RESOURCE_INDEX[r] * len(Resource)))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr({k: dict(v) for k, v in self.items()})
+
+    def copy(self) -> dict:
+        return {k: dict(v) for k, v in self.items()}
+
+def _table(typecode, table, values):
+    data = array(typecode, [0] * len(table.KEYS))
+    view = table(data)
+    for key, value in values.items():
+        view[key] = value
+    return data
+
+def _observed(field):
+    # A plain attribute that tells the character's observers when it changes
+    slot = '_' + field
+
+    def get(self):
+        return getattr(self, slot)
+
+    def set(self, value):
+        old = getattr(self, slot, None)
+        setattr(self, slot, value)
+        if self._observers and value != old:
+            for callback in self._observers:
+                callback(self, field)
+
+    return property(get, set)
+
+class Character:
+    # Resources, shop stock, prices, values and objectives are stored as flat
+    # arrays instead of dicts, which keeps a character to a few hundred bytes
+    # and makes copy() cheap. The properties hand out dict-style views of them.
+    #
+    # AP and day are observed: subscribe() to hear about changes rather than
+    # polling (the game screen's counter redraws from these).
+    __slots__ = (
+        'name', 'endurance', 'scavenging', 'charisma', 'combat', 'crafting',
+        'base_upgrades', '_current_ap', '_current_day', '_camp_members', 'money',
+        '_treasures', '_shop_treasures',
+        '_resources', '_shop_inventory', '_shop_prices', '_resource_values', '_objectives',
+        '_observers'
+    )
+
+    current_ap = _observed('current_ap')
+    current_day = _observed('current_day')
+
+    def __init__(self, name: str, endurance: int, scavenging: int, charisma: int, combat: int, crafting: int,
+                 resources=None, base_upgrades=None, current_ap=None, current_day=1,
+                 objectives_completed=None, camp_members=None, shop_inventory=None, shop_prices=None,
+                 money=100, treasures=None, shop_treasures=None, resource_values=None):
+        self._observers = []
+        self.name = name
+        self.endurance = endurance
+        self.scavenging = scavenging
+        self.charisma = charisma
+        self.combat = combat
+        self.crafting = crafting
+        self.resources = DEFAULT_RESOURCES if resources is None else resources
+        self.base_upgrades = [] if base_upgrades is None else base_upgrades
+        self.current_ap = self.action_points if current_ap is None else current_ap
+        self.current_day = current_day
+        self.objectives_completed = {} if objectives_completed is None else objectives_completed
+        self.camp_members = [] if camp_members is None else camp_members
+        self.shop_inventory = {} if shop_inventory is None else shop_inventory
+        self.shop_prices = DEFAULT_SHOP_PRICES if shop_prices is None else shop_prices
+        self.money = money  # Starting money
+        self.treasures = [] if treasures is None else treasures
+        self.shop_treasures = [] if shop_treasures is None else shop_treasures
+        self.resource_values = DEFAULT_RESOURCE_VALUES if resource_values is None else resource_values
+
+    def subscribe(self, callback):
+        """Call callback(character, field) whenever current_ap or current_day changes."""
+        self._observers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def __repr__(self):
+        return (f"Character(name={self.name!r}, endurance={self.endurance}, scavenging={self.scavenging}, "
+                f"charisma={self.charisma}, combat={self.combat}, crafting={self.crafting}, "
+                f"day={self.current_day}, resources={self.resources!r})")
+
+    @property
+    def resources(self) -> ResourceTable:
+        return ResourceTable(self._resources)
+
+    @resources.setter
+    def resources(self, values):
+        self._resources = _table('i', ResourceTable, values)
+
+    @property
+    def shop_inventory(self) -> ResourceTable:
+        return ResourceTable(self._shop_inventory)
+
+    @shop_inventory.setter
+    def shop_inventory(self, values):
+        self._shop_inventory = _table('i', ResourceTable, values)
+
+    @property
+    def resource_values(self) -> ResourceTable:
+        return ResourceTable(self._resource_values)
+
+    @resource_values.setter
+    def resource_values(self, values):
+        self._resource_values = _table('i', ResourceTable, values)
+
+    @property
+    def objectives_completed(self) -> ObjectiveTable:
+        return ObjectiveTable(self._objectives)
+
+    @objectives_completed.setter
+    def objectives_completed(self, values):
+        self._objectives = _table('b', ObjectiveTable, values)
+
+    @property
+    def shop_prices(self) -> PriceTable:
+        return PriceTable(self._shop_prices)
+
+    @shop_prices.setter
+    def shop_prices(self, prices):
+        self._shop_prices = array('d', [_NO_PRICE] * (len(Resource) * len(Resource)))
+        table = PriceTable(self._shop_prices)
+        for sell, rates in prices.items():
+            table[sell] = rates
+
+    @property
+    def camp_members(self) -> MemberRegistry:
+        return self._camp_members
+
+    @camp_members.setter
+    def camp_members(self, members):
+        self._camp_members = members if isinstance(members, MemberRegistry) else MemberRegistry(members)
+
+    @property
+    def treasures(self) -> TreasureInventory:
+        return self._treasures
+
+    @treasures.setter
+    def treasures(self, treasures):
+        self._treasures = treasures if isinstance(treasures, TreasureInventory) else TreasureInventory(treasures)
+
+    @property
+    def shop_treasures(self) -> TreasureInventory:
+        return self._shop_treasures
+
+    @shop_treasures.setter
+    def shop_treasures(self, treasures):
+        self._shop_treasures = treasures if isinstance(treasures, TreasureInventory) else TreasureInventory(treasures)
+
+    def copy(self) -> 'Character':
+        """Independent copy for what-if play. Treasures are shared, as they're immutable."""
+        clone = object.__new__(Character)
+        for slot in Character.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        for slot in ('_resources', '_shop_inventory', '_shop_prices', '_resource_values', '_objectives'):
+            setattr(clone, slot, array(getattr(self, slot).typecode, getattr(self, slot)))
+        clone.base_upgrades = list(self.base_upgrades)
+        clone.camp_members = self.camp_members.copy()
+        clone.treasures = TreasureInventory(self.treasures)
+        clone.shop_treasures = TreasureInventory(self.shop_treasures)
+        clone._observers = []  # What-if copies shouldn't redraw the real game
+        return clone
+
+    __copy__ = copy
 
     def refresh_day(self):
         self.current_ap = self.action_points
@@ -122,4 +621,15 @@ CHARACTER_PRESETS = {
         combat=5,
         crafting=5
     )
-}
\ No newline at end of file
+}
+
+def find_character_class(character) -> str:
+    """Name of the preset whose stats match the character's, or "Unknown"."""
+    for preset_name, preset in CHARACTER_PRESETS.items():
+        if (preset.endurance == character.endurance and
+            preset.scavenging == character.scavenging and
+            preset.charisma == character.charisma and
+            preset.combat == character.combat and
+            preset.crafting == character.crafting):
+            return preset_name
+    return "Unknown"
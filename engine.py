@@ -0,0 +1,536 @@
+# engine.py
+# Game rules with no Kivy dependency. The popups in main.py call into these
+# functions and only take care of showing the results.
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional
+
+import catalog
+from character import Character, Treasure, CHARACTER_PRESETS, MEMBER_MODES, RESOURCE_NAMES
+
+ADVENTURE_SCENARIOS = {
+    "city": {
+        "abandoned_mall": {
+            "good": [
+                "You discover a cache of valuable electronics!",
+                "You find an untouched storage area full of preserved goods!",
+                "A friendly group of traders welcomes you to their temporary camp."
+            ],
+            "neutral": [
+                "You find some common supplies. Better than nothing.",
+                "The area is picked clean but at least it was safe.",
+                "You exchange information with neutral scavengers."
+            ],
+            "bad": [
+                "Part of the ceiling collapses, forcing you to retreat.",
+                "A small horde of zombies notices you.",
+                "Local bandits demand you leave their territory."
+            ]
+        },
+        "hospital": {
+            "good": [
+                "You find a stash of valuable medical supplies!",
+                "Untouched medical equipment - perfect for trading!",
+                "You meet a grateful doctor who promises to visit your base."
+            ],
+            "neutral": [
+                "You salvage some basic first aid supplies.",
+                "The darkness limits your search, but you stay safe.",
+                "You have a peaceful standoff with other scavengers."
+            ],
+            "bad": [
+                "The air feels wrong here - better leave quickly.",
+                "Zombies have you cornered in the pharmacy.",
+                "You knock over some chemicals and retreat from the fumes."
+            ]
+        },
+        "residential_district": {
+            "good": [
+                "You find a well-preserved food cache!",
+                "A garage full of useful tools and materials!",
+                "You help a family in need - they won't forget this."
+            ],
+            "neutral": [
+                "You gather scattered supplies from various houses.",
+                "Most houses are looted, but you stay hopeful.",
+                "Cautious residents watch you from afar."
+            ],
+            "bad": [
+                "A pack of dogs guards this neighborhood.",
+                "Armed residents make it clear you're not welcome.",
+                "The floorboards give way beneath you."
+            ]
+        }
+    },
+    "woods": {
+        "river_expedition": {
+            "good": [
+                "You discover a clean water source!",
+                "Abandoned camping supplies in pristine condition!",
+                "You find an excellent fishing spot!"
+            ],
+            "neutral": [
+                "You collect a bit of water - it's something.",
+                "You spot some animal tracks but nothing else.",
+                "You share the river with peaceful hunters."
+            ],
+            "bad": [
+                "You lose your way in the thick forest.",
+                "This water doesn't look safe to drink.",
+                "Something large is stalking you..."
+            ]
+        },
+        "ranger_station": {
+            "good": [
+                "You find detailed maps of the area!",
+                "A cache of survival gear - jackpot!",
+                "The radio still works - this could be valuable!"
+            ],
+            "neutral": [
+                "You find some basic camping supplies.",
+                "The station is empty but provides good shelter.",
+                "Other explorers share some useful information."
+            ],
+            "bad": [
+                "You've stumbled upon a bear's den.",
+                "An old trap nearly catches you.",
+                "The station's roof looks ready to cave in."
+            ]
+        },
+        "abandoned_campgrounds": {
+            "good": [
+                "You find a stockpile of preserved food!",
+                "Quality camping gear - perfect for trading!",
+                "Friendly survivors share their supplies."
+            ],
+            "neutral": [
+                "You gather scattered supplies from various houses.",
+                "The campground is empty but peaceful.",
+                "Some supplies are salvageable, some ruined."
+            ],
+            "bad": [
+                "This camp is already claimed - and guarded.",
+                "Zombies are shambling through the camp.",
+                "Smoke in the distance - forest fire!"
+            ]
+        }
+    }
+}
+
+FIRST_NAMES = [
+    "James", "Emma", "Michael", "Sarah", "David", "Lisa", "John", "Anna", 
+    "Robert", "Maria", "William", "Sofia", "Marcus", "Elena", "Thomas", "Nina",
+    "Carlos", "Maya", "Hassan", "Yuki", "Igor", "Zara", "Chen", "Aisha"
+]
+
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Chen", "Wong", "Kim", "Singh",
+    "Patel", "Ivanov", "Sato", "Cohen", "Weber", "Silva", "Murphy", "O'Connor"
+]
+
+VISITOR_TYPES = [
+    {"type": "Trader", "join_chance": 0.2, "description": "A cautious trader looking for safe routes.", "ap": 3},
+    {"type": "Survivor", "join_chance": 0.4, "description": "A capable survivor seeking shelter.", "ap": 4},
+    {"type": "Doctor", "join_chance": 0.15, "description": "A skilled medical professional.", "ap": 2},
+    {"type": "Engineer", "join_chance": 0.15, "description": "A practical problem-solver.", "ap": 2},
+    {"type": "Scout", "join_chance": 0.3, "description": "An experienced wasteland scout.", "ap": 5}
+]
+
+LOCATIONS = {
+    'city': ['Abandoned Mall', 'Hospital', 'Residential District'],
+    'woods': ['River Expedition', 'Ranger Station', 'Abandoned Campgrounds']
+}
+
+GATHERABLE_RESOURCES = ['wood', 'water', 'food']
+ALL_RESOURCES = list(RESOURCE_NAMES)
+
+MEMBER_NEUTRAL_CHANCE = 0.6  # Chance a member adventure that isn't good turns out neutral
+
+# Adventure outcome tuning. A roll above GOOD_THRESHOLD is good, above
+# NEUTRAL_THRESHOLD neutral, anything lower is bad.
+GOOD_THRESHOLD = 0.8
+NEUTRAL_THRESHOLD = 0.3
+GOOD_EVENTS = ['resource', 'friendly', 'resource']  # Higher chance for resources
+NEUTRAL_EVENTS = ['resource', 'nothing', 'quiet']
+BAD_EVENTS = ['zombie', 'bandit', 'accident']
+GOOD_FIND_RANGE = (3, 5)
+NEUTRAL_FIND_RANGE = (1, 2)
+ZOMBIE_LOSS_RANGE = (1, 2)
+BANDIT_LOSS_RANGE = (2, 3)
+
+GATHER_AP_COST = 1
+ADVENTURE_AP_COST = 2
+
+PERSONAL_TRADE_OPTIONS = [
+    ("food", 2, "rope", 1),
+    ("water", 2, "rope", 1),
+    ("wood", 3, "rope", 1),
+    ("rope", 1, "food", 3),
+    ("rope", 1, "water", 3),
+    ("rope", 1, "wood", 4),
+    ("food", 3, "water", 4),
+    ("water", 3, "food", 4),
+    ("wood", 4, "food", 3),
+    ("wood", 4, "water", 3),
+    ("rope", 2, "wood", 6),
+    ("food", 4, "rope", 2)
+]
+
+VISITOR_TRADE_OPTIONS = PERSONAL_TRADE_OPTIONS[:6]
+
+@dataclass
+class ActionResult:
+    action: str
+    message: str
+    success: bool = True
+    outcome: str = ""  # 'exceptional', 'good', 'neutral' or 'bad' for adventures
+    ap_spent: int = 0
+    resource_changes: Dict[str, int] = field(default_factory=dict)
+    treasure: Optional[Treasure] = None
+    visitor: Optional[dict] = None
+
+class AdventureRecord(NamedTuple):
+    """One camp member's adventure, kept small until a report shows it."""
+    member_id: int
+    location_type: str
+    location: str  # Key into ADVENTURE_SCENARIOS[location_type]
+    outcome: str  # 'good', 'neutral' or 'bad'
+    scenario: int  # Index into the scenarios for that location and outcome
+
+@dataclass
+class DayEndReport:
+    member_results: dict
+    food_consumed: int
+    water_consumed: int
+    day: int  # The day that just ended
+
+def _change(result, resource, amount):
+    result.resource_changes[resource] = result.resource_changes.get(resource, 0) + amount
+
+def new_character(name: str, preset_name: str) -> Character:
+    preset = CHARACTER_PRESETS[preset_name]
+    return Character(
+        name=name,
+        endurance=preset.endurance,
+        scavenging=preset.scavenging,
+        charisma=preset.charisma,
+        combat=preset.combat,
+        crafting=preset.crafting,
+        resources={"wood": 0, "water": 0, "food": 0, "rope": 5},
+        base_upgrades=[],
+        camp_members=[],
+        current_day=1,
+        objectives_completed={
+            "gather_basics": False,
+            "build_shop": False,
+            "go_adventure": False,
+            "recruit_member": False,
+            "three_members": False
+        },
+        treasures=[],  # Initialize empty treasures list
+        shop_treasures=[]  # Initialize empty shop treasures list
+    )
+
+# --- Player actions ---
+
+def gather_chance(scavenging: int) -> float:
+    return min(0.3 + (scavenging * 0.05), 0.95)
+
+def gather_amounts(scavenging: int) -> tuple:
+    # Lowest and highest amount a successful gather finds, all equally likely
+    bonus = scavenging // 3
+    return 1 + bonus, 3 + bonus
+
+def gather_resource(character: Character, resource: str, rng=random) -> ActionResult:
+    if character.current_ap < GATHER_AP_COST:
+        return ActionResult('gather', "Not enough Action Points!", success=False)
+
+    character.current_ap -= GATHER_AP_COST
+    result = ActionResult('gather', "", ap_spent=GATHER_AP_COST)
+
+    if rng.random() < gather_chance(character.scavenging):
+        amount = rng.randint(*gather_amounts(character.scavenging))
+        character.resources[resource] += amount
+        _change(result, resource, amount)
+        result.message = f"Success! Found {amount} {resource}!"
+
+        if resource in ['food', 'water']:
+            if (character.resources['food'] >= 1 and
+                character.resources['water'] >= 1):
+                character.objectives_completed['gather_basics'] = True
+    else:
+        result.success = False
+        result.message = f"No luck finding {resource} this time..."
+
+    return result
+
+def start_adventure(character: Character, location_type: str, location: str, rng=random) -> ActionResult:
+    if character.current_ap < ADVENTURE_AP_COST:
+        return ActionResult('adventure', "Not enough Action Points! (Requires 2 AP)", success=False)
+
+    character.current_ap -= ADVENTURE_AP_COST
+    result = determine_outcome(character, location_type, location, rng)
+    result.ap_spent += ADVENTURE_AP_COST
+    character.objectives_completed["go_adventure"] = True
+    return result
+
+def location_skill_bonus(character: Character, location_type: str) -> float:
+    if location_type == 'city':
+        return (character.scavenging * 0.02) + (character.charisma * 0.01)
+    # woods
+    return (character.endurance * 0.02) + (character.combat * 0.01)
+
+def exceptional_chance(character: Character) -> float:
+    return 0.20 + (character.scavenging * 0.01)
+
+def find_treasure(location: str, day: int, rng=random) -> Treasure:
+    return catalog.sample(location, rng).make(day)
+
+def determine_outcome(character: Character, location_type: str, location: str, rng=random) -> ActionResult:
+    """Roll the outcome of one adventure and apply it to the character.
+
+    Only the picked event is applied, so a good roll no longer hands out the
+    resources of every candidate event at once.
+    """
+    base_chance = rng.random()
+    skill_bonus = location_skill_bonus(character, location_type)
+
+    if base_chance < exceptional_chance(character):
+        # Found a treasure!
+        treasure = find_treasure(location, character.current_day, rng)
+        character.treasures.append(treasure)
+        return ActionResult(
+            'adventure',
+            f"EXCEPTIONAL FIND! You discovered {treasure.name}! ({treasure.description})",
+            outcome='exceptional',
+            treasure=treasure
+        )
+
+    # Regular outcome rolls
+    final_chance = base_chance + skill_bonus
+    if final_chance > GOOD_THRESHOLD:  # Good outcome (20%)
+        result = ActionResult('adventure', "", outcome='good')
+        event = rng.choice(GOOD_EVENTS)
+        if event == 'resource':
+            _resource_find(character, 'good', result, rng)
+        else:
+            _friendly_encounter(result, rng)
+    elif final_chance > NEUTRAL_THRESHOLD:  # Neutral outcome (50%)
+        result = ActionResult('adventure', "", outcome='neutral')
+        event = rng.choice(NEUTRAL_EVENTS)
+        if event == 'resource':
+            _resource_find(character, 'neutral', result, rng)
+        elif event == 'nothing':
+            result.message = "You find nothing of value, but stay safe."
+        else:
+            result.message = "The area is quiet, allowing for a thorough search."
+    else:  # Bad outcome (30%)
+        result = ActionResult('adventure', "", outcome='bad', success=False)
+        event = rng.choice(BAD_EVENTS)
+        if event == 'zombie':
+            _zombie_encounter(character, result, rng)
+        elif event == 'bandit':
+            _bandit_encounter(character, result, rng)
+        else:
+            _accident(character, result, rng)
+
+    return result
+
+def _resource_find(character, quality, result, rng):
+    resource = rng.choice(ALL_RESOURCES)
+    if quality == 'good':
+        amount = rng.randint(*GOOD_FIND_RANGE)
+    else:  # neutral
+        amount = rng.randint(*NEUTRAL_FIND_RANGE)
+
+    character.resources[resource] += amount
+    _change(result, resource, amount)
+    result.message = f"You found {amount} {resource}!"
+
+def _friendly_encounter(result, rng):
+    result.visitor = roll_visitor(rng)
+    result.message = f"You meet {result.visitor['name']}, a {result.visitor['type']}..."
+
+def _zombie_encounter(character, result, rng):
+    # Lose some resources running away
+    resource = rng.choice(['food', 'water', 'wood', 'rope'])
+    amount = rng.randint(*ZOMBIE_LOSS_RANGE)
+    if character.resources[resource] >= amount:
+        character.resources[resource] -= amount
+        _change(result, resource, -amount)
+        result.message = f"Zombies force you to drop {amount} {resource} while escaping!"
+    else:
+        _lose_ap(character, result)
+        result.message = "Zombies appear! You escape, but lose 1 AP from exhaustion!"
+
+def _bandit_encounter(character, result, rng):
+    # Bandits steal resources
+    resource = rng.choice(['food', 'water', 'wood', 'rope'])
+    amount = rng.randint(*BANDIT_LOSS_RANGE)
+    if character.resources[resource] >= amount:
+        character.resources[resource] -= amount
+        _change(result, resource, -amount)
+        result.message = f"Bandits rob you of {amount} {resource}!"
+    else:
+        _change(result, resource, -character.resources[resource])
+        character.resources[resource] = 0
+        result.message = f"Bandits take all your {resource}!"
+
+def _accident(character, result, rng):
+    # Random accident that costs AP
+    _lose_ap(character, result)
+    result.message = rng.choice([
+        "You twist your ankle! (-1 AP)",
+        "You get lost and waste time! (-1 AP)",
+        "The weather turns bad! (-1 AP)"
+    ])
+
+def _lose_ap(character, result):
+    if character.current_ap > 0:
+        character.current_ap -= 1
+        result.ap_spent += 1
+
+def build_shop_counter(character: Character) -> ActionResult:
+    if "Shop Counter" in character.base_upgrades:
+        return ActionResult('build', "You already have a Shop Counter!", success=False)
+
+    if character.resources["wood"] >= 10 and character.resources["rope"] >= 2:
+        character.resources["wood"] -= 10
+        character.resources["rope"] -= 2
+        character.base_upgrades.append("Shop Counter")
+        character.objectives_completed["build_shop"] = True
+        return ActionResult(
+            'build', "Shop Counter built successfully!",
+            resource_changes={"wood": -10, "rope": -2}
+        )
+    return ActionResult('build', "You need 10 wood and 2 rope to build this...", success=False)
+
+# --- Visitors and trading ---
+
+def roll_visitor(rng=random) -> dict:
+    visitor_type = rng.choices(VISITOR_TYPES, weights=[v['join_chance'] for v in VISITOR_TYPES])[0]
+    return {
+        'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        'type': visitor_type['type'],
+        'description': visitor_type['description'],
+        'ap': visitor_type['ap'],
+        'join_chance': visitor_type['join_chance']
+    }
+
+def recruit_chance(character: Character, base_chance: float) -> float:
+    # Resource bonus scales with total resources: 1% per unit, capped at 30%
+    resource_bonus = min(sum(character.resources.values()) * 0.01, 0.3)
+    return base_chance + (character.charisma * 0.05) + resource_bonus
+
+def try_recruit(character: Character, visitor: dict, base_chance: float, rng=random) -> ActionResult:
+    if rng.random() < recruit_chance(character, base_chance):
+        character.camp_members.append({
+            'name': visitor['name'],
+            'type': visitor['type'],
+            'mode': 'gather',  # Default mode
+            'ap': visitor['ap']
+        })
+
+        if len(character.camp_members) == 1:
+            character.objectives_completed['recruit_member'] = True
+        if len(character.camp_members) >= 3:
+            character.objectives_completed['three_members'] = True
+
+        return ActionResult('recruit', f"{visitor['name']} has joined your camp!", visitor=visitor)
+    return ActionResult('recruit', f"{visitor['name']} declined to join...", success=False, visitor=visitor)
+
+def valid_trades(character: Character, trade_options) -> list:
+    return [(give_resource, give_amount, get_resource, get_amount)
+            for give_resource, give_amount, get_resource, get_amount in trade_options
+            if character.resources[give_resource] >= give_amount]
+
+def get_valid_shop_trades(character: Character, rng=random) -> list:
+    trades = []
+    for sell_resource, amount in character.shop_inventory.items():
+        if amount > 0:
+            for pay_resource, rate in character.shop_prices[sell_resource].items():
+                sell_amount = min(rng.randint(1, 3), amount)
+                pay_amount = int(sell_amount * rate * rng.uniform(1.0, 1.5))
+                trades.append((sell_resource, sell_amount, pay_resource, pay_amount))
+    return trades
+
+# --- Day end ---
+
+def member_gather_chance(member_type: str) -> float:
+    # Base 20% chance + type bonus for Survivors (30%)
+    return 0.2 + (0.1 if member_type == 'Survivor' else 0)
+
+def member_adventure_chance(member_type: str) -> float:
+    # Base 25% chance + type bonus for Scouts (35%)
+    return 0.25 + (0.1 if member_type == 'Scout' else 0)
+
+def process_member_activities(character: Character, rng=random) -> dict:
+    """Run every camp member's job for the day.
+
+    Gathered resources are added to the character's stockpile; the returned
+    dict is what the day end reports display. Adventures are AdventureRecords
+    (see adventure_text) with their totals per outcome in 'outcome_counts'.
+    """
+    results = {
+        'gathered_resources': {'wood': 0, 'water': 0, 'food': 0},
+        'guards': character.camp_members.ids_in_mode('guard'),
+        'adventures': [],
+        'outcome_counts': {'good': 0, 'neutral': 0, 'bad': 0}
+    }
+
+    # Guards don't roll anything, so only the other two jobs are visited
+    for member in character.camp_members.in_mode('gather'):
+        # Process gathering - use AP for multiple attempts
+        success_chance = member_gather_chance(member['type'])
+        for _ in range(member['ap']):
+            resource = rng.choice(GATHERABLE_RESOURCES)
+            if rng.random() < success_chance:
+                amount = rng.randint(1, 2)
+                results['gathered_resources'][resource] += amount
+
+    for member in character.camp_members.in_mode('adventure'):
+        # Process adventures - one adventure per 2 AP
+        success_chance = member_adventure_chance(member['type'])
+        for _ in range(member['ap'] // 2):
+            location_type = rng.choice(['city', 'woods'])
+            location = rng.choice(list(ADVENTURE_SCENARIOS[location_type].keys()))
+
+            if rng.random() < success_chance:
+                outcome = 'good'
+            elif rng.random() < MEMBER_NEUTRAL_CHANCE:
+                outcome = 'neutral'
+            else:
+                outcome = 'bad'
+
+            scenario = rng.randrange(len(ADVENTURE_SCENARIOS[location_type][location][outcome]))
+            results['adventures'].append(AdventureRecord(member.id, location_type, location, outcome, scenario))
+            results['outcome_counts'][outcome] += 1
+
+    for resource, amount in results['gathered_resources'].items():
+        character.resources[resource] += amount
+
+    return results
+
+def adventure_text(character: Character, record: AdventureRecord) -> str:
+    name = character.camp_members.get(record.member_id)['name']
+    scenarios = ADVENTURE_SCENARIOS[record.location_type][record.location][record.outcome]
+    return f"{name}: {scenarios[record.scenario]}"
+
+def consume_daily_upkeep(character: Character) -> tuple:
+    """Everyone in camp eats and drinks one unit. Returns (food, water) consumed."""
+    total_members = len(character.camp_members) + 1
+    food_consumed = total_members * 1
+    water_consumed = total_members * 1
+
+    character.resources['food'] = max(0, character.resources['food'] - food_consumed)
+    character.resources['water'] = max(0, character.resources['water'] - water_consumed)
+    return food_consumed, water_consumed
+
+def run_day_end(character: Character, rng=random) -> DayEndReport:
+    """Headless version of the whole day end sequence shown by the popups."""
+    day = character.current_day
+    member_results = process_member_activities(character, rng)
+    food_consumed, water_consumed = consume_daily_upkeep(character)
+    character.refresh_day()
+    return DayEndReport(member_results, food_consumed, water_consumed, day)
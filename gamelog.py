@@ -0,0 +1,79 @@
+# gamelog.py
+# The game's log: recorded in memory, written out when something goes wrong.
+#
+# Records go into a ring buffer of the last RING_SIZE entries and are only
+# formatted when the buffer is dumped, so a debug line costs an append rather
+# than a write to the terminal. Messages use logging's lazy %-style arguments
+# (log.debug("AP %s", ap)), and calls below the logger's level return before
+# any record is built. Only ECHO_LEVEL and above also go to stderr.
+#
+# install_crash_dump() writes the buffer to CRASH_FILE when an exception
+# escapes, from the main loop or from a background thread.
+import logging
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+
+RING_SIZE = 2000
+LEVEL = logging.DEBUG  # Lowest level recorded at all
+ECHO_LEVEL = logging.INFO  # Lowest level also written to stderr
+CRASH_FILE = Path("crash.log")
+FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+log = logging.getLogger('zombievibe')
+
+class RingBuffer(logging.Handler):
+    """Keeps the most recent records, unformatted, until dump() is called."""
+    def __init__(self, capacity=RING_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def dump(self, stream):
+        for record in list(self.records):
+            stream.write(self.format(record) + "\n")
+
+ring = RingBuffer()
+ring.setFormatter(logging.Formatter(FORMAT))
+
+def setup(level=LEVEL, echo_level=ECHO_LEVEL):
+    """Route the game's log to the ring buffer and stderr. Safe to call again to change levels."""
+    log.setLevel(level)
+    log.propagate = False  # Kivy's handlers on the root logger would print everything again
+    if ring not in log.handlers:
+        log.addHandler(ring)
+    for handler in log.handlers:
+        if isinstance(handler, logging.StreamHandler):
+            handler.setLevel(echo_level)
+            break
+    else:
+        echo = logging.StreamHandler(sys.stderr)
+        echo.setLevel(echo_level)
+        echo.setFormatter(logging.Formatter(FORMAT))
+        log.addHandler(echo)
+
+def dump(path=CRASH_FILE):
+    with open(path, 'w') as f:
+        ring.dump(f)
+
+def install_crash_dump(path=CRASH_FILE):
+    """Dump the ring buffer to path when an exception goes unhandled."""
+    previous = sys.excepthook
+    previous_thread = threading.excepthook
+
+    def on_exception(exc_type, exc, tb):
+        log.critical("Unhandled exception", exc_info=(exc_type, exc, tb))
+        dump(path)
+        previous(exc_type, exc, tb)
+
+    def on_thread_exception(args):
+        log.critical("Unhandled exception in %s", args.thread.name if args.thread else "a thread",
+                     exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+        dump(path)
+        previous_thread(args)
+
+    sys.excepthook = on_exception
+    threading.excepthook = on_thread_exception
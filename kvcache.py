@@ -0,0 +1,169 @@
+# kvcache.py
+# Loads kv files without re-parsing them on every launch.
+#
+# Builder.load_file parses the whole file each time. Here the parsed rule set
+# is pickled to __kvcache__/ next to the kv file, under a key made from the
+# file's hash and the Kivy and Python versions, so an unchanged layout is
+# unpickled instead of parsed. Editing the file changes the hash, which makes
+# the old entry miss. If the cache can't be written (read-only install) the
+# file is simply parsed as before.
+#
+#   python kvcache.py             precompile zombievibe.kv (a build step)
+#   python kvcache.py --bench     time parsing against loading from the cache
+import argparse
+import copyreg
+import hashlib
+import io
+import marshal
+import os
+import pickle
+import sys
+import time
+import types
+from functools import partial
+from pathlib import Path
+
+DEFAULT_KV = Path(__file__).with_name('zombievibe.kv')
+CACHE_DIR = '__kvcache__'
+
+def _reduce_code(code):
+    return marshal.loads, (marshal.dumps(code),)
+
+class _RulePickler(pickle.Pickler):
+    # Parsed rules hold compiled property expressions, which plain pickle
+    # can't store; marshal can
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[types.CodeType] = _reduce_code
+
+def cache_key(source: bytes) -> str:
+    import kivy
+    digest = hashlib.sha256(source)
+    digest.update(f"{kivy.__version__} {sys.version_info[:2]}".encode())
+    return digest.hexdigest()[:20]
+
+def cache_path(filename, source: bytes) -> Path:
+    filename = Path(filename)
+    return filename.parent / CACHE_DIR / f"{filename.stem}-{cache_key(source)}.pickle"
+
+def parse(filename, source: bytes):
+    from kivy.lang.parser import Parser
+    return Parser(content=source.decode('utf8'), filename=str(filename))
+
+def compile_file(filename) -> Path:
+    """Parse a kv file and store the result in the cache. Returns the cache path."""
+    source = Path(filename).read_bytes()
+    path = cache_path(filename, source)
+    _store(path, parse(filename, source))
+    return path
+
+def _store(path, parser):
+    buffer = io.BytesIO()
+    _RulePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(parser)
+    path.parent.mkdir(exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_bytes(buffer.getvalue())
+    os.replace(tmp, path)
+    # Older entries for this file are stale now
+    prefix = path.stem.rsplit('-', 1)[0]
+    for old in path.parent.glob(f"{prefix}-*.pickle"):
+        if old != path:
+            old.unlink()
+
+def load_parser(filename):
+    """The parsed rules for a kv file, from the cache when the file is unchanged."""
+    source = Path(filename).read_bytes()
+    path = cache_path(filename, source)
+    try:
+        with open(path, 'rb') as f:
+            parser = pickle.load(f)
+        # Parsing runs #:import, #:set and #:include as it goes; a cached
+        # parser has to run them itself
+        parser.execute_directives()
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # Written by another Kivy or Python, or damaged. Unpickling can fail
+        # in almost any way then, so drop the entry and parse again
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+    else:
+        return parser
+    parser = parse(filename, source)
+    try:
+        _store(path, parser)
+    except OSError:
+        pass
+    return parser
+
+def load_file(filename):
+    """Builder.load_file, but using the cache. Returns the root widget if the file has one."""
+    from kivy.factory import Factory
+    from kivy.lang import Builder
+
+    filename = str(filename)
+    if filename in Builder.files:
+        # Same rules twice would apply everything twice; let Builder warn as usual
+        return Builder.load_file(filename)
+    parser = load_parser(filename)
+    if parser.root:
+        # Root widgets are built by Builder itself; files with one aren't cached
+        return Builder.load_file(filename)
+
+    # What Builder.load_string does after parsing
+    Builder.rules.extend(parser.rules)
+    Builder._clear_matchcache()
+    for name, cls, template in parser.templates:
+        Builder.templates[name] = (cls, template, filename)
+        Factory.register(name, cls=partial(Builder.template, name), is_template=True, warn=True)
+    for name, baseclasses in parser.dynamic_classes.items():
+        Factory.register(name, baseclasses=baseclasses, filename=filename, warn=True)
+    if parser.templates or parser.dynamic_classes or parser.rules:
+        Builder.files.append(filename)
+    return None
+
+def benchmark(filename=DEFAULT_KV, repeat=50) -> dict:
+    """Milliseconds to parse the kv file, to load it from the cache, and the
+    parse's share of importing the game plus parsing."""
+    start = time.perf_counter()
+    import main  # noqa: F401  Kivy, the window and the game modules
+    import_ms = (time.perf_counter() - start) * 1000
+
+    source = Path(filename).read_bytes()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(filename, source)
+    parse_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    compile_file(filename)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        load_parser(filename)
+    cached_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    return {
+        'import_ms': round(import_ms, 2),
+        'parse_ms': round(parse_ms, 2),
+        'cached_ms': round(cached_ms, 2),
+        'parse_share': round(parse_ms / (import_ms + parse_ms), 4)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompile kv layouts into the parse cache.")
+    parser.add_argument('files', nargs='*', default=[str(DEFAULT_KV)])
+    parser.add_argument('--bench', action='store_true', help="Time parsing against cached loading")
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        for filename in args.files:
+            result = benchmark(filename, args.repeat)
+            print(f"{filename}: parse {result['parse_ms']}ms, cached {result['cached_ms']}ms, "
+                  f"parse is {result['parse_share']:.1%} of import + parse ({result['import_ms']}ms import)")
+        return
+    for filename in args.files:
+        print(f"{filename} -> {compile_file(filename)}")
+
+if __name__ == '__main__':
+    main()
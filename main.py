@@ -1,259 +1,130 @@
 # main.py
+import startup  # First, so startup timing covers the imports below
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.properties import ObjectProperty, StringProperty
-from kivy.config import Config
 from kivy.core.window import Window
 from kivy.uix.popup import Popup
 from kivy.uix.button import Button
 from kivy.uix.label import Label
-from pathlib import Path
-import json
-from character import Character, CHARACTER_PRESETS
+from character import Character, Treasure, CHARACTER_PRESETS, find_character_class
+import catalog
+import engine
+import gamelog
+from gamelog import log
+import kvcache
+import perf
+import saves
+from saves import save_character
+from autosave import SaveWorker
+from modals import ModalQueue, PopupPool
+from engine import FIRST_NAMES, LAST_NAMES, LOCATIONS
+import os
 import random
+from collections import Counter
 from kivy.uix.boxlayout import BoxLayout
-from dataclasses import dataclass, field
-from typing import Dict
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.anchorlayout import AnchorLayout
 from kivy.clock import Clock
 from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+
+startup.mark('import')
 
 # Set window size (default is usually 800x600, so 10% bigger would be 880x660)
 Window.size = (880, 660)
 
-@dataclass
-class Treasure:
-    name: str
-    category: str
-    value: int
-    location_found: str
-    description: str
-    day_found: int  # To track when it was found
-
-ADVENTURE_SCENARIOS = {
-    "city": {
-        "abandoned_mall": {
-            "good": [
-                "You discover a cache of valuable electronics!",
-                "You find an untouched storage area full of preserved goods!",
-                "A friendly group of traders welcomes you to their temporary camp."
-            ],
-            "neutral": [
-                "You find some common supplies. Better than nothing.",
-                "The area is picked clean but at least it was safe.",
-                "You exchange information with neutral scavengers."
-            ],
-            "bad": [
-                "Part of the ceiling collapses, forcing you to retreat.",
-                "A small horde of zombies notices you.",
-                "Local bandits demand you leave their territory."
-            ]
-        },
-        "hospital": {
-            "good": [
-                "You find a stash of valuable medical supplies!",
-                "Untouched medical equipment - perfect for trading!",
-                "You meet a grateful doctor who promises to visit your base."
-            ],
-            "neutral": [
-                "You salvage some basic first aid supplies.",
-                "The darkness limits your search, but you stay safe.",
-                "You have a peaceful standoff with other scavengers."
-            ],
-            "bad": [
-                "The air feels wrong here - better leave quickly.",
-                "Zombies have you cornered in the pharmacy.",
-                "You knock over some chemicals and retreat from the fumes."
-            ]
-        },
-        "residential_district": {
-            "good": [
-                "You find a well-preserved food cache!",
-                "A garage full of useful tools and materials!",
-                "You help a family in need - they won't forget this."
-            ],
-            "neutral": [
-                "You gather scattered supplies from various houses.",
-                "Most houses are looted, but you stay hopeful.",
-                "Cautious residents watch you from afar."
-            ],
-            "bad": [
-                "A pack of dogs guards this neighborhood.",
-                "Armed residents make it clear you're not welcome.",
-                "The floorboards give way beneath you."
-            ]
-        }
-    },
-    "woods": {
-        "river_expedition": {
-            "good": [
-                "You discover a clean water source!",
-                "Abandoned camping supplies in pristine condition!",
-                "You find an excellent fishing spot!"
-            ],
-            "neutral": [
-                "You collect a bit of water - it's something.",
-                "You spot some animal tracks but nothing else.",
-                "You share the river with peaceful hunters."
-            ],
-            "bad": [
-                "You lose your way in the thick forest.",
-                "This water doesn't look safe to drink.",
-                "Something large is stalking you..."
-            ]
-        },
-        "ranger_station": {
-            "good": [
-                "You find detailed maps of the area!",
-                "A cache of survival gear - jackpot!",
-                "The radio still works - this could be valuable!"
-            ],
-            "neutral": [
-                "You find some basic camping supplies.",
-                "The station is empty but provides good shelter.",
-                "Other explorers share some useful information."
-            ],
-            "bad": [
-                "You've stumbled upon a bear's den.",
-                "An old trap nearly catches you.",
-                "The station's roof looks ready to cave in."
-            ]
-        },
-        "abandoned_campgrounds": {
-            "good": [
-                "You find a stockpile of preserved food!",
-                "Quality camping gear - perfect for trading!",
-                "Friendly survivors share their supplies."
-            ],
-            "neutral": [
-                "You gather scattered supplies from various houses.",
-                "The campground is empty but peaceful.",
-                "Some supplies are salvageable, some ruined."
-            ],
-            "bad": [
-                "This camp is already claimed - and guarded.",
-                "Zombies are shambling through the camp.",
-                "Smoke in the distance - forest fire!"
-            ]
-        }
-    }
-}
-
-LOCATION_TREASURES = {
-    "hospital": [
-        Treasure("Sealed Antibiotics", "Medical", 500, "Hospital", "A rare find of untouched medicine", 0),
-        # ... more treasures
-    ],
-    "mall": [
-        Treasure("Working Laptop", "Electronics", 600, "Mall", "Still has some charge!", 0),
-        # ... more treasures
-    ],
-    # ... more locations
-}
-
-FIRST_NAMES = [
-    "James", "Emma", "Michael", "Sarah", "David", "Lisa", "John", "Anna", 
-    "Robert", "Maria", "William", "Sofia", "Marcus", "Elena", "Thomas", "Nina",
-    "Carlos", "Maya", "Hassan", "Yuki", "Igor", "Zara", "Chen", "Aisha"
-]
-
-LAST_NAMES = [
-    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
-    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Chen", "Wong", "Kim", "Singh",
-    "Patel", "Ivanov", "Sato", "Cohen", "Weber", "Silva", "Murphy", "O'Connor"
-]
-
-VISITOR_TYPES = [
-    {"type": "Trader", "join_chance": 0.2, "description": "A cautious trader looking for safe routes.", "ap": 3},
-    {"type": "Survivor", "join_chance": 0.4, "description": "A capable survivor seeking shelter.", "ap": 4},
-    {"type": "Doctor", "join_chance": 0.15, "description": "A skilled medical professional.", "ap": 2},
-    {"type": "Engineer", "join_chance": 0.15, "description": "A practical problem-solver.", "ap": 2},
-    {"type": "Scout", "join_chance": 0.3, "description": "An experienced wasteland scout.", "ap": 5}
-]
+gamelog.setup()
+
+# Saves run on a background thread; results are reported back on the Kivy thread
+save_worker = SaveWorker(dispatch=lambda fn: Clock.schedule_once(lambda dt: fn()),
+                         save=perf.timed('save')(saves.save_character))
+
+# Every popup that opens is tracked here; sequences of popups wait on it
+# instead of on timers
+modals = ModalQueue()
+modals.attach(Window)
+
+# On the game screen: F3 shows action timings, F4 writes them to perf.csv
+PERF_OVERLAY_KEY = 284
+PERF_EXPORT_KEY = 285
 
 class MainMenu(Screen):
     pass
 
+class SaveRow(Button):
+    # One recycled row of the Load Game list; the RecycleView reuses these
+    file = StringProperty('')
+
+    def on_release(self):
+        App.get_running_app().root.get_screen('load_game').load_character(self.file)
+
 class LoadGameScreen(Screen):
+    sort_key = StringProperty('mtime')  # 'mtime' (last played) or 'day'
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.refresh_saves()
+        self.save_entries = []  # Read in on_pre_enter, not at startup
+        self.sorted_saves = {}
+        self.query = ''
+        self.matches = None
 
     def on_pre_enter(self):  # This is called whenever the screen is about to be shown
         self.refresh_saves()  # Refresh the save list before showing the screen
 
     def refresh_saves(self):
-        # Clear previous saves from display
-        self.ids.saves_grid.clear_widgets()
-        
-        # Create Characters directory if it doesn't exist
-        Path("Characters").mkdir(exist_ok=True)
-        
-        # Get all save files
-        save_files = list(Path("Characters").glob("*.json"))
-        
-        if not save_files:
-            self.ids.saves_grid.add_widget(Label(
-                text="No Saved Games Found...",
-                size_hint_y=None,
-                height='40dp'
-            ))
+        # Read the save index instead of opening every save file
+        self.save_entries = [(e['name'].lower(), e) for e in saves.read_index().values()]
+        self.sorted_saves = {}
+        self.matches = None
+        self.filter_saves(self.ids.search_input.text)
+
+    def sort_saves(self, key):
+        self.sort_key = key
+        self.matches = None
+        self.filter_saves(self.query)
+
+    def get_sorted_saves(self):
+        # Sort lazily and only once per key until the saves change
+        if self.sort_key not in self.sorted_saves:
+            self.sorted_saves[self.sort_key] = sorted(
+                self.save_entries, key=lambda pair: pair[1][self.sort_key], reverse=True
+            )
+        return self.sorted_saves[self.sort_key]
+
+    def filter_saves(self, text):
+        query = text.strip().lower()
+        if self.matches is not None and query.startswith(self.query):
+            # Typing more can only narrow the previous matches
+            candidates = self.matches
         else:
-            for save_file in save_files:
-                btn = Button(
-                    text=save_file.stem,
-                    size_hint_y=None,
-                    height='40dp'
-                )
-                btn.bind(on_release=lambda x, file=save_file: self.load_character(file))
-                self.ids.saves_grid.add_widget(btn)
+            candidates = self.get_sorted_saves()
+        self.matches = [pair for pair in candidates if query in pair[0]]
+        self.query = query
+
+        self.ids.saves_list.data = [
+            {
+                'text': f"{entry['name']} - {entry['class']}, Day {entry['day']}",
+                'file': saves.entry_key(entry)
+            } for _, entry in self.matches
+        ]
+
+        if not self.save_entries:
+            self.ids.empty_label.text = "No Saved Games Found..."
+        elif not self.matches:
+            self.ids.empty_label.text = "No saves match your search..."
+        else:
+            self.ids.empty_label.text = ""
 
+    @perf.timed('load')
     def load_character(self, file_path):
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            
-            character = Character(
-                name=data['name'],
-                endurance=data['endurance'],
-                scavenging=data['scavenging'],
-                charisma=data['charisma'],
-                combat=data['combat'],
-                crafting=data['crafting']
-            )
-            character.resources = data.get('resources', {"wood": 0, "water": 0, "food": 0, "rope": 5})
-            character.base_upgrades = data.get('base_upgrades', [])
-            character.camp_members = data.get('camp_members', [])
-            character.current_ap = data.get('current_ap', character.action_points)
-            character.current_day = data.get('current_day', 1)
-            character.objectives_completed = data.get('objectives_completed', 
-                {"gather_basics": False, "build_shop": False, "go_adventure": False, "recruit_member": False, "three_members": False})
-            character.shop_inventory = data.get('shop_inventory', {"wood": 0, "water": 0, "food": 0, "rope": 0})
-            
-            # Load treasures
-            character.treasures = [
-                Treasure(
-                    name=t['name'],
-                    category=t['category'],
-                    value=t['value'],
-                    location_found=t['location_found'],
-                    description=t['description'],
-                    day_found=t['day_found']
-                ) for t in data.get('treasures', [])
-            ]
-            
-            character.shop_treasures = [
-                Treasure(
-                    name=t['name'],
-                    category=t['category'],
-                    value=t['value'],
-                    location_found=t['location_found'],
-                    description=t['description'],
-                    day_found=t['day_found']
-                ) for t in data.get('shop_treasures', [])
-            ]
+            # Make sure a save still in flight has reached the disk
+            save_worker.flush()
+            character = saves.load_character(file_path)
             
             # Get the game screen and set the character
             game_screen = self.manager.get_screen('game_screen')
@@ -263,6 +134,7 @@ class LoadGameScreen(Screen):
             self.manager.current = 'game_screen'
             
         except Exception as e:
+            log.exception("Failed to load save %s", file_path)
             popup = Popup(
                 title='Error',
                 content=Label(text=f'Failed to load save: {str(e)}'),
@@ -308,29 +180,20 @@ class CharacterCreationScreen(Screen):
             popup.open()
             return
         
+        name = self.name_input.text.strip()
+        if name in saves.read_index():
+            # Saves are keyed by name, so this would overwrite the old one
+            popup = Popup(
+                title='Error',
+                content=Label(text=f'A save named {name} already exists'),
+                size_hint=(None, None),
+                size=(400, 200)
+            )
+            popup.open()
+            return
+
         # Create new character with all attributes
-        character = Character(
-            name=self.name_input.text.strip(),
-            endurance=CHARACTER_PRESETS[self.selected_preset].endurance,
-            scavenging=CHARACTER_PRESETS[self.selected_preset].scavenging,
-            charisma=CHARACTER_PRESETS[self.selected_preset].charisma,
-            combat=CHARACTER_PRESETS[self.selected_preset].combat,
-            crafting=CHARACTER_PRESETS[self.selected_preset].crafting,
-            resources={"wood": 0, "water": 0, "food": 0, "rope": 5},
-            base_upgrades=[],
-            camp_members=[],
-            current_ap=CHARACTER_PRESETS[self.selected_preset].endurance * 2,
-            current_day=1,
-            objectives_completed={
-                "gather_basics": False,
-                "build_shop": False,
-                "go_adventure": False,
-                "recruit_member": False,
-                "three_members": False
-            },
-            treasures=[],  # Initialize empty treasures list
-            shop_treasures=[]  # Initialize empty shop treasures list
-        )
+        character = engine.new_character(name, self.selected_preset)
         
         try:
             if save_character(character):
@@ -341,6 +204,7 @@ class CharacterCreationScreen(Screen):
                 # Switch to game screen
                 self.manager.current = 'game_screen'
         except Exception as e:
+            log.exception("Failed to save new character %s", character.name)
             popup = Popup(
                 title='Error',
                 content=Label(text=f'Failed to save character: {str(e)}'),
@@ -349,6 +213,43 @@ class CharacterCreationScreen(Screen):
             )
             popup.open()
 
+class MessagePopup(Popup):
+    # A message and a button to close it. These are pooled (see show_message),
+    # so the text lives in a property the label follows
+    message = StringProperty('')
+    close_text = StringProperty('Close')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.auto_dismiss = False
+        
+        layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        label = Label(text=self.message)
+        self.bind(message=label.setter('text'))
+        layout.add_widget(label)
+        
+        close_btn = Button(
+            text=self.close_text,
+            size_hint_y=None,
+            height='40dp'
+        )
+        self.bind(close_text=close_btn.setter('text'))
+        close_btn.bind(on_release=self.dismiss)
+        layout.add_widget(close_btn)
+        
+        self.content = layout
+
+message_popups = PopupPool(MessagePopup)
+
+def show_message(text, title="Result", size_hint=(0.6, 0.4), close_text="Close"):
+    popup = message_popups.get()
+    popup.title = title
+    popup.size_hint = size_hint
+    popup.close_text = close_text
+    popup.message = text
+    popup.open()
+    return popup
+
 class ResourceGatheringPopup(Popup):
     def __init__(self, character, **kwargs):
         super().__init__(**kwargs)
@@ -361,10 +262,7 @@ class ResourceGatheringPopup(Popup):
         layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
         # Status display
-        self.status_label = Label(
-            text=f"Action Points: {self.character.current_ap}\n"
-                 f"Scavenging Skill: {self.character.scavenging}"
-        )
+        self.status_label = Label()
         layout.add_widget(self.status_label)
         
         # Resource buttons
@@ -385,73 +283,30 @@ class ResourceGatheringPopup(Popup):
             height='40dp'
         )
         
-        def force_close(instance):
-            print("Attempting force close")  # Debug print
-            self.dismiss()
-            # Force removal from parent if dismiss doesn't work
-            if self.parent:
-                self.parent.remove_widget(self)
-                
-        self.close_btn.bind(on_release=force_close)
+        self.close_btn.bind(on_release=self.dismiss)
         layout.add_widget(self.close_btn)
         
         self.content = layout
 
+    @perf.timed('gather')
     def gather_resource(self, instance):
-        resource = instance.resource
-        if self.character.current_ap <= 0:
-            self._show_message("Not enough Action Points!")
+        result = engine.gather_resource(self.character, instance.resource)
+        if not result.ap_spent:
+            show_message(result.message)
             return
         
-        self.character.current_ap -= 1
-        
-        success_chance = 0.3 + (self.character.scavenging * 0.05)
-        success_chance = min(success_chance, 0.95)
-        
-        if random.random() < success_chance:
-            amount = random.randint(1, 3) + (self.character.scavenging // 3)
-            self.character.resources[resource] += amount
-            message = f"Success! Found {amount} {resource}!"
-            
-            if resource in ['food', 'water']:
-                if (self.character.resources['food'] >= 1 and 
-                    self.character.resources['water'] >= 1):
-                    self.character.objectives_completed['gather_basics'] = True
-        else:
-            message = f"No luck finding {resource} this time..."
-        
+        self.update_status()
+        show_message(result.message)
+
+    def update_status(self):
         self.status_label.text = (
             f"Action Points: {self.character.current_ap}\n"
             f"Scavenging Skill: {self.character.scavenging}"
         )
-        
-        self._show_message(message)
 
-    def _show_message(self, text):
-        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        content.add_widget(Label(text=text))
-        
-        close_button = Button(
-            text='Close',
-            size_hint_y=None,
-            height='40dp'
-        )
-        content.add_widget(close_button)
-        
-        result_popup = Popup(
-            title='Result',
-            content=content,
-            size_hint=(0.6, 0.4),
-            auto_dismiss=False
-        )
-        
-        close_button.bind(on_release=result_popup.dismiss)
-        result_popup.open()
-
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
+    def on_pre_open(self):
+        # The popup is kept between uses, so catch up on anything that changed
+        self.update_status()
 
 class ObjectivesPopup(Popup):
     def __init__(self, character, **kwargs):
@@ -529,11 +384,6 @@ class ObjectivesPopup(Popup):
         self.size_hint = (0.8, 0.8)
         self.auto_dismiss = False
 
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
-
 class BaseBuildingPopup(Popup):
     def __init__(self, character, **kwargs):
         super().__init__(**kwargs)
@@ -543,110 +393,60 @@ class BaseBuildingPopup(Popup):
         self.auto_dismiss = False
         
         self.main_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        self.refresh_content()
-        self.content = self.main_layout
-
-    def refresh_content(self):
-        # Clear existing widgets
-        self.main_layout.clear_widgets()
         
         # Display current resources
-        self.resources_label = Label(
-            text=f"Current Resources:\n" +
-                 f"Wood: {self.character.resources['wood']}\n" +
-                 f"Rope: {self.character.resources['rope']}"
-        )
+        self.resources_label = Label()
         self.main_layout.add_widget(self.resources_label)
         
-        # Only show build options if shop counter isn't built
-        if "Shop Counter" not in self.character.base_upgrades:
-            shop_btn = Button(
-                text="Build Shop Counter (Costs: 10 wood, 2 rope)",
-                size_hint_y=None,
-                height='40dp'
-            )
-            shop_btn.bind(on_release=self.build_shop_counter)
-            self.main_layout.add_widget(shop_btn)
-        else:
-            self.main_layout.add_widget(Label(
-                text="Future upgrades coming soon...",
-                size_hint_y=None,
-                height='40dp'
-            ))
+        # Holds the build option, or a note once there's nothing left to build
+        self.option_slot = BoxLayout(size_hint_y=None, height='40dp')
+        self.main_layout.add_widget(self.option_slot)
+        
+        self.shop_btn = Button(text="Build Shop Counter (Costs: 10 wood, 2 rope)")
+        self.shop_btn.bind(on_release=self.build_shop_counter)
+        self.no_upgrades_label = Label(text="Future upgrades coming soon...")
         
-        # Close button with force close
         close_btn = Button(
             text="Close",
             size_hint_y=None,
             height='40dp'
         )
         
-        def force_close(instance):
-            self.dismiss()
-            # Force removal from parent if dismiss doesn't work
-            if self.parent:
-                self.parent.remove_widget(self)
-            # Update the game screen
-            game_screen = App.get_running_app().root.get_screen('game_screen')
-            game_screen.update_ui()
-                
-        close_btn.bind(on_release=force_close)
+        close_btn.bind(on_release=self.dismiss)
         self.main_layout.add_widget(close_btn)
+        
+        self.refresh_content()
+        self.content = self.main_layout
 
+    def refresh_content(self):
+        self.resources_label.text = (
+            f"Current Resources:\n"
+            f"Wood: {self.character.resources['wood']}\n"
+            f"Rope: {self.character.resources['rope']}"
+        )
+        
+        # Only show build options if shop counter isn't built
+        if "Shop Counter" not in self.character.base_upgrades:
+            option = self.shop_btn
+        else:
+            option = self.no_upgrades_label
+        if option.parent is None:
+            self.option_slot.clear_widgets()
+            self.option_slot.add_widget(option)
+
+    def on_pre_open(self):
+        self.refresh_content()
+
+    @perf.timed('build')
     def build_shop_counter(self, instance):
-        if "Shop Counter" in self.character.base_upgrades:
-            self.show_result("You already have a Shop Counter!")
-            return
-            
-        if self.character.resources["wood"] >= 10 and self.character.resources["rope"] >= 2:
-            self.character.resources["wood"] -= 10
-            self.character.resources["rope"] -= 2
-            self.character.base_upgrades.append("Shop Counter")
-            self.character.objectives_completed["build_shop"] = True
-            
+        result = engine.build_shop_counter(self.character)
+        if result.success:
             # Refresh the content instead of reinitializing
             self.refresh_content()
-            
-            self.show_result("Shop Counter built successfully!")
-        else:
-            self.show_result("You need 10 wood and 2 rope to build this...")
+        self.show_result(result.message)
 
     def show_result(self, text):
-        # Create a single BoxLayout as the sole content widget
-        content = BoxLayout(
-            orientation='vertical',
-            padding=10,
-            spacing=10,
-            size_hint_y=None,
-            height='100dp'
-        )
-        
-        # Add message label to the layout
-        content.add_widget(Label(
-            text=text,
-            size_hint_y=None,
-            height='40dp'
-        ))
-        
-        # Add close button to the layout
-        close_btn = Button(
-            text="Close",
-            size_hint_y=None,
-            height='40dp'
-        )
-        content.add_widget(close_btn)
-        
-        # Create popup with the BoxLayout as its only content
-        popup = Popup(
-            title="Result",
-            content=content,  # Single content widget
-            size_hint=(0.6, 0.4),
-            auto_dismiss=False
-        )
-        
-        # Bind close button
-        close_btn.bind(on_release=popup.dismiss)
-        popup.open()
+        show_message(text)
 
 class ManageBasePopup(Popup):
     def __init__(self, character, **kwargs):
@@ -656,17 +456,15 @@ class ManageBasePopup(Popup):
         self.size_hint = (0.8, 0.8)
         self.auto_dismiss = False
         
-        layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        self.layout = layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
-        # Show shop management if counter is built
-        if "Shop Counter" in self.character.base_upgrades:
-            shop_btn = Button(
-                text="Manage Shop Counter",
-                size_hint_y=None,
-                height='40dp'
-            )
-            shop_btn.bind(on_release=self.manage_shop)
-            layout.add_widget(shop_btn)
+        # Shown once the shop counter is built (see on_pre_open)
+        self.shop_btn = Button(
+            text="Manage Shop Counter",
+            size_hint_y=None,
+            height='40dp'
+        )
+        self.shop_btn.bind(on_release=self.manage_shop)
         
         # Camp members management button
         members_btn = Button(
@@ -688,112 +486,139 @@ class ManageBasePopup(Popup):
         
         self.content = layout
 
+    def on_pre_open(self):
+        if "Shop Counter" in self.character.base_upgrades and self.shop_btn.parent is None:
+            self.layout.add_widget(self.shop_btn, index=len(self.layout.children))
+
     def manage_shop(self, instance):
-        ShopManagementPopup(self.character).open()
+        App.get_running_app().root.get_screen('game_screen').popup(ShopManagementPopup).open()
 
     def manage_members(self, instance):
+        App.get_running_app().root.get_screen('game_screen').popup(MemberManagementPopup).open()
+
+class MemberManagementPopup(Popup):
+    def __init__(self, character, **kwargs):
+        super().__init__(**kwargs)
+        self.character = character
+        self.title = "Manage Survivor Jobs"
+        self.size_hint = (0.8, 0.8)
+        self.auto_dismiss = False
+        
         content = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
-        if not self.character.camp_members:
-            content.add_widget(Label(text="No survivors to manage at this time..."))
-        else:
-            scroll_layout = GridLayout(
-                cols=1,
-                spacing=10,
-                size_hint_y=None
-            )
-            scroll_layout.bind(minimum_height=scroll_layout.setter('height'))
-            
-            for member in self.character.camp_members:
-                member_box = BoxLayout(
-                    orientation='vertical',
-                    size_hint_y=None,
-                    height='120dp',
-                    padding=5
-                )
-                
-                info_text = (
-                    f"{member['name']} - {member['type']}\n"
-                    f"Current Job: {member['mode'].title()}"
-                )
-                member_box.add_widget(Label(text=info_text))
-                
-                # Center the buttons using AnchorLayout
-                anchor_layout = AnchorLayout(
-                    anchor_x='center',
-                    size_hint_y=None,
-                    height='40dp'
-                )
-                
-                buttons_box = BoxLayout(
-                    orientation='horizontal',
-                    size_hint_x=None,
-                    width='310dp',
-                    spacing=5
-                )
-                
-                for mode in ['guard', 'gather', 'adventure']:
-                    mode_btn = Button(
-                        text=mode.title(),
-                        size_hint_x=None,
-                        width='100dp'
-                    )
-                    
-                    def create_mode_callback(member_name, new_mode):
-                        def set_mode(instance):
-                            for m in self.character.camp_members:
-                                if m['name'] == member_name:
-                                    m['mode'] = new_mode
-                                    self.refresh_member_management()
-                        return set_mode
-                    
-                    mode_btn.bind(on_release=create_mode_callback(member['name'], mode))
-                    buttons_box.add_widget(mode_btn)
-                
-                anchor_layout.add_widget(buttons_box)
-                member_box.add_widget(anchor_layout)
-                scroll_layout.add_widget(member_box)
-            
-            scroll_view = ScrollView(size_hint=(1, 0.8))
-            scroll_view.add_widget(scroll_layout)
-            content.add_widget(scroll_view)
+        # Holds either the member list or no_members_label (see on_pre_open)
+        self.list_slot = BoxLayout()
+        content.add_widget(self.list_slot)
+        self.no_members_label = Label(text="No survivors to manage at this time...")
+        
+        self.rows_layout = GridLayout(
+            cols=1,
+            spacing=10,
+            size_hint_y=None
+        )
+        self.rows_layout.bind(minimum_height=self.rows_layout.setter('height'))
+        self.scroll_view = ScrollView()
+        self.scroll_view.add_widget(self.rows_layout)
+        
+        # Member id -> (row, info label). Rows stay for as long as the member
+        # does; only joiners get new ones
+        self.rows = {}
         
         close_button = Button(
             text="Close",
             size_hint_y=None,
             height='40dp'
         )
+        close_button.bind(on_release=self.dismiss)
         content.add_widget(close_button)
         
-        self.member_popup = Popup(
-            title="Manage Survivor Jobs",
-            content=content,
-            size_hint=(0.8, 0.8),
-            auto_dismiss=False
+        self.content = content
+
+    def on_pre_open(self):
+        members = {member.id: member for member in self.character.camp_members}
+        for member_id in [i for i in self.rows if i not in members]:
+            self.rows_layout.remove_widget(self.rows.pop(member_id)[0])
+        for member_id, member in members.items():
+            if member_id not in self.rows:
+                self.rows[member_id] = self.member_row(member_id)
+                self.rows_layout.add_widget(self.rows[member_id][0])
+            self.update_row(member_id)
+        
+        self.list_slot.clear_widgets()
+        self.list_slot.add_widget(self.scroll_view if members else self.no_members_label)
+
+    def member_row(self, member_id):
+        member_box = BoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            height='120dp',
+            padding=5
+        )
+        info_label = Label()
+        member_box.add_widget(info_label)
+        
+        # Center the buttons using AnchorLayout
+        anchor_layout = AnchorLayout(
+            anchor_x='center',
+            size_hint_y=None,
+            height='40dp'
+        )
+        
+        buttons_box = BoxLayout(
+            orientation='horizontal',
+            size_hint_x=None,
+            width='310dp',
+            spacing=5
         )
         
-        def force_close(instance):
-            self.member_popup.dismiss()
-            if self.member_popup.parent:
-                self.member_popup.parent.remove_widget(self.member_popup)
+        for mode in engine.MEMBER_MODES:
+            mode_btn = Button(
+                text=mode.title(),
+                size_hint_x=None,
+                width='100dp'
+            )
+            mode_btn.bind(on_release=lambda x, mode=mode: self.set_mode(member_id, mode))
+            buttons_box.add_widget(mode_btn)
         
-        close_button.bind(on_release=force_close)
-        self.member_popup.open()
+        anchor_layout.add_widget(buttons_box)
+        member_box.add_widget(anchor_layout)
+        return member_box, info_label
+
+    def set_mode(self, member_id, mode):
+        self.character.camp_members.get(member_id)['mode'] = mode
+        # Only this member's row changes, so update it in place
+        self.update_row(member_id)
 
-    def refresh_member_management(self):
-        """Refresh the member management popup"""
-        if hasattr(self, 'member_popup'):
-            self.member_popup.dismiss()
-            self.manage_members(None)
+    def update_row(self, member_id):
+        member = self.character.camp_members.get(member_id)
+        self.rows[member_id][1].text = (
+            f"{member['name']} - {member['type']}\n"
+            f"Current Job: {member['mode'].title()}"
+        )
 
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
+class ReportLine(Label):
+    def __init__(self, **kwargs):
+        super().__init__(halign='left', valign='middle', shorten=True, **kwargs)
+        self.bind(size=self.setter('text_size'))
+
+class ReportView(RecycleView):
+    """Scrolling list of report lines; only the rows on screen get widgets."""
+    def __init__(self, lines=(), **kwargs):
+        super().__init__(**kwargs)
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, dp(28)),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        self.viewclass = 'ReportLine'  # Needs the layout in place first
+        self.data = [{'text': line} for line in lines]
 
 class GuardReportPopup(Popup):
     def __init__(self, character, member_results, game_screen, **kwargs):
-        print(f"Debug: Initializing GuardReportPopup with results: {member_results}")
+        log.debug("Guard report for a day with %d adventure records", len(member_results['adventures']))
         super().__init__(**kwargs)
         self.character = character
         self.member_results = member_results
@@ -804,18 +629,19 @@ class GuardReportPopup(Popup):
         
         layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
-        # Guard Reports
+        # Guard Reports: a summary, then one row per guard
+        guards = member_results['guards']
         guard_text = "=== Guard Reports ===\n"
-        has_guards = False
-        for member in self.character.camp_members:
-            if member['mode'] == 'guard':
-                has_guards = True
-                guard_text += f"\n{member['name']} maintained watch"
-        
-        if not has_guards:
+        if guards:
+            guard_text += f"\n{len(guards)} on watch"
+        else:
             guard_text += "\nNo guards on duty today"
             
-        layout.add_widget(Label(text=guard_text))
+        layout.add_widget(Label(text=guard_text, size_hint_y=None, height='60dp'))
+        members = self.character.camp_members
+        layout.add_widget(ReportView(
+            f"{members.get(member_id)['name']} maintained watch" for member_id in guards
+        ))
         
         # Continue button
         continue_btn = Button(
@@ -829,18 +655,13 @@ class GuardReportPopup(Popup):
         self.content = layout
 
     def show_next(self, instance):
-        self.dismiss()
-        ResourceReportPopup(
+        modals.after(self, ResourceReportPopup(
             self.character,
             self.member_results['gathered_resources'],
             self.member_results,
             game_screen=self.game_screen
-        ).open()
-
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
+        ).open)
+        self.dismiss()
 
 class ResourceReportPopup(Popup):
     def __init__(self, character, gathered_resources, member_results, game_screen, **kwargs):
@@ -877,17 +698,12 @@ class ResourceReportPopup(Popup):
         self.content = layout
 
     def show_next(self, instance):
-        self.dismiss()
-        AdventureReportPopup(
+        modals.after(self, AdventureReportPopup(
             self.character,
             self.member_results['adventures'],
             game_screen=self.game_screen
-        ).open()
-
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
+        ).open)
+        self.dismiss()
 
 class AdventureReportPopup(Popup):
     def __init__(self, character, adventure_results, game_screen, **kwargs):
@@ -900,15 +716,19 @@ class AdventureReportPopup(Popup):
         
         layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
-        # Adventure Reports
+        # Adventure Reports: totals per outcome, then one row per adventure
         adventure_text = "=== Adventure Reports ===\n"
         if adventure_results:
-            for report in adventure_results:
-                adventure_text += f"\n{report}"
+            counts = Counter(record.outcome for record in adventure_results)
+            adventure_text += (f"\n{len(adventure_results)} adventures: {counts['good']} good, "
+                               f"{counts['neutral']} neutral, {counts['bad']} bad")
         else:
             adventure_text += "\nNo adventures undertaken today"
             
-        layout.add_widget(Label(text=adventure_text))
+        layout.add_widget(Label(text=adventure_text, size_hint_y=None, height='60dp'))
+        layout.add_widget(ReportView(
+            engine.adventure_text(character, record) for record in adventure_results
+        ))
         
         # Continue button
         continue_btn = Button(
@@ -922,13 +742,8 @@ class AdventureReportPopup(Popup):
         self.content = layout
 
     def show_next(self, instance):
+        modals.after(self, FinalDayReportPopup(self.character, self.game_screen).open)
         self.dismiss()
-        FinalDayReportPopup(self.character, self.game_screen).open()
-
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
 
 class FinalDayReportPopup(Popup):
     def __init__(self, character, game_screen, **kwargs):
@@ -942,19 +757,14 @@ class FinalDayReportPopup(Popup):
         self.trade_completed = False
         
         # Store visitor info as instance variables
-        self.visitor_name = f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}"
-        self.visitor_type = random.choices(VISITOR_TYPES, weights=[v['join_chance'] for v in VISITOR_TYPES])[0]
+        self.visitor = engine.roll_visitor()
+        self.visitor_name = self.visitor['name']
         
         layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
         # Consumption Report
         consumption_text = "=== Resource Consumption ===\n"
-        total_members = len(self.character.camp_members) + 1
-        food_consumed = total_members * 1
-        water_consumed = total_members * 1
-        
-        self.character.resources['food'] = max(0, self.character.resources['food'] - food_consumed)
-        self.character.resources['water'] = max(0, self.character.resources['water'] - water_consumed)
+        food_consumed, water_consumed = engine.consume_daily_upkeep(self.character)
         
         consumption_text += f"\nFood consumed: {food_consumed}"
         consumption_text += f"\nWater consumed: {water_consumed}"
@@ -964,8 +774,8 @@ class FinalDayReportPopup(Popup):
         layout.add_widget(Label(text=consumption_text))
 
         visitor_text = "\n=== Visitor Arrived ===\n"
-        visitor_text += f"\n{self.visitor_name} - {self.visitor_type['type']}"
-        visitor_text += f"\n{self.visitor_type['description']}"
+        visitor_text += f"\n{self.visitor_name} - {self.visitor['type']}"
+        visitor_text += f"\n{self.visitor['description']}"
         
         layout.add_widget(Label(text=visitor_text))
         
@@ -1015,24 +825,7 @@ class FinalDayReportPopup(Popup):
             return
             
         # Original trade options (from personal inventory)
-        trade_options = [
-            ("food", 2, "rope", 1),
-            ("water", 2, "rope", 1),
-            ("wood", 3, "rope", 1),
-            ("rope", 1, "food", 3),
-            ("rope", 1, "water", 3),
-            ("rope", 1, "wood", 4),
-            ("food", 3, "water", 4),
-            ("water", 3, "food", 4),
-            ("wood", 4, "food", 3),
-            ("wood", 4, "water", 3),
-            ("rope", 2, "wood", 6),
-            ("food", 4, "rope", 2)
-        ]
-        
-        valid_trades = [(give_resource, give_amount, get_resource, get_amount) 
-                       for give_resource, give_amount, get_resource, get_amount in trade_options 
-                       if self.character.resources[give_resource] >= give_amount]
+        valid_trades = engine.valid_trades(self.character, engine.PERSONAL_TRADE_OPTIONS)
         
         if not valid_trades:
             self.show_result("No valid trades available with your current resources.")
@@ -1071,6 +864,7 @@ class FinalDayReportPopup(Popup):
         )
         trade_popup.open()
 
+    @perf.timed('trade')
     def complete_trade(self, give_resource, give_amount, get_resource, get_amount, trade_popup, is_shop_trade=False):
         if is_shop_trade:
             self.character.shop_inventory[give_resource] -= give_amount
@@ -1085,116 +879,26 @@ class FinalDayReportPopup(Popup):
         self.show_result("Trade completed successfully!")
         trade_popup.dismiss()
 
+    @perf.timed('new day')
     def on_continue(self, instance):
-        self.character.current_day += 1
-        self.character.current_ap = self.character.action_points
+        self.character.refresh_day()
         
         # Save game at the start of each new day
-        save_character(self.character)
+        save_worker.submit(self.character, on_done=self.game_screen.on_save_done)
         
         self.dismiss()
-        Clock.schedule_once(lambda dt: self.game_screen.update_ui(), 0.1)
 
     def show_result(self, text):
-        # Create a single BoxLayout to hold all content
-        content_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        
-        # Add the message label
-        message_label = Label(text=text)
-        content_layout.add_widget(message_label)
-        
-        # Add the close button
-        close_btn = Button(
-            text="Close",
-            size_hint_y=None,
-            height='40dp'
-        )
-        content_layout.add_widget(close_btn)
-        
-        # Create the popup with the layout as its single content widget
-        result_popup = Popup(
-            title="Result",
-            content=content_layout,  # Use the layout as the single content widget
-            size_hint=(0.6, 0.4),
-            auto_dismiss=False
-        )
-        
-        # Bind the close button
-        close_btn.bind(on_release=result_popup.dismiss)
-        
-        # Open the popup
-        result_popup.open()
-
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
+        show_message(text)
 
     def try_recruit(self):  # Remove parameters since we're using instance variables
-        # Calculate resource bonus (scales with total resources)
-        resource_bonus = sum(self.character.resources.values()) * 0.01  # 1% per resource unit
-        resource_bonus = min(resource_bonus, 0.3)  # Cap at 30% bonus
-        
-        # Calculate total join chance
-        join_chance = (
-            self.visitor_type['join_chance'] + 
-            (self.character.charisma * 0.05) + 
-            resource_bonus
-        )
-        
-        if random.random() < join_chance:
-            self.character.camp_members.append({
-                'name': self.visitor_name,
-                'type': self.visitor_type['type'],
-                'mode': 'gather',
-                'ap': self.visitor_type['ap']
-            })
-            
-            if len(self.character.camp_members) == 1:
-                self.character.objectives_completed['recruit_member'] = True
-            
-            if len(self.character.camp_members) >= 3:
-                self.character.objectives_completed['three_members'] = True
-            
-            self.show_result(f"{self.visitor_name} has joined your camp!")
-        else:
-            self.show_result(f"{self.visitor_name} declined to join...")
+        result = engine.try_recruit(self.character, self.visitor, self.visitor['join_chance'])
+        self.show_result(result.message)
 
         # Disable recruit button after attempt
         self.recruit_btn.disabled = True
         self.recruit_btn.text = "Already Attempted"
 
-class AdventureResultPopup(Popup):
-    def __init__(self, text, **kwargs):
-        super().__init__(**kwargs)
-        self.title = "Adventure Result"
-        self.size_hint = (0.8, 0.8)
-        self.auto_dismiss = False
-        
-        # Create a single layout for all content
-        layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        
-        # Add the result text
-        layout.add_widget(Label(text=text))
-        
-        # Add close button
-        close_btn = Button(
-            text="Close",
-            size_hint_y=None,
-            height='40dp'
-        )
-        
-        def force_close(instance):
-            self.dismiss()
-            if self.parent:
-                self.parent.remove_widget(self)
-                
-        close_btn.bind(on_release=force_close)
-        layout.add_widget(close_btn)
-        
-        # Set the layout as the single content widget
-        self.content = layout
-
 class LocationSelectionPopup(Popup):
     def __init__(self, character, location_type, parent_popup, **kwargs):
         super().__init__(**kwargs)
@@ -1216,12 +920,7 @@ class LocationSelectionPopup(Popup):
         self.main_layout.add_widget(self.ap_label)
         
         # Add location buttons
-        locations = {
-            'city': ['Abandoned Mall', 'Hospital', 'Residential District'],
-            'woods': ['River Expedition', 'Ranger Station', 'Abandoned Campgrounds']
-        }
-        
-        for location in locations[location_type]:
+        for location in LOCATIONS[location_type]:
             btn = Button(
                 text=location,
                 size_hint_y=None,
@@ -1250,29 +949,32 @@ class LocationSelectionPopup(Popup):
     def update_ap_display(self):
         self.ap_label.text = self.get_ap_text()
 
+    def on_pre_open(self):
+        self.update_ap_display()
+
+    @perf.timed('adventure')
     def start_adventure(self, instance):
-        if self.character.current_ap < 2:
-            result = "Not enough Action Points! (Requires 2 AP)"
-        else:
-            self.character.current_ap -= 2
-            result = self.determine_outcome(instance.location_type, instance.location)
-            self.character.objectives_completed["go_adventure"] = True
+        result = engine.start_adventure(self.character, instance.location_type, instance.location)
+        if result.ap_spent:
+            if result.visitor:
+                self.current_visitor = result.visitor
             
             # Update displays
             self.update_ap_display()
             if self.parent_popup:
                 self.parent_popup.update_status()
             
-            # Update game screen and check for random trader
+            # Check for random trader
             game_screen = App.get_running_app().root.get_screen('game_screen')
-            game_screen.update_ui()
             game_screen.check_random_trader()
         
-        result_popup = AdventureResultPopup(text=result)
-        result_popup.bind(on_dismiss=self.on_result_dismiss)
-        result_popup.open()
+        result_popup = show_message(result.message, title="Adventure Result", size_hint=(0.8, 0.8))
+        modals.after(result_popup, self.on_result_dismiss)
+        if result.ap_spent and result.visitor:
+            # The visitor arrives once the result has been read
+            modals.after(result_popup, self.show_visitor_popup)
 
-    def on_result_dismiss(self, instance):
+    def on_result_dismiss(self):
         """Handle result popup dismissal without recursion"""
         if self.character.current_ap <= 0:
             # Dismiss this popup first
@@ -1280,8 +982,8 @@ class LocationSelectionPopup(Popup):
             # Then the parent popup if it exists
             if self.parent_popup:
                 self.parent_popup.dismiss()
-            # Finally, trigger the day end sequence directly
-            Clock.schedule_once(lambda dt: App.get_running_app().root.get_screen('game_screen').check_ap_and_day(), 0.1)
+            # Finally, trigger the day end sequence
+            App.get_running_app().root.get_screen('game_screen').check_ap_and_day()
 
     def check_ap(self):
         if self.character.current_ap <= 0:
@@ -1290,144 +992,6 @@ class LocationSelectionPopup(Popup):
             game_screen = App.get_running_app().root.get_screen('game_screen')
             game_screen.check_ap_and_day()
 
-    def determine_outcome(self, location_type, location):
-        base_chance = random.random()
-        
-        # Calculate skill bonus based on location type
-        if location_type == 'city':
-            skill_bonus = (self.character.scavenging * 0.02) + (self.character.charisma * 0.01)
-        else:  # woods
-            skill_bonus = (self.character.endurance * 0.02) + (self.character.combat * 0.01)
-        
-        # Exceptional roll (increased to 20% for testing)
-        exceptional_chance = 0.20 + (self.character.scavenging * 0.01)
-        if base_chance < exceptional_chance:
-            # Found a treasure!
-            if location_type == 'city':
-                if location == 'Hospital':
-                    treasure = Treasure(
-                        "Sealed Antibiotics", "Medical", 500,
-                        "Hospital", "A rare find of untouched medicine",
-                        self.character.current_day
-                    )
-                elif location == 'Abandoned Mall':
-                    treasure = Treasure(
-                        "Working Laptop", "Electronics", 600,
-                        "Mall", "Still has some charge!",
-                        self.character.current_day
-                    )
-                else:  # Residential District
-                    treasure = Treasure(
-                        "Fine Jewelry", "Luxury", 400,
-                        "House", "Someone's precious memories...",
-                        self.character.current_day
-                    )
-            else:  # woods locations
-                if location == 'Ranger Station':
-                    treasure = Treasure(
-                        "Military GPS", "Electronics", 450,
-                        "Ranger Station", "Still works perfectly!",
-                        self.character.current_day
-                    )
-                elif location == 'River Expedition':
-                    treasure = Treasure(
-                        "Gold Nuggets", "Valuables", 700,
-                        "River", "Nature's treasure!",
-                        self.character.current_day
-                    )
-                else:  # Abandoned Campgrounds
-                    treasure = Treasure(
-                        "Vintage Camping Gear", "Equipment", 350,
-                        "Campgrounds", "They don't make them like this anymore",
-                        self.character.current_day
-                    )
-            
-            if not hasattr(self.character, 'treasures'):
-                self.character.treasures = []
-            self.character.treasures.append(treasure)
-            return f"EXCEPTIONAL FIND! You discovered {treasure.name}! ({treasure.description})"
-
-        # Regular outcome rolls
-        final_chance = base_chance + skill_bonus
-        if final_chance > 0.8:  # Good outcome (20%)
-            outcome = random.choice([
-                self.generate_resource_find('good'),
-                self.generate_friendly_encounter(),
-                self.generate_resource_find('good')  # Higher chance for resources
-            ])
-        elif final_chance > 0.3:  # Neutral outcome (50%)
-            outcome = random.choice([
-                self.generate_resource_find('neutral'),
-                "You find nothing of value, but stay safe.",
-                "The area is quiet, allowing for a thorough search."
-            ])
-        else:  # Bad outcome (30%)
-            outcome = random.choice([
-                self.generate_zombie_encounter(),
-                self.generate_bandit_encounter(),
-                self.generate_accident()
-            ])
-        
-        return outcome
-
-    def generate_resource_find(self, quality):
-        resource = random.choice(['wood', 'water', 'food', 'rope'])
-        if quality == 'good':
-            amount = random.randint(3, 5)
-        else:  # neutral
-            amount = random.randint(1, 2)
-        
-        self.character.resources[resource] += amount
-        return f"You found {amount} {resource}!"
-
-    def generate_friendly_encounter(self):
-        visitor_name = f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}"
-        visitor_type = random.choices(VISITOR_TYPES, weights=[v['join_chance'] for v in VISITOR_TYPES])[0]
-        
-        # Store visitor info for potential recruitment
-        self.current_visitor = {
-            'name': visitor_name,
-            'type': visitor_type['type'],
-            'description': visitor_type['description'],
-            'ap': visitor_type['ap']
-        }
-        
-        # Schedule the visitor interaction popup
-        Clock.schedule_once(lambda dt: self.show_visitor_popup(), 0.1)
-        
-        return f"You meet {visitor_name}, a {visitor_type['type']}..."
-
-    def generate_zombie_encounter(self):
-        # Lose some resources running away
-        resource = random.choice(['food', 'water', 'wood', 'rope'])
-        amount = random.randint(1, 2)
-        if self.character.resources[resource] >= amount:
-            self.character.resources[resource] -= amount
-            return f"Zombies force you to drop {amount} {resource} while escaping!"
-        else:
-            self.character.current_ap = max(0, self.character.current_ap - 1)
-            return "Zombies appear! You escape, but lose 1 AP from exhaustion!"
-
-    def generate_bandit_encounter(self):
-        # Bandits steal resources
-        resource = random.choice(['food', 'water', 'wood', 'rope'])
-        amount = random.randint(2, 3)
-        if self.character.resources[resource] >= amount:
-            self.character.resources[resource] -= amount
-            return f"Bandits rob you of {amount} {resource}!"
-        else:
-            self.character.resources[resource] = 0
-            return f"Bandits take all your {resource}!"
-
-    def generate_accident(self):
-        # Random accident that costs AP
-        self.character.current_ap = max(0, self.character.current_ap - 1)
-        return random.choice([
-            "You twist your ankle! (-1 AP)",
-            "You get lost and waste time! (-1 AP)",
-            "The weather turns bad! (-1 AP)"
-        ])
-
     def show_visitor_popup(self):
         if not hasattr(self, 'current_visitor'):
             return
@@ -1467,46 +1031,16 @@ class LocationSelectionPopup(Popup):
             return
         
         # Use same recruitment logic as before
-        resource_bonus = sum(self.character.resources.values()) * 0.01
-        resource_bonus = min(resource_bonus, 0.3)
-        
-        join_chance = 0.3 + (self.character.charisma * 0.05) + resource_bonus
-        
-        if random.random() < join_chance:
-            self.character.camp_members.append({
-                'name': self.current_visitor['name'],
-                'type': self.current_visitor['type'],
-                'mode': 'gather',  # Default mode
-                'ap': self.current_visitor['ap']
-            })
-            result = f"{self.current_visitor['name']} has joined your camp!"
-            
-            if len(self.character.camp_members) == 1:
-                self.character.objectives_completed['recruit_member'] = True
-            if len(self.character.camp_members) >= 3:
-                self.character.objectives_completed['three_members'] = True
-        else:
-            result = f"{self.current_visitor['name']} declined to join..."
+        result = engine.try_recruit(self.character, self.current_visitor, 0.3)
         
         popup.dismiss()
-        self.show_result(result)
+        self.show_result(result.message)
 
     def try_trade_visitor(self, popup):
         if not hasattr(self, 'current_visitor'):
             return
             
-        trade_options = [
-            ("food", 2, "rope", 1),
-            ("water", 2, "rope", 1),
-            ("wood", 3, "rope", 1),
-            ("rope", 1, "food", 3),
-            ("rope", 1, "water", 3),
-            ("rope", 1, "wood", 4)
-        ]
-        
-        valid_trades = [(give_resource, give_amount, get_resource, get_amount) 
-                        for give_resource, give_amount, get_resource, get_amount in trade_options 
-                        if self.character.resources[give_resource] >= give_amount]
+        valid_trades = engine.valid_trades(self.character, engine.VISITOR_TRADE_OPTIONS)
         
         if not valid_trades:
             popup.dismiss()
@@ -1583,6 +1117,7 @@ class LocationSelectionPopup(Popup):
             self.show_result(f"{self.current_visitor['name']} becomes annoyed and leaves...")
         popup.dismiss()
 
+    @perf.timed('trade')
     def complete_random_trade(self, sell_resource, sell_amount, pay_resource, pay_amount, popup):
         self.character.resources[sell_resource] -= sell_amount
         self.character.resources[pay_resource] += pay_amount
@@ -1590,34 +1125,7 @@ class LocationSelectionPopup(Popup):
         self.show_result(f"Trade completed! Received {pay_amount} {pay_resource}")
 
     def show_result(self, text):
-        # Create a single BoxLayout to hold all content
-        content_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        
-        # Add the message label
-        message_label = Label(text=text)
-        content_layout.add_widget(message_label)
-        
-        # Add the close button
-        close_btn = Button(
-            text="Close",
-            size_hint_y=None,
-            height='40dp'
-        )
-        content_layout.add_widget(close_btn)
-        
-        # Create the popup with the layout as its single content widget
-        result_popup = Popup(
-            title="Result",
-            content=content_layout,  # Use the layout as the single content widget
-            size_hint=(0.6, 0.4),
-            auto_dismiss=False
-        )
-        
-        # Bind the close button
-        close_btn.bind(on_release=result_popup.dismiss)
-        
-        # Open the popup
-        result_popup.open()
+        show_message(text)
 
 class AdventurePopup(Popup):
     def __init__(self, character, **kwargs):
@@ -1659,16 +1167,14 @@ class AdventurePopup(Popup):
             height='40dp'
         )
         
-        def force_close(instance):
+        def close(instance):
             game_screen = App.get_running_app().root.get_screen('game_screen')
             self.dismiss()
-            if self.parent:
-                self.parent.remove_widget(self)
             # Only check AP if it's actually 0
             if self.character.current_ap <= 0:
                 game_screen.check_ap_and_day()
                 
-        close_btn.bind(on_release=force_close)
+        close_btn.bind(on_release=close)
         self.main_layout.add_widget(close_btn)
         
         self.content = self.main_layout
@@ -1679,142 +1185,185 @@ class AdventurePopup(Popup):
     def update_status(self):
         self.status_label.text = self.get_status_text()
 
+    def on_pre_open(self):
+        self.update_status()
+
     def show_locations(self, location_type):
-        location_popup = LocationSelectionPopup(self.character, location_type, self)
-        location_popup.bind(on_dismiss=lambda x: self.update_status())
-        location_popup.open()
+        App.get_running_app().root.get_screen('game_screen').popup(
+            LocationSelectionPopup, location_type, self,
+            on_dismiss=lambda x: self.update_status()
+        ).open()
+
+class PerfOverlay(Label):
+    # Action timings from perf, drawn over the game screen. It only refreshes
+    # while shown, so a hidden overlay costs nothing
+    REFRESH_INTERVAL = 0.5
 
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
+    def __init__(self, **kwargs):
+        super().__init__(
+            font_name='RobotoMono-Regular', font_size='12sp', padding=(8, 6),
+            size_hint=(None, None), pos_hint={'right': 1, 'top': 1}, **kwargs
+        )
+        self.bind(texture_size=self.setter('size'))
+        with self.canvas.before:
+            Color(0, 0, 0, 0.7)
+            self.background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self.update_background, size=self.update_background)
+        self.refresh_event = None
+
+    def update_background(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
+
+    def refresh(self, dt=None):
+        self.text = perf.report()
+
+    def show(self, screen):
+        self.refresh()
+        screen.add_widget(self)
+        self.refresh_event = Clock.schedule_interval(self.refresh, self.REFRESH_INTERVAL)
+
+    def hide(self):
+        if self.refresh_event:
+            self.refresh_event.cancel()
+            self.refresh_event = None
+        if self.parent:
+            self.parent.remove_widget(self)
 
 class GameScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.character = None
+        self.popups = {}  # (popup class, arguments) -> the instance kept for this character
+        # Character fields changed since the last redraw. However many change
+        # in a frame, the screen is redrawn once, on the next frame
+        self.dirty = set()
+        self.refresh_trigger = Clock.create_trigger(self.refresh_ui)
+        self.perf_overlay = None  # Built the first time it's toggled on
+
+    def on_enter(self):
+        Window.bind(on_key_down=self.on_key_down)
+
+    def on_leave(self):
+        Window.unbind(on_key_down=self.on_key_down)
+        if self.perf_overlay:
+            self.perf_overlay.hide()
+
+    def on_key_down(self, window, key, scancode, codepoint, modifiers):
+        if key == PERF_OVERLAY_KEY:
+            self.toggle_perf_overlay()
+            return True
+        if key == PERF_EXPORT_KEY:
+            log.info("Action timings written to %s", perf.export_csv())
+            return True
+        return False
+
+    def toggle_perf_overlay(self):
+        if self.perf_overlay is None:
+            self.perf_overlay = PerfOverlay()
+        if self.perf_overlay.parent:
+            self.perf_overlay.hide()
+        else:
+            self.perf_overlay.show(self)
 
     def set_character(self, character):
+        if self.character:
+            self.character.unsubscribe(self.on_character_changed)
         self.character = character
+        self.popups.clear()
+        character.subscribe(self.on_character_changed)
         self.update_ui()
 
-    def update_status(self):
-        if self.character:
-            self.update_ui()  # Just call update_ui instead
+    def popup(self, cls, *args, on_dismiss=None):
+        """The long-lived popup of this class, built on first use with the
+        character and args. Popups update themselves when opened, so one
+        instance serves the whole session."""
+        key = (cls, *args)
+        popup = self.popups.get(key)
+        if popup is None:
+            popup = self.popups[key] = cls(self.character, *args)
+            if on_dismiss:
+                popup.bind(on_dismiss=on_dismiss)
+        return popup
+
+    def on_character_changed(self, character, field):
+        self.dirty.add(field)
+        self.refresh_trigger()
 
     def update_ui(self):
-        if self.character:
-            # Add debug print to verify values
-            print(f"Updating UI - AP: {self.character.current_ap}/{self.character.action_points}")
-            
+        """Redraw everything on the next frame."""
+        self.dirty.update(('current_ap', 'current_day'))
+        self.refresh_trigger()
+
+    def refresh_ui(self, dt=None):
+        dirty, self.dirty = self.dirty, set()
+        if not self.character:
+            return
+        # Only touch the widgets showing something that changed
+        if not dirty.isdisjoint(('current_ap', 'current_day')):
             self.ids.counter_label.text = f"Day {self.character.current_day}\nAction Points: {self.character.current_ap}/{self.character.action_points}"
-            self.ids.status_label.text = ""
+        self.ids.status_label.text = ""
 
     def check_ap_and_day(self):
         if self.character and self.character.current_ap <= 0:
-            print(f"Debug: Triggering day end with AP: {self.character.current_ap}")
-            # Schedule the day end sequence after a short delay to allow popups to close
-            Clock.schedule_once(lambda dt: self.show_day_end_sequence(), 0.1)
+            log.debug("Day end triggered with %d AP", self.character.current_ap)
+            # The day ends once every open popup (results, visitors) has closed
+            modals.when_idle(self.show_day_end_sequence)
 
     def show_day_end_sequence(self):
         """Show the day end sequence without recursion"""
-        member_results = self.process_member_activities()
-        print(f"Debug: Member results: {member_results}")
-        GuardReportPopup(self.character, member_results, self).open()
+        if self.character.current_ap > 0:
+            return  # Already ended by an earlier request
+        with perf.timed('day end'):
+            member_results = self.process_member_activities()
+            log.debug("Member results: gathered %s, adventures %s",
+                      member_results['gathered_resources'], member_results['outcome_counts'])
+            GuardReportPopup(self.character, member_results, self).open()
 
     def process_member_activities(self):
-        results = {
-            'gathered_resources': {'wood': 0, 'water': 0, 'food': 0},
-            'adventures': []
-        }
-        
-        for member in self.character.camp_members:
-            if member['mode'] == 'gather':
-                # Process gathering - use AP for multiple attempts
-                for _ in range(member['ap']):
-                    resource = random.choice(['wood', 'water', 'food'])
-                    # Base 20% chance + type bonus for Survivors (30%)
-                    success_chance = 0.2 + (0.1 if member['type'] == 'Survivor' else 0)
-                    
-                    if random.random() < success_chance:
-                        amount = random.randint(1, 2)
-                        results['gathered_resources'][resource] += amount
-            
-            elif member['mode'] == 'adventure':
-                # Process adventures - one adventure per 2 AP
-                adventures_possible = member['ap'] // 2
-                for _ in range(adventures_possible):
-                    location_type = random.choice(['city', 'woods'])
-                    location = random.choice(list(ADVENTURE_SCENARIOS[location_type].keys()))
-                    
-                    # Base 25% chance + type bonus for Scouts (35%)
-                    success_chance = 0.25 + (0.1 if member['type'] == 'Scout' else 0)
-                    
-                    if random.random() < success_chance:
-                        outcome = 'good'
-                    elif random.random() < 0.6:
-                        outcome = 'neutral'
-                    else:
-                        outcome = 'bad'
-                    
-                    result = random.choice(ADVENTURE_SCENARIOS[location_type][location][outcome])
-                    results['adventures'].append(f"{member['name']}: {result}")
-        
-        return results
+        return engine.process_member_activities(self.character)
 
     def check_resources(self):
         if not self.character:
             return
         
-        manage_popup = ManageBasePopup(self.character)
-        manage_popup.open()
+        self.popup(ManageBasePopup).open()
 
     def gather_resources(self):
         if not self.character:
             return
         
-        gathering_popup = ResourceGatheringPopup(self.character)
-        gathering_popup.bind(
+        self.popup(
+            ResourceGatheringPopup,
             on_dismiss=lambda x: (
-                self.update_status(),
                 self.check_ap_and_day(),
                 self.check_random_trader()
             )
-        )
-        gathering_popup.open()
+        ).open()
 
     def go_adventure(self):
         if not self.character:
             return
         
-        adventure_popup = AdventurePopup(self.character)
-        adventure_popup.bind(
-            on_dismiss=lambda x: (
-                self.update_status(),
-                self.check_random_trader()
-            )
-        )
-        adventure_popup.open()
+        self.popup(
+            AdventurePopup,
+            on_dismiss=lambda x: self.check_random_trader()
+        ).open()
 
     def build_base(self):
         if not self.character:
             return
         
-        building_popup = BaseBuildingPopup(self.character)
-        building_popup.bind(
-            on_dismiss=lambda x: (
-                self.update_status(),
-                self.check_ap_and_day()
-            )
-        )
-        building_popup.open()
+        self.popup(
+            BaseBuildingPopup,
+            on_dismiss=lambda x: self.check_ap_and_day()
+        ).open()
 
     def check_character(self):
         if not self.character:
             return
         
-        status_popup = CharacterStatusPopup(self.character)
-        status_popup.open()
+        self.popup(CharacterStatusPopup).open()
 
     def show_objectives(self):
         if not self.character:
@@ -1823,43 +1372,54 @@ class GameScreen(Screen):
         objectives_popup = ObjectivesPopup(self.character)
         objectives_popup.open()
 
+    def on_save_done(self, ok, error):
+        if not ok:
+            log.error("Save failed: %s", error)
+            self.show_result(f"Failed to save game: {error}")
+
     def quit_to_menu(self):
         if self.character:
-            save_character(self.character)
-            
-            # Create layout for popup content
-            content_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
-            
-            # Add save confirmation message
-            content_layout.add_widget(Label(text='Game progress saved successfully!'))
-            
-            # Create close button
-            close_button = Button(
-                text='Close',
-                size_hint_y=None,
-                height='40dp'
-            )
-            content_layout.add_widget(close_button)
-            
-            # Create popup
-            popup = Popup(
-                title='Saved!',
-                content=content_layout,
-                size_hint=(0.6, 0.4),
-                auto_dismiss=False  # Makes them use the close button
-            )
-            
-            # Bind close button to both dismiss popup and switch screens
-            def on_close(instance):
-                popup.dismiss()
-                self.manager.current = 'main_menu'
-                
-            close_button.bind(on_release=on_close)
-            
-            popup.open()
+            save_worker.submit(self.character, on_done=self.show_quit_confirmation)
         else:
             self.manager.current = 'main_menu'
 
+    def show_quit_confirmation(self, ok, error):
+        if not ok:
+            log.error("Save failed: %s", error)
+            self.show_result(f"Failed to save game: {error}")
+            return
+
+        # Create layout for popup content
+        content_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        
+        # Add save confirmation message
+        content_layout.add_widget(Label(text='Game progress saved successfully!'))
+        
+        # Create close button
+        close_button = Button(
+            text='Close',
+            size_hint_y=None,
+            height='40dp'
+        )
+        content_layout.add_widget(close_button)
+        
+        # Create popup
+        popup = Popup(
+            title='Saved!',
+            content=content_layout,
+            size_hint=(0.6, 0.4),
+            auto_dismiss=False  # Makes them use the close button
+        )
+        
+        # Bind close button to both dismiss popup and switch screens
+        def on_close(instance):
+            popup.dismiss()
+            self.manager.current = 'main_menu'
+            
+        close_button.bind(on_release=on_close)
+        
+        popup.open()
+
     def check_random_trader(self):
         if random.random() < 0.3:  # 30% chance for trader
             if random.random() < 0.4:  # 40% chance to sell treasure instead of buy
@@ -1875,16 +1435,9 @@ class GameScreen(Screen):
     def show_treasure_sale_offer(self):
         visitor_name = f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}"
         
-        # Generate a random treasure
-        treasure_types = [
-            ("Ancient Coin Collection", "Collectible", random.randint(100, 300)),
-            ("Medical Supplies", "Medical", random.randint(200, 400)),
-            ("Preserved Food Cache", "Supplies", random.randint(150, 250)),
-            ("Rare Book", "Collectible", random.randint(50, 150)),
-            ("Tool Set", "Equipment", random.randint(100, 200))
-        ]
-        
-        treasure_name, category, value = random.choice(treasure_types)
+        # Pick a random treasure from what traders carry
+        entry = catalog.sample(catalog.TRADER)
+        treasure_name, category, value = entry.name, entry.category, entry.roll_value()
         asking_price = int(value * random.uniform(0.8, 1.2))  # Vary the asking price
         
         content = BoxLayout(orientation='vertical', padding=10, spacing=10)
@@ -1901,7 +1454,7 @@ class GameScreen(Screen):
                 self.character.money -= asking_price
                 new_treasure = Treasure(
                     treasure_name, category, value,
-                    "Purchased", f"Bought from {visitor_name}",
+                    entry.location_found, f"Bought from {visitor_name}",
                     self.character.current_day
                 )
                 self.character.treasures.append(new_treasure)
@@ -2106,6 +1659,7 @@ class GameScreen(Screen):
             self.show_result("The trader becomes annoyed and leaves...")
             popup.dismiss()
 
+    @perf.timed('trade')
     def complete_treasure_trade(self, resource_payments, credit_payment, popup):
         # Check if player has enough credits
         if credit_payment > self.character.money:
@@ -2210,6 +1764,7 @@ class GameScreen(Screen):
         )
         trade_popup.open()
 
+    @perf.timed('trade')
     def complete_mixed_trade(self, sell_resource, sell_amount, resource_payments, credit_payment, popup):
         # Check if player has enough credits
         if credit_payment > self.character.money:
@@ -2241,50 +1796,13 @@ class GameScreen(Screen):
         self.show_result(result_text)
 
     def get_valid_shop_trades(self):
-        valid_trades = []
-        for sell_resource, amount in self.character.shop_inventory.items():
-            if amount > 0:
-                for pay_resource, rate in self.character.shop_prices[sell_resource].items():
-                    sell_amount = min(random.randint(1, 3), amount)
-                    pay_amount = int(sell_amount * rate * random.uniform(1.0, 1.5))
-                    valid_trades.append((sell_resource, sell_amount, pay_resource, pay_amount))
-        return valid_trades
+        return engine.get_valid_shop_trades(self.character)
 
     def show_result(self, text):
-        # Create a single BoxLayout to hold all content
-        content_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        
-        # Add the message label
-        message_label = Label(text=text)
-        content_layout.add_widget(message_label)
-        
-        # Add the close button
-        close_btn = Button(
-            text="Close",
-            size_hint_y=None,
-            height='40dp'
-        )
-        content_layout.add_widget(close_btn)
-        
-        # Create the popup with the layout as its single content widget
-        result_popup = Popup(
-            title="Result",
-            content=content_layout,  # Use the layout as the single content widget
-            size_hint=(0.6, 0.4),
-            auto_dismiss=False
-        )
-        
-        # Bind the close button
-        close_btn.bind(on_release=result_popup.dismiss)
-        
-        # Open the popup
-        result_popup.open()
+        show_message(text)
 
     def close_all_popups(self):
-        # Add this method to the GameScreen class
-        for widget in Window.children[:]:
-            if isinstance(widget, Popup):
-                widget.dismiss()
+        modals.close_all()
 
 class CharacterStatusPopup(Popup):
     def __init__(self, character, **kwargs):
@@ -2335,19 +1853,8 @@ class CharacterStatusPopup(Popup):
         self.content = layout
 
     def show_stats(self, instance):
-        # Create a single layout for stats content
-        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        
         # Find character's class by comparing stats with presets
-        character_class = "Unknown"
-        for preset_name, preset in CHARACTER_PRESETS.items():
-            if (preset.endurance == self.character.endurance and
-                preset.scavenging == self.character.scavenging and
-                preset.charisma == self.character.charisma and
-                preset.combat == self.character.combat and
-                preset.crafting == self.character.crafting):
-                character_class = preset_name
-                break
+        character_class = find_character_class(self.character)
         
         stats_text = (
             f"Character Class: {character_class}\n\n"
@@ -2365,29 +1872,9 @@ class CharacterStatusPopup(Popup):
             f"\nCurrent Day: {self.character.current_day}"
         )
         
-        content.add_widget(Label(text=stats_text))
-        
-        close_btn = Button(
-            text="Back",
-            size_hint_y=None,
-            height='40dp'
-        )
-        content.add_widget(close_btn)
-        
-        # Create popup with the single content layout
-        popup = Popup(
-            title="Character Stats",
-            content=content,
-            size_hint=(0.8, 0.8),
-            auto_dismiss=False
-        )
-        close_btn.bind(on_release=popup.dismiss)
-        popup.open()
+        show_message(stats_text, title="Character Stats", size_hint=(0.8, 0.8), close_text="Back")
 
     def show_resources(self, instance):
-        # Create a single layout for resources content
-        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        
         resources_text = (
             "=== Resources ===\n"
             f"Wood: {self.character.resources['wood']}\n"
@@ -2420,29 +1907,9 @@ class CharacterStatusPopup(Popup):
                                  f"  Found: {treasure.location_found} (Day {treasure.day_found})\n"
                                  f"  {treasure.description}\n")
         
-        content.add_widget(Label(text=resources_text))
-        
-        close_btn = Button(
-            text="Back",
-            size_hint_y=None,
-            height='40dp'
-        )
-        content.add_widget(close_btn)
-        
-        # Create popup with the single content layout
-        popup = Popup(
-            title="Resources & Upgrades",
-            content=content,
-            size_hint=(0.8, 0.8),
-            auto_dismiss=False
-        )
-        close_btn.bind(on_release=popup.dismiss)
-        popup.open()
+        show_message(resources_text, title="Resources & Upgrades", size_hint=(0.8, 0.8), close_text="Back")
 
     def show_members(self, instance):
-        # Create a single layout for members content
-        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        
         if not self.character.camp_members:
             members_text = "No camp members yet"
         else:
@@ -2453,29 +1920,7 @@ class CharacterStatusPopup(Popup):
                                f"Current Role: {member['mode'].title()}\n"
                                f"Action Points: {member['ap']}\n\n")
         
-        content.add_widget(Label(text=members_text))
-        
-        close_btn = Button(
-            text="Back",
-            size_hint_y=None,
-            height='40dp'
-        )
-        content.add_widget(close_btn)
-        
-        # Create popup with the single content layout
-        popup = Popup(
-            title="Camp Members",
-            content=content,
-            size_hint=(0.8, 0.8),
-            auto_dismiss=False
-        )
-        close_btn.bind(on_release=popup.dismiss)
-        popup.open()
-
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()  # Update main screen UI when closing
-        super().dismiss(*args)
+        show_message(members_text, title="Camp Members", size_hint=(0.8, 0.8), close_text="Back")
 
 class CreditsScreen(Screen):
     def __init__(self, **kwargs):
@@ -2562,6 +2007,46 @@ class ShopManagementPopup(Popup):
         manage_layout.bind(minimum_height=manage_layout.setter('height'))
         self.manage_layout = manage_layout
         content_layout.add_widget(manage_layout)
+        
+        # One row per resource: name, -, +, amount in shop
+        self.shop_amount_labels = {}
+        for resource in self.character.resources.keys():
+            manage_layout.add_widget(Label(
+                text=resource.title(),
+                size_hint_y=None,
+                height=40
+            ))
+            
+            # Remove from shop button (now first)
+            remove_btn = Button(
+                text="-",
+                size_hint_y=None,
+                height=40,
+                background_color=(1, 0, 0, 1)  # Red
+            )
+            remove_btn.resource = resource
+            remove_btn.bind(on_release=self.remove_from_shop)
+            manage_layout.add_widget(remove_btn)
+            
+            # Add to shop button (now second)
+            add_btn = Button(
+                text="+",
+                size_hint_y=None,
+                height=40,
+                background_color=(0, 1, 0, 1)  # Green
+            )
+            add_btn.resource = resource
+            add_btn.bind(on_release=self.add_to_shop)
+            manage_layout.add_widget(add_btn)
+            
+            # Amount in shop label
+            amount_label = Label(size_hint_y=None, height=40)
+            self.shop_amount_labels[resource] = amount_label
+            manage_layout.add_widget(amount_label)
+        
+        # Treasure buttons follow the resource rows; they are reused between
+        # refreshes and only added or removed when the number of kinds changes
+        self.treasure_buttons = []
 
         # Treasure Management Section
         treasure_layout = BoxLayout(orientation='vertical', size_hint_y=None)
@@ -2602,9 +2087,6 @@ class ShopManagementPopup(Popup):
         self.refresh_display()
 
     def refresh_display(self):
-        # Clear the management layout
-        self.manage_layout.clear_widgets()
-        
         # Update personal storage display
         personal_text = "Personal Storage:\n"
         for resource, amount in self.character.resources.items():
@@ -2617,83 +2099,57 @@ class ShopManagementPopup(Popup):
             shop_text += f"{resource.title()}: {amount}\n"
         self.shop_display.text = shop_text
 
-        # Rebuild resource management buttons
-        for resource in self.character.resources.keys():
-            # Resource label
-            self.manage_layout.add_widget(Label(
-                text=resource.title(),
-                size_hint_y=None,
-                height=40
-            ))
-            
-            # Remove from shop button (now first)
-            remove_btn = Button(
-                text="-",
-                size_hint_y=None,
-                height=40,
-                background_color=(1, 0, 0, 1)  # Red
-            )
-            remove_btn.resource = resource
-            remove_btn.bind(on_release=self.remove_from_shop)
-            self.manage_layout.add_widget(remove_btn)
-            
-            # Add to shop button (now second)
-            add_btn = Button(
-                text="+",
-                size_hint_y=None,
-                height=40,
-                background_color=(0, 1, 0, 1)  # Green
-            )
-            add_btn.resource = resource
-            add_btn.bind(on_release=self.add_to_shop)
-            self.manage_layout.add_widget(add_btn)
-            
-            # Amount in shop label
-            self.manage_layout.add_widget(Label(
-                text=str(self.character.shop_inventory[resource]),
-                size_hint_y=None,
-                height=40
-            ))
+        for resource, label in self.shop_amount_labels.items():
+            label.text = str(self.character.shop_inventory[resource])
 
-        # Check if there are any treasures to manage
-        has_personal_treasures = hasattr(self.character, 'treasures') and len(self.character.treasures) > 0
-        has_shop_treasures = hasattr(self.character, 'shop_treasures') and len(self.character.shop_treasures) > 0
+        # One button per kind of treasure so a big collection doesn't turn
+        # into thousands of buttons
+        groups = [(True, treasure, count) for treasure, count in self.group_treasures(self.character.treasures)]
+        groups += [(False, treasure, count) for treasure, count in self.group_treasures(self.character.shop_treasures)]
         
         # Only show treasure section if there are treasures to manage
-        if has_personal_treasures or has_shop_treasures:
-            # Show treasure section header
+        if groups:
             self.treasure_layout.opacity = 1
-            self.treasure_layout.height = None  # Reset height to show content
-            
-            # Add treasure management buttons
-            if has_personal_treasures:
-                for treasure in self.character.treasures:
-                    add_btn = Button(
-                        text=f"Add {treasure.name} to Shop",
-                        size_hint_y=None,
-                        height=40,
-                        background_color=(0, 0, 1, 1)  # Blue
-                    )
-                    add_btn.treasure = treasure
-                    add_btn.bind(on_release=self.add_treasure_to_shop)
-                    self.manage_layout.add_widget(add_btn)
-
-            if has_shop_treasures:
-                for treasure in self.character.shop_treasures:
-                    remove_btn = Button(
-                        text=f"Return {treasure.name} to Inventory",
-                        size_hint_y=None,
-                        height=40,
-                        background_color=(1, 0.5, 0, 1)  # Orange
-                    )
-                    remove_btn.treasure = treasure
-                    remove_btn.bind(on_release=self.remove_treasure_from_shop)
-                    self.manage_layout.add_widget(remove_btn)
+            self.treasure_layout.height = self.treasure_layout.minimum_height  # Reset height to show content
         else:
             # Hide treasure section completely
             self.treasure_layout.opacity = 0
             self.treasure_layout.height = 0
 
+        while len(self.treasure_buttons) < len(groups):
+            btn = Button(size_hint_y=None, height=40)
+            btn.bind(on_release=self.move_treasure)
+            self.treasure_buttons.append(btn)
+        for btn, (to_shop, treasure, count) in zip(self.treasure_buttons, groups):
+            if to_shop:
+                btn.text = f"Add {treasure.name} to Shop"
+                btn.background_color = (0, 0, 1, 1)  # Blue
+            else:
+                btn.text = f"Return {treasure.name} to Inventory"
+                btn.background_color = (1, 0.5, 0, 1)  # Orange
+            if count > 1:
+                btn.text += f" (x{count})"
+            btn.treasure = treasure
+            btn.to_shop = to_shop
+            if btn.parent is None:
+                self.manage_layout.add_widget(btn)
+        for btn in self.treasure_buttons[len(groups):]:
+            if btn.parent is not None:
+                self.manage_layout.remove_widget(btn)
+
+    def on_pre_open(self):
+        self.refresh_display()
+
+    @staticmethod
+    def group_treasures(inventory):
+        # (first treasure, count) for each name and value, by category
+        groups = {}
+        for category in sorted(inventory.categories()):
+            for treasure in inventory.by_category(category):
+                group = groups.setdefault((treasure.name, treasure.value), [treasure, 0])
+                group[1] += 1
+        return groups.values()
+
     def add_to_shop(self, instance):
         resource = instance.resource
         if self.character.resources[resource] > 0:
@@ -2708,6 +2164,12 @@ class ShopManagementPopup(Popup):
             self.character.resources[resource] += 1
             self.refresh_display()
 
+    def move_treasure(self, instance):
+        if instance.to_shop:
+            self.add_treasure_to_shop(instance)
+        else:
+            self.remove_treasure_from_shop(instance)
+
     def add_treasure_to_shop(self, instance):
         treasure = instance.treasure
         if treasure in self.character.treasures:
@@ -2726,54 +2188,6 @@ class ShopManagementPopup(Popup):
             self.character.treasures.append(treasure)
             self.refresh_display()
 
-    def dismiss(self, *args):
-        game_screen = App.get_running_app().root.get_screen('game_screen')
-        game_screen.update_ui()
-        super().dismiss(*args)
-
-def save_character(character):
-    Path("Characters").mkdir(exist_ok=True)
-    character_data = {
-        "name": character.name,
-        "endurance": character.endurance,
-        "scavenging": character.scavenging,
-        "charisma": character.charisma,
-        "combat": character.combat,
-        "crafting": character.crafting,
-        "resources": character.resources,
-        "base_upgrades": character.base_upgrades,
-        "camp_members": character.camp_members,
-        "current_ap": character.current_ap,
-        "current_day": character.current_day,
-        "objectives_completed": character.objectives_completed,
-        "shop_inventory": character.shop_inventory,
-        "treasures": [
-            {
-                "name": t.name,
-                "category": t.category,
-                "value": t.value,
-                "location_found": t.location_found,
-                "description": t.description,
-                "day_found": t.day_found
-            } for t in (character.treasures if hasattr(character, 'treasures') else [])
-        ],
-        "shop_treasures": [
-            {
-                "name": t.name,
-                "category": t.category,
-                "value": t.value,
-                "location_found": t.location_found,
-                "description": t.description,
-                "day_found": t.day_found
-            } for t in (character.shop_treasures if hasattr(character, 'shop_treasures') else [])
-        ]
-    }
-    
-    file_path = f"Characters/{character.name}.json"
-    with open(file_path, 'w') as f:
-        json.dump(character_data, f, indent=4)
-    return True
-
 def check_random_trade(character):
     if "Shop Counter" in character.base_upgrades and any(character.shop_inventory.values()):
         if random.random() < 0.3:  # 30% chance for trade opportunity
@@ -2803,15 +2217,62 @@ def sell_treasure(self, treasure):
     self.character.money += treasure.value
     self.character.treasures.remove(treasure)
 
+class LazyScreenManager(ScreenManager):
+    # Screens are registered as factories and only built the first time
+    # something asks for them, so the main menu doesn't wait on the rest
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factories = {}
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+    def get_screen(self, name):
+        factory = self.factories.pop(name, None)
+        if factory is not None:
+            self.add_widget(factory(name=name))
+        return super().get_screen(name)
+
 class ZombieVibeApp(App):
+    def on_stop(self):
+        # Don't lose a day's progress that is still waiting to be written
+        save_worker.flush()
+
+    def load_kv(self, filename=None):
+        # Same as App.load_kv, except parsed rules come from kvcache when the
+        # kv file hasn't changed
+        if filename is None:
+            filename = os.path.join(self.kv_directory or self.directory, 'zombievibe.kv')
+        if not os.path.exists(filename):
+            return False
+        root = kvcache.load_file(filename)
+        if root:
+            self.root = root
+        startup.mark('kv load')
+        return True
+
     def build(self):
-        sm = ScreenManager()
+        sm = LazyScreenManager()
         sm.add_widget(MainMenu(name='main_menu'))
-        sm.add_widget(CharacterCreationScreen(name='character_creation'))
-        sm.add_widget(LoadGameScreen(name='load_game'))
-        sm.add_widget(GameScreen(name='game_screen'))
-        sm.add_widget(CreditsScreen(name='credits'))  # Add Credits screen
+        sm.register('character_creation', CharacterCreationScreen)
+        sm.register('load_game', LoadGameScreen)
+        sm.register('game_screen', GameScreen)
+        sm.register('credits', CreditsScreen)
+        startup.mark('build')
         return sm
 
+    def on_start(self):
+        Window.bind(on_flip=self.on_first_frame)
+
+    def on_first_frame(self, window):
+        window.unbind(on_flip=self.on_first_frame)
+        startup.mark('first frame')
+        log.info(startup.report())
+        perf.track_frames()  # From here on, so startup isn't counted as one long frame
+
 if __name__ == '__main__':
+    gamelog.install_crash_dump()
     ZombieVibeApp().run()
\ No newline at end of file
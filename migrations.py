@@ -0,0 +1,56 @@
+# migrations.py
+# Upgrades old save data to the current layout.
+#
+# Every JSON snapshot carries a "version". Each registered migration takes the
+# data of one version to the next, and upgrade() runs the chain until the data
+# is current. Saves are written back after an upgrade (see saves.load_file), so
+# an old save pays for this once rather than on every load.
+import copy
+
+from character import (Character, DEFAULT_RESOURCES, DEFAULT_RESOURCE_VALUES, DEFAULT_SHOP_PRICES,
+                       OBJECTIVES, RESOURCE_NAMES)
+
+SAVE_VERSION = 2
+_MIGRATIONS = {}  # Version -> function turning data of that version into the next
+
+def migration(version):
+    """Register a function that upgrades save data from `version`."""
+    def register(func):
+        _MIGRATIONS[version] = func
+        return func
+    return register
+
+@migration(0)
+def _fill_missing_fields(data):
+    # Saves from before versioning could be missing anything added since the
+    # first release
+    stats = Character(data['name'], data['endurance'], data['scavenging'],
+                      data['charisma'], data['combat'], data['crafting'])
+    data.setdefault('resources', dict(DEFAULT_RESOURCES))
+    data.setdefault('base_upgrades', [])
+    data.setdefault('camp_members', [])
+    data.setdefault('current_ap', stats.action_points)
+    data.setdefault('current_day', 1)
+    data.setdefault('objectives_completed', dict.fromkeys(OBJECTIVES, False))
+    data.setdefault('shop_inventory', dict.fromkeys(RESOURCE_NAMES, 0))
+    data.setdefault('treasures', [])
+    data.setdefault('shop_treasures', [])
+
+@migration(1)
+def _add_economy(data):
+    # Money, shop prices and resource values weren't saved before version 2
+    data.setdefault('money', 100)
+    data.setdefault('shop_prices', copy.deepcopy(DEFAULT_SHOP_PRICES))
+    data.setdefault('resource_values', dict(DEFAULT_RESOURCE_VALUES))
+
+def upgrade(data) -> bool:
+    """Bring save data up to SAVE_VERSION in place. True if anything ran."""
+    version = data.get('version', 0)
+    if version > SAVE_VERSION:
+        raise ValueError(f"Save version {version} is newer than this game supports")
+    start = version
+    while version < SAVE_VERSION:
+        _MIGRATIONS[version](data)
+        version += 1
+    data['version'] = version
+    return version != start
@@ -0,0 +1,146 @@
+# modals.py
+# Keeps track of which popups are open and runs queued steps once they close.
+#
+# Sequences of dialogs (the day-end reports, a visitor arriving after an
+# adventure result) used to wait a fixed 0.1s and hope the previous popup was
+# gone. ModalQueue watches the window instead: every ModalView that opens is
+# recorded, and when the last one is dismissed the queued steps run on the
+# next frame. Passing schedule=lambda fn: fn() and animate=False runs a whole
+# flow with no waiting at all, which is what tests and scripted runs want.
+from collections import deque
+from weakref import WeakSet
+
+from kivy.clock import Clock
+from kivy.uix.modalview import ModalView
+
+def next_frame(fn):
+    Clock.schedule_once(lambda dt: fn())
+
+class ModalQueue:
+    def __init__(self, schedule=next_frame, animate=True):
+        self.schedule = schedule
+        self.animate = animate
+        self.open_views = {}  # Open ModalViews in the order they opened (dict keeps order, O(1) removal)
+        self.followups = {}  # Open view -> steps to run once it closes
+        self.ready = deque()  # Steps due on the next frame
+        self.pending = deque()  # Steps waiting for every popup to close
+        self.dismissing = {}  # Open view -> its opacity when dismiss() was last called
+        self.closing = WeakSet()  # Dismissed but still animating out
+        self.flush_scheduled = False
+        self.window = None
+
+    def attach(self, window):
+        """Start watching a window for popups."""
+        self.window = window
+        window.bind(children=self._on_children)
+        self._on_children(window, window.children)
+
+    def _on_children(self, window, children):
+        for widget in children:
+            if (isinstance(widget, ModalView) and widget._is_open
+                    and widget not in self.open_views and widget not in self.closing):
+                self._track(widget)
+        # Removed without fading out first
+        for view in [view for view in self.open_views if view not in children]:
+            self._closed(view)
+        # Views that finished animating out can be opened and tracked again
+        for widget in list(self.closing):
+            if widget not in children:
+                self.closing.discard(widget)
+
+    def _track(self, view):
+        if not self.animate:
+            view._anim_duration = 0
+        self.open_views[view] = None
+        view.fbind('on_pre_dismiss', self._on_pre_dismiss)
+        view.fbind('_anim_alpha', self._on_alpha)
+
+    def _on_pre_dismiss(self, view):
+        # An on_dismiss handler can still cancel this by returning True, so
+        # the view only counts as closed once it starts fading out
+        self.dismissing[view] = view._anim_alpha
+
+    def _on_alpha(self, view, alpha):
+        if view not in self.dismissing:
+            return
+        if alpha < self.dismissing[view]:
+            # Counts as closed straight away; the fade out doesn't hold up the next popup
+            self._closed(view)
+        else:
+            self.dismissing[view] = alpha  # Still fading in after a cancelled dismiss
+
+    def _closed(self, view):
+        view.funbind('on_pre_dismiss', self._on_pre_dismiss)
+        view.funbind('_anim_alpha', self._on_alpha)
+        self.dismissing.pop(view, None)
+        self.open_views.pop(view, None)
+        self.closing.add(view)
+        self.ready.extend(self.followups.pop(view, ()))
+        self._schedule_flush()
+
+    @property
+    def idle(self) -> bool:
+        return not self.open_views
+
+    @property
+    def top(self):
+        """The most recently opened popup that is still open, or None."""
+        return next(reversed(self.open_views), None)
+
+    def after(self, view, callback):
+        """Run callback the frame after view is dismissed (next frame if it isn't open)."""
+        if view in self.open_views:
+            self.followups.setdefault(view, []).append(callback)
+        else:
+            self.ready.append(callback)
+            self._schedule_flush()
+
+    def when_idle(self, callback):
+        """Run callback the frame after every open popup has closed (next frame if none are open)."""
+        self.pending.append(callback)
+        self._schedule_flush()
+
+    def queue(self, view):
+        """Open a popup once the ones already open have closed."""
+        self.when_idle(view.open)
+
+    def _schedule_flush(self):
+        if self.flush_scheduled:
+            return
+        if self.ready or (self.idle and self.pending):
+            self.flush_scheduled = True
+            self.schedule(self._flush)
+
+    def _flush(self):
+        self.flush_scheduled = False
+        # Follow-ups of a closed popup go first, so a popup they open holds
+        # back anything that was waiting for the screen to clear
+        while self.ready:
+            self.ready.popleft()()
+        while self.pending and self.idle:
+            self.pending.popleft()()
+
+    def close_all(self):
+        """Dismiss every open popup, newest first, dropping any steps queued behind them.
+
+        Dropping the steps takes constant time; the dismissals are one per open popup.
+        """
+        self.followups.clear()
+        self.pending.clear()
+        for view in reversed(list(self.open_views)):
+            view.dismiss()
+
+class PopupPool:
+    """Hands out popups of one kind, reusing any that have finished closing
+    instead of building a new widget tree each time."""
+    def __init__(self, factory):
+        self.factory = factory
+        self.instances = []
+
+    def get(self):
+        for popup in self.instances:
+            if not popup._is_open:  # Stays set until the close animation is done
+                return popup
+        popup = self.factory()
+        self.instances.append(popup)
+        return popup
@@ -0,0 +1,121 @@
+# outcomes.py
+# Exact outcome distribution of engine.determine_outcome, computed without
+# rolling any dice. The adventure roll is a single uniform draw compared to a
+# few cutoffs, so every probability is just the length of an interval, and the
+# follow-up choices are small uniform picks that can be enumerated.
+from dataclasses import dataclass, field
+from typing import Dict
+
+import catalog
+import engine
+from character import Character
+
+OUTCOMES = ['exceptional', 'good', 'neutral', 'bad']
+
+@dataclass
+class OutcomeStats:
+    probability: float
+    # Expected changes given that this outcome happened. AP includes the
+    # adventure cost itself.
+    resources: Dict[str, float] = field(default_factory=lambda: {r: 0.0 for r in engine.ALL_RESOURCES})
+    ap: float = 0.0
+    treasure_value: float = 0.0
+    visitor_chance: float = 0.0
+
+@dataclass
+class AdventureDistribution:
+    location_type: str
+    location: str
+    outcomes: Dict[str, OutcomeStats]
+
+    def expected_resources(self) -> Dict[str, float]:
+        return {
+            r: sum(o.probability * o.resources[r] for o in self.outcomes.values())
+            for r in engine.ALL_RESOURCES
+        }
+
+    def expected_ap(self) -> float:
+        return sum(o.probability * o.ap for o in self.outcomes.values())
+
+    def expected_treasure_value(self) -> float:
+        return sum(o.probability * o.treasure_value for o in self.outcomes.values())
+
+def _clamp(value):
+    return min(max(value, 0.0), 1.0)
+
+def outcome_probabilities(character: Character, location_type: str) -> Dict[str, float]:
+    """Probability of each outcome tier for one adventure."""
+    exceptional = _clamp(engine.exceptional_chance(character))
+    bonus = engine.location_skill_bonus(character, location_type)
+    # A regular roll is uniform on [exceptional, 1); final = roll + bonus
+    good_from = _clamp(engine.GOOD_THRESHOLD - bonus)
+    neutral_from = _clamp(engine.NEUTRAL_THRESHOLD - bonus)
+    return {
+        'exceptional': exceptional,
+        'good': 1.0 - max(exceptional, good_from),
+        'neutral': max(0.0, good_from - max(exceptional, neutral_from)),
+        'bad': max(0.0, neutral_from - exceptional)
+    }
+
+def _mean(bounds):
+    return (bounds[0] + bounds[1]) / 2
+
+def _find_stats(probability, events, find_range):
+    stats = OutcomeStats(probability, ap=-engine.ADVENTURE_AP_COST)
+    find_share = events.count('resource') / len(events)
+    per_resource = find_share * _mean(find_range) / len(engine.ALL_RESOURCES)
+    for resource in engine.ALL_RESOURCES:
+        stats.resources[resource] = per_resource
+    stats.visitor_chance = events.count('friendly') / len(events)
+    return stats
+
+def _bad_stats(probability, character):
+    stats = OutcomeStats(probability, ap=-engine.ADVENTURE_AP_COST)
+    # Extra AP can only be lost if some is left after paying for the trip
+    ap_loss = 1.0 if character.current_ap - engine.ADVENTURE_AP_COST > 0 else 0.0
+    event_weight = 1 / len(engine.BAD_EVENTS)
+    resource_weight = event_weight / len(engine.ALL_RESOURCES)
+
+    for event in engine.BAD_EVENTS:
+        if event == 'accident':
+            stats.ap -= event_weight * ap_loss
+            continue
+
+        bounds = engine.ZOMBIE_LOSS_RANGE if event == 'zombie' else engine.BANDIT_LOSS_RANGE
+        amounts = range(bounds[0], bounds[1] + 1)
+        for resource in engine.ALL_RESOURCES:
+            held = character.resources[resource]
+            for amount in amounts:
+                weight = resource_weight / len(amounts)
+                if held >= amount:
+                    stats.resources[resource] -= weight * amount
+                elif event == 'zombie':
+                    stats.ap -= weight * ap_loss
+                else:  # Bandits take whatever is left
+                    stats.resources[resource] -= weight * held
+    return stats
+
+def adventure_distribution(character: Character, location_type: str, location: str) -> AdventureDistribution:
+    """Exact probability and expected deltas of every outcome of one adventure
+    at `location`, for the character's current stats, resources and AP."""
+    probabilities = outcome_probabilities(character, location_type)
+
+    outcomes = {
+        'exceptional': OutcomeStats(
+            probabilities['exceptional'],
+            ap=-engine.ADVENTURE_AP_COST,
+            treasure_value=catalog.expected_value(location)
+        ),
+        'good': _find_stats(probabilities['good'], engine.GOOD_EVENTS, engine.GOOD_FIND_RANGE),
+        'neutral': _find_stats(probabilities['neutral'], engine.NEUTRAL_EVENTS, engine.NEUTRAL_FIND_RANGE),
+        'bad': _bad_stats(probabilities['bad'], character)
+    }
+    return AdventureDistribution(location_type, location, outcomes)
+
+def all_locations(character: Character) -> Dict[str, AdventureDistribution]:
+    """Distributions for every adventure location, keyed by location name."""
+    return {
+        location: adventure_distribution(character, location_type, location)
+        for location_type, locations in engine.LOCATIONS.items()
+        for location in locations
+    }
@@ -0,0 +1,107 @@
+# perf.py
+# How long each player action takes, as the player feels it.
+#
+# timed('gather') wraps an action, as a decorator or a with block, and adds
+# its duration to that action's Histogram: a rolling window of the last
+# WINDOW samples, so the percentiles describe recent play rather than the
+# whole session. track_frames() adds the Kivy clock's frame times under
+# FRAME. Recording is an append, cheap enough to leave on; percentiles are
+# only worked out when something asks for them (the overlay, export_csv).
+import csv
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+WINDOW = 500  # Samples kept per action
+FRAME = 'frame'
+PERCENTILES = (50, 95, 99)
+EXPORT_FILE = Path("perf.csv")
+
+class Histogram:
+    def __init__(self, size=WINDOW):
+        self.samples = deque(maxlen=size)  # Seconds
+        self.count = 0  # Every sample ever added, not just the window
+        # The save worker records from its own thread, so reads copy the
+        # window under the lock rather than iterating it while it changes
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+
+    def snapshot(self):
+        """(count, samples) as of now."""
+        with self._lock:
+            return self.count, list(self.samples)
+
+    def percentiles(self, ps=PERCENTILES) -> list:
+        """Nearest-rank percentiles of the window, in seconds."""
+        return _nearest_rank(sorted(self.snapshot()[1]), ps)
+
+    def summary(self) -> dict:
+        count, samples = self.snapshot()
+        ordered = sorted(samples)
+        p50, p95, p99 = _nearest_rank(ordered, PERCENTILES)
+        return {
+            'count': count,
+            'p50_ms': round(p50 * 1000, 3),
+            'p95_ms': round(p95 * 1000, 3),
+            'p99_ms': round(p99 * 1000, 3),
+            'max_ms': round((ordered[-1] if ordered else 0.0) * 1000, 3)
+        }
+
+def _nearest_rank(ordered, ps) -> list:
+    if not ordered:
+        return [0.0 for _ in ps]
+    return [ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] for p in ps]
+
+histograms = {}  # Action name -> Histogram
+
+def record(name, seconds):
+    histogram = histograms.get(name)
+    if histogram is None:
+        # setdefault, since the save worker records from its own thread
+        histogram = histograms.setdefault(name, Histogram())
+    histogram.add(seconds)
+
+@contextmanager
+def timed(name):
+    """Time a block, or every call of the function it decorates, under name."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+def track_frames():
+    """Record the time between frames for as long as the app runs."""
+    from kivy.clock import Clock
+    return Clock.schedule_interval(lambda dt: record(FRAME, dt), 0)
+
+def summary() -> dict:
+    """Action name -> count and percentiles in milliseconds. Frames come first."""
+    names = sorted(histograms, key=lambda name: (name != FRAME, name))
+    return {name: histograms[name].summary() for name in names}
+
+def report() -> str:
+    lines = [f"{'':10} {'n':>5} {'p50':>7} {'p95':>7} {'p99':>7} ms"]
+    for name, row in summary().items():
+        lines.append(f"{name:10} {row['count']:5} {row['p50_ms']:7.1f} {row['p95_ms']:7.1f} {row['p99_ms']:7.1f}")
+    return "\n".join(lines)
+
+def export_csv(path=EXPORT_FILE) -> Path:
+    """Write the summary as CSV, one row per action. Returns the path."""
+    path = Path(path)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['action', 'count', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+        for name, row in summary().items():
+            writer.writerow([name, row['count'], row['p50_ms'], row['p95_ms'], row['p99_ms'], row['max_ms']])
+    return path
+
+def reset():
+    histograms.clear()
@@ -0,0 +1,203 @@
+# planner.py
+# Expectimax solver for spending one day's action points.
+#
+# A day is scored by the credit value (character.resource_values) of the
+# stockpile after the day-end upkeep, plus the value of any treasures found,
+# minus a penalty for every unit of food or water the camp is short.
+#
+# That score is linear in the resources apart from the upkeep, and the dice
+# only look at a resource to check whether at least 3 units are held. So a
+# state only has to remember each resource up to the most that could still
+# matter, and nothing beyond the upkeep if the character can't roll a bad
+# outcome at all. An adventure's value only depends on its location through
+# the treasure, so only the richest location of each type is searched. States
+# reached by different characters with the same relevant stats share one
+# cache, which is what makes solving every preset cheap.
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+import catalog
+import engine
+import outcomes
+from character import Character
+
+REST = ('rest',)
+DEFAULT_SHORTFALL_PENALTY = 50  # Credits per unit of food or water missing at upkeep
+
+_RESOURCE_INDEX = {r: i for i, r in enumerate(engine.ALL_RESOURCES)}
+_UPKEEP = (_RESOURCE_INDEX['food'], _RESOURCE_INDEX['water'])
+_MAX_LOSS = max(engine.ZOMBIE_LOSS_RANGE[1], engine.BANDIT_LOSS_RANGE[1])
+
+class _Params(NamedTuple):
+    scavenging: int
+    charisma: int
+    endurance: int
+    combat: int
+    need: int  # Food and water eaten each at day end
+    max_loss: int  # Most a bad outcome can take from one resource, 0 if none can happen
+    values: Tuple[int, ...]  # Credit value per resource, in engine.ALL_RESOURCES order
+    penalty: int
+
+@dataclass
+class DayPlan:
+    action: tuple  # Best first action: REST, ('gather', resource) or ('adventure', location_type, location)
+    expected_value: float  # Expected score of the day when playing optimally
+    params: _Params
+
+    def action_for(self, current_ap: int, resources: dict) -> tuple:
+        """Best action from a later state of the same day."""
+        return _solve(self.params, current_ap, _key(self.params, current_ap, _vector(resources)))[1]
+
+def _vector(resources):
+    return tuple(resources[r] for r in engine.ALL_RESOURCES)
+
+def _key(params, ap, vector):
+    # Losses can take at most _MAX_LOSS per adventure, so anything above this
+    # cap behaves exactly like the cap for the rest of the day
+    cap = params.max_loss * (ap // engine.ADVENTURE_AP_COST)
+    return tuple(
+        min(amount, cap + (params.need if i in _UPKEEP else 0))
+        for i, amount in enumerate(vector)
+    )
+
+def _terminal(params, key):
+    """Non-linear part of the score: upkeep eaten and shortfall penalty."""
+    value = 0.0
+    for i in _UPKEEP:
+        eaten = min(key[i], params.need)
+        value -= params.values[i] * eaten + params.penalty * (params.need - eaten)
+    return value
+
+@lru_cache(maxsize=None)
+def _tier_probabilities(params, location_type):
+    stub = Character("", params.endurance, params.scavenging, params.charisma, params.combat, 0)
+    return outcomes.outcome_probabilities(stub, location_type)
+
+@lru_cache(maxsize=None)
+def _gather_outcomes(scavenging):
+    success = engine.gather_chance(scavenging)
+    low, high = engine.gather_amounts(scavenging)
+    amounts = range(low, high + 1)
+    return [(1 - success, 0)] + [(success / len(amounts), a) for a in amounts]
+
+@lru_cache(maxsize=None)
+def _richest_locations():
+    """Location with the most valuable treasures on average for each location type."""
+    return {
+        location_type: max(locations, key=catalog.expected_value)
+        for location_type, locations in engine.LOCATIONS.items()
+    }
+
+def _delta(size, i, amount):
+    return tuple(amount if j == i else 0 for j in range(size))
+
+def _merge(params, transitions):
+    """Combine transitions leading to the same change and precompute their gain."""
+    merged = {}
+    for p, delta, ap_left in transitions:
+        if p:
+            merged[delta, ap_left] = merged.get((delta, ap_left), 0.0) + p
+    return tuple(
+        (p, delta, ap_left, sum(v * d for v, d in zip(params.values, delta)))
+        for (delta, ap_left), p in merged.items()
+    )
+
+@lru_cache(maxsize=None)
+def _gather_transitions(params, resource, ap):
+    i = _RESOURCE_INDEX[resource]
+    size = len(params.values)
+    return _merge(params, [
+        (p, _delta(size, i, amount), ap - engine.GATHER_AP_COST)
+        for p, amount in _gather_outcomes(params.scavenging)
+    ])
+
+@lru_cache(maxsize=None)
+def _adventure_transitions(params, location_type, ap, held):
+    """Everything but the treasure of one adventure, as merged transitions.
+
+    `held` is the stockpile capped at the largest possible loss, which is all
+    the bad outcomes look at.
+    """
+    tiers = _tier_probabilities(params, location_type)
+    ap_left = ap - engine.ADVENTURE_AP_COST
+    tired = max(0, ap_left - 1)
+    size = len(held)
+    zero = (0,) * size
+    transitions = [(tiers['exceptional'], zero, ap_left)]
+
+    for tier, events, bounds in (('good', engine.GOOD_EVENTS, engine.GOOD_FIND_RANGE),
+                                 ('neutral', engine.NEUTRAL_EVENTS, engine.NEUTRAL_FIND_RANGE)):
+        finds = events.count('resource') / len(events)
+        amounts = range(bounds[0], bounds[1] + 1)
+        transitions.append((tiers[tier] * (1 - finds), zero, ap_left))
+        for i in range(size):
+            for amount in amounts:
+                transitions.append((tiers[tier] * finds / size / len(amounts), _delta(size, i, amount), ap_left))
+
+    event_p = tiers['bad'] / len(engine.BAD_EVENTS)
+    for event in engine.BAD_EVENTS:
+        if event == 'accident':
+            transitions.append((event_p, zero, tired))
+            continue
+        bounds = engine.ZOMBIE_LOSS_RANGE if event == 'zombie' else engine.BANDIT_LOSS_RANGE
+        amounts = range(bounds[0], bounds[1] + 1)
+        for i in range(size):
+            for amount in amounts:
+                p = event_p / size / len(amounts)
+                if held[i] >= amount:
+                    transitions.append((p, _delta(size, i, -amount), ap_left))
+                elif event == 'zombie':
+                    transitions.append((p, zero, tired))
+                else:  # Bandits take whatever is left
+                    transitions.append((p, _delta(size, i, -held[i]), ap_left))
+    return _merge(params, transitions)
+
+def _expect(params, transitions, key):
+    total = 0.0
+    for p, delta, ap_left, gain in transitions:
+        vector = tuple(k + d for k, d in zip(key, delta))
+        total += p * (gain + _solve(params, ap_left, _key(params, ap_left, vector))[0])
+    return total
+
+@lru_cache(maxsize=None)
+def _solve(params, ap, key):
+    best = (_terminal(params, key), REST)
+    if ap >= engine.GATHER_AP_COST:
+        for resource in engine.GATHERABLE_RESOURCES:
+            value = _expect(params, _gather_transitions(params, resource, ap), key)
+            if value > best[0]:
+                best = (value, ('gather', resource))
+
+    if ap >= engine.ADVENTURE_AP_COST:
+        held = tuple(min(k, _MAX_LOSS) for k in key)
+        for location_type, location in _richest_locations().items():
+            treasure = catalog.expected_value(location)
+            tiers = _tier_probabilities(params, location_type)
+            value = (tiers['exceptional'] * treasure +
+                     _expect(params, _adventure_transitions(params, location_type, ap, held), key))
+            if value > best[0]:
+                best = (value, ('adventure', location_type, location))
+    return best
+
+def plan_day(character: Character, shortfall_penalty: int = DEFAULT_SHORTFALL_PENALTY) -> DayPlan:
+    """Optimal way to spend character.current_ap for the rest of today."""
+    params = _Params(
+        character.scavenging, character.charisma, character.endurance, character.combat,
+        len(character.camp_members) + 1,
+        0,
+        _vector(character.resource_values),
+        shortfall_penalty
+    )
+    stub = Character("", character.endurance, character.scavenging, character.charisma, character.combat, 0)
+    if any(outcomes.outcome_probabilities(stub, t)['bad'] for t in engine.LOCATIONS):
+        params = params._replace(max_loss=_MAX_LOSS)
+
+    vector = _vector(character.resources)
+    value, action = _solve(params, character.current_ap, _key(params, character.current_ap, vector))
+    linear = sum(v * r for v, r in zip(params.values, vector))
+    return DayPlan(action, linear + value, params)
+
+def clear_cache():
+    for cached in (_solve, _tier_probabilities, _gather_transitions, _adventure_transitions):
+        cached.cache_clear()
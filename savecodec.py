@@ -0,0 +1,197 @@
+# savecodec.py
+# Compact binary snapshot format for characters (.zvb files).
+#
+# Layout, all little-endian:
+#   header    magic, schema version, flags, journal sequence number
+#   strings   count, uint16 length of each, then the UTF-8 bytes back to back
+#   stats     five core stats, current AP, current day
+#   resources resource names, then personal and shop amounts as int32 arrays
+#   ...       objectives, upgrades, camp members, treasures, shop treasures
+#   economy   money, resource values, shop prices (version 2 onwards)
+#
+# Every piece of text is stored once in the string table and referenced by
+# index, so a thousand copies of the same treasure cost a few ints each, and
+# loading hands the same str objects to every Treasure that uses them.
+import struct
+
+import catalog
+from character import Character, Treasure
+
+MAGIC = b'ZVBS'
+SCHEMA_VERSION = 2
+SUFFIX = '.zvb'
+
+HEADER = struct.Struct('<4sHHI')
+STATS = struct.Struct('<5hii')
+COUNT = struct.Struct('<I')
+MEMBER = struct.Struct('<IIIh')  # name, type, mode, ap
+TREASURE = struct.Struct('<IIiIIi')  # name, category, value, location, description, day
+
+class _Writer:
+    def __init__(self):
+        self.strings = {}
+        self.parts = []
+
+    def ref(self, text):
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def pack(self, fmt, *values):
+        self.parts.append(struct.pack(fmt, *values))
+
+    def ints(self, code, values):
+        values = list(values)
+        self.pack('<I', len(values))
+        self.pack(f'<{len(values)}{code}', *values)
+
+class _Reader:
+    def __init__(self, data, offset):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def ints(self, code):
+        count, = self.unpack('<I')
+        return self.unpack(f'<{count}{code}')
+
+    def records(self, record):
+        count, = self.unpack('<I')
+        end = self.offset + count * record.size
+        rows = record.iter_unpack(self.data[self.offset:end])
+        self.offset = end
+        return rows
+
+def encode(character, journal_seq=0) -> bytes:
+    w = _Writer()
+    w.pack(STATS.format, character.endurance, character.scavenging, character.charisma,
+           character.combat, character.crafting, character.current_ap, character.current_day)
+
+    resource_names = list(character.resources.keys())
+    w.ints('I', (w.ref(r) for r in resource_names))
+    w.ints('i', (character.resources[r] for r in resource_names))
+    w.ints('i', (character.shop_inventory.get(r, 0) for r in resource_names))
+
+    objectives = list(character.objectives_completed.items())
+    w.ints('I', (w.ref(k) for k, _ in objectives))
+    w.ints('B', (int(done) for _, done in objectives))
+
+    w.ints('I', (w.ref(u) for u in character.base_upgrades))
+
+    w.pack('<I', len(character.camp_members))
+    for m in character.camp_members:
+        w.pack(MEMBER.format, w.ref(m['name']), w.ref(m['type']), w.ref(m['mode']), m['ap'])
+
+    for treasures in (character.treasures, character.shop_treasures):
+        w.pack('<I', len(treasures))
+        for t in treasures:
+            w.pack(TREASURE.format, w.ref(t.name), w.ref(t.category), t.value,
+                   w.ref(t.location_found), w.ref(t.description), t.day_found)
+
+    w.pack('<i', character.money)
+    values = list(character.resource_values.items())
+    w.ints('I', (w.ref(r) for r, _ in values))
+    w.ints('i', (v for _, v in values))
+    sellers = list(character.shop_prices.items())
+    w.ints('I', (w.ref(r) for r, _ in sellers))
+    w.ints('I', (len(rates) for _, rates in sellers))
+    w.ints('I', (w.ref(r) for _, rates in sellers for r in rates))
+    w.ints('d', (rate for _, rates in sellers for rate in rates.values()))
+
+    name = w.ref(character.name)
+    encoded = [s.encode('utf-8') for s in w.strings]
+    table = [
+        COUNT.pack(len(encoded)),
+        struct.pack(f'<{len(encoded)}H', *(len(b) for b in encoded)),
+        b''.join(encoded),
+        COUNT.pack(name)
+    ]
+    return b''.join([HEADER.pack(MAGIC, SCHEMA_VERSION, 0, journal_seq)] + table + w.parts)
+
+def is_binary(data: bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+def version(data: bytes) -> int:
+    return HEADER.unpack_from(data, 0)[1]
+
+def decode(data: bytes):
+    """Returns (character, journal_seq).
+
+    Version 1 files have no economy section; those fields keep the Character
+    defaults.
+    """
+    magic, version, _flags, journal_seq = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary save file")
+    if not 1 <= version <= SCHEMA_VERSION:
+        raise ValueError(f"Unsupported save version {version}")
+
+    r = _Reader(data, HEADER.size)
+    count, = r.unpack('<I')
+    lengths = r.unpack(f'<{count}H')
+    strings = []
+    blob = data[r.offset:r.offset + sum(lengths)]
+    start = 0
+    for length in lengths:
+        strings.append(catalog.shared(blob[start:start + length].decode('utf-8')))
+        start += length
+    r.offset += start
+    name, = r.unpack('<I')
+
+    endurance, scavenging, charisma, combat, crafting, current_ap, current_day = r.unpack(STATS.format)
+    character = Character(
+        name=strings[name],
+        endurance=endurance,
+        scavenging=scavenging,
+        charisma=charisma,
+        combat=combat,
+        crafting=crafting
+    )
+    character.current_ap = current_ap
+    character.current_day = current_day
+
+    resource_names = [strings[i] for i in r.ints('I')]
+    character.resources = dict(zip(resource_names, r.ints('i')))
+    character.shop_inventory = dict(zip(resource_names, r.ints('i')))
+
+    objective_names = [strings[i] for i in r.ints('I')]
+    character.objectives_completed = dict(zip(objective_names, (bool(v) for v in r.ints('B'))))
+
+    character.base_upgrades = [strings[i] for i in r.ints('I')]
+
+    character.camp_members = [
+        {'name': strings[n], 'type': strings[t], 'mode': strings[m], 'ap': ap}
+        for n, t, m, ap in r.records(MEMBER)
+    ]
+
+    # Identical records compare equal anyway, so they can share one object
+    built = {}
+    def treasure(row):
+        t = built.get(row)
+        if t is None:
+            n, c, v, l, d, day = row
+            t = built[row] = Treasure(strings[n], strings[c], v, strings[l], strings[d], day)
+        return t
+
+    character.treasures = [treasure(row) for row in r.records(TREASURE)]
+    character.shop_treasures = [treasure(row) for row in r.records(TREASURE)]
+
+    if version >= 2:
+        character.money, = r.unpack('<i')
+        value_names = [strings[i] for i in r.ints('I')]
+        character.resource_values = dict(zip(value_names, r.ints('i')))
+        sellers = [strings[i] for i in r.ints('I')]
+        counts = r.ints('I')
+        buyers = [strings[i] for i in r.ints('I')]
+        rates = r.ints('d')
+        character.shop_prices = {}
+        start = 0
+        for seller, count in zip(sellers, counts):
+            character.shop_prices[seller] = dict(zip(buyers[start:start + count], rates[start:start + count]))
+            start += count
+    return character, journal_seq
@@ -0,0 +1,286 @@
+# savedb.py
+# SQLite save store. Every character lives in one Characters/saves.db, split
+# into tables for the character itself, its resources, camp members and
+# treasures, so questions about all saves ("who is past day 30?", "what's the
+# most valuable treasure anyone has?") are answered by indexed queries instead
+# of opening every save.
+#
+# The database runs in WAL mode: the autosave thread can write while the UI
+# thread reads, and each thread gets its own connection.
+#
+# PRAGMA user_version records the database layout. SCHEMA is the first layout
+# and each entry in DB_MIGRATIONS upgrades one version to the next, the same
+# way migrations.py upgrades save files.
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import saves
+from character import (Character, Treasure, DEFAULT_RESOURCE_VALUES, DEFAULT_SHOP_PRICES,
+                       find_character_class)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    class TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    current_ap INTEGER NOT NULL,
+    endurance INTEGER NOT NULL,
+    scavenging INTEGER NOT NULL,
+    charisma INTEGER NOT NULL,
+    combat INTEGER NOT NULL,
+    crafting INTEGER NOT NULL,
+    base_upgrades TEXT NOT NULL,
+    objectives_completed TEXT NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS characters_day ON characters (day);
+CREATE INDEX IF NOT EXISTS characters_class ON characters (class);
+
+CREATE TABLE IF NOT EXISTS resources (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    resource TEXT NOT NULL,
+    amount INTEGER,  -- The character's stock
+    shop_amount INTEGER,  -- The shop's stock
+    PRIMARY KEY (character_id, resource)
+);
+
+CREATE TABLE IF NOT EXISTS camp_members (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    ap INTEGER NOT NULL,
+    PRIMARY KEY (character_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS treasures (
+    character_id INTEGER NOT NULL REFERENCES characters (id) ON DELETE CASCADE,
+    in_shop INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    location_found TEXT NOT NULL,
+    description TEXT NOT NULL,
+    day_found INTEGER NOT NULL,
+    PRIMARY KEY (character_id, in_shop, position)
+);
+CREATE INDEX IF NOT EXISTS treasures_value ON treasures (value);
+"""
+
+def _create_tables(db):
+    # executescript would commit the upgrade transaction, so run them one by one
+    for statement in SCHEMA.split(";"):
+        if statement.strip():
+            db.execute(statement)
+
+def _add_economy(db):
+    # Existing rows get the Character defaults, as file saves do in migrations.py
+    fresh = Character("", 0, 0, 0, 0, 0)
+    db.execute(f"ALTER TABLE characters ADD COLUMN money INTEGER NOT NULL DEFAULT {fresh.money}")
+    db.execute("ALTER TABLE characters ADD COLUMN shop_prices TEXT NOT NULL DEFAULT ''")
+    db.execute("ALTER TABLE characters ADD COLUMN resource_values TEXT NOT NULL DEFAULT ''")
+    db.execute("UPDATE characters SET shop_prices = ?, resource_values = ?",
+               (json.dumps(DEFAULT_SHOP_PRICES), json.dumps(DEFAULT_RESOURCE_VALUES)))
+
+def _add_size(db):
+    # Rows saved before this have no size until they're saved again
+    db.execute("ALTER TABLE characters ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+
+DB_MIGRATIONS = {
+    0: _create_tables,
+    1: _add_economy,
+    2: _add_size
+}
+DB_VERSION = len(DB_MIGRATIONS)
+
+ENTRY_COLUMNS = "name, class, day, mtime, size"
+TREASURE_COLUMNS = ["name", "category", "value", "location_found", "description", "day_found"]
+
+class SqliteStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.local = threading.local()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, just not durable to the last commit
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._upgrade(conn)
+            self.local.conn = conn
+        return conn
+
+    def _upgrade(self, conn):
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")  # Keep other connections out while upgrading
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > DB_VERSION:
+                raise ValueError(f"Save database version {version} is newer than this game supports")
+            while version < DB_VERSION:
+                DB_MIGRATIONS[version](conn)
+                version += 1
+                conn.execute(f"PRAGMA user_version = {version}")
+
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    # --- Saving and loading ---
+
+    def save_character(self, character) -> bool:
+        data = saves.character_to_dict(character)
+        db = self.db
+        with db:
+            row = db.execute(
+                """INSERT INTO characters (name, class, day, current_ap, endurance, scavenging, charisma,
+                                           combat, crafting, base_upgrades, objectives_completed, mtime,
+                                           money, shop_prices, resource_values, size)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (name) DO UPDATE SET
+                       class = excluded.class, day = excluded.day, current_ap = excluded.current_ap,
+                       endurance = excluded.endurance, scavenging = excluded.scavenging,
+                       charisma = excluded.charisma, combat = excluded.combat, crafting = excluded.crafting,
+                       base_upgrades = excluded.base_upgrades,
+                       objectives_completed = excluded.objectives_completed, mtime = excluded.mtime,
+                       money = excluded.money, shop_prices = excluded.shop_prices,
+                       resource_values = excluded.resource_values, size = excluded.size
+                   RETURNING id""",
+                (character.name, find_character_class(character), character.current_day, character.current_ap,
+                 character.endurance, character.scavenging, character.charisma, character.combat,
+                 character.crafting, json.dumps(data['base_upgrades']),
+                 json.dumps(data['objectives_completed']), time.time(), character.money,
+                 json.dumps(data['shop_prices']), json.dumps(data['resource_values']),
+                 len(json.dumps(data)))
+            ).fetchone()
+            character_id = row[0]
+
+            # Child rows are small, so replacing them beats diffing them
+            for table in ("resources", "camp_members", "treasures"):
+                db.execute(f"DELETE FROM {table} WHERE character_id = ?", (character_id,))
+
+            names = list(character.resources)
+            names += [r for r in character.shop_inventory if r not in character.resources]
+            db.executemany(
+                "INSERT INTO resources VALUES (?, ?, ?, ?)",
+                [(character_id, r, character.resources.get(r), character.shop_inventory.get(r))
+                 for r in names]
+            )
+            db.executemany(
+                "INSERT INTO camp_members VALUES (?, ?, ?, ?, ?, ?)",
+                [(character_id, i, m['name'], m['type'], m['mode'], m['ap'])
+                 for i, m in enumerate(character.camp_members)]
+            )
+            db.executemany(
+                "INSERT INTO treasures VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(character_id, in_shop, i, t.name, t.category, t.value, t.location_found, t.description, t.day_found)
+                 for in_shop, treasures in enumerate((character.treasures, character.shop_treasures))
+                 for i, t in enumerate(treasures)]
+            )
+        return True
+
+    def load_character(self, name) -> Character:
+        db = self.db
+        row = db.execute("SELECT * FROM characters WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"No save named {name!r}")
+
+        data = {field: row[field] for field in ("name", "endurance", "scavenging", "charisma", "combat", "crafting")}
+        data['current_ap'] = row['current_ap']
+        data['current_day'] = row['day']
+        data['base_upgrades'] = json.loads(row['base_upgrades'])
+        data['objectives_completed'] = json.loads(row['objectives_completed'])
+        data['money'] = row['money']
+        data['shop_prices'] = json.loads(row['shop_prices'])
+        data['resource_values'] = json.loads(row['resource_values'])
+
+        resources = db.execute(
+            "SELECT resource, amount, shop_amount FROM resources WHERE character_id = ?", (row['id'],)
+        ).fetchall()
+        data['resources'] = {r['resource']: r['amount'] for r in resources if r['amount'] is not None}
+        data['shop_inventory'] = {r['resource']: r['shop_amount'] for r in resources if r['shop_amount'] is not None}
+
+        data['camp_members'] = [
+            {'name': m['name'], 'type': m['type'], 'mode': m['mode'], 'ap': m['ap']}
+            for m in db.execute(
+                "SELECT name, type, mode, ap FROM camp_members WHERE character_id = ? ORDER BY position",
+                (row['id'],)
+            )
+        ]
+
+        data['treasures'], data['shop_treasures'] = [], []
+        for t in db.execute(
+            "SELECT * FROM treasures WHERE character_id = ? ORDER BY in_shop, position", (row['id'],)
+        ):
+            field = 'shop_treasures' if t['in_shop'] else 'treasures'
+            data[field].append({k: t[k] for k in TREASURE_COLUMNS})
+        return saves.character_from_dict(data)
+
+    def delete_character(self, name):
+        with self.db as db:
+            db.execute("DELETE FROM characters WHERE name = ?", (name,))
+
+    def import_saves(self, save_dir=None) -> int:
+        """Copy every file save in save_dir into the database."""
+        count = 0
+        for path in saves.list_saves(save_dir):
+            self.save_character(saves.load_file(path))
+            count += 1
+        return count
+
+    # --- Queries ---
+
+    def _entry(self, row) -> dict:
+        # The keys of saves.index_entry. Every save's file is the database, and
+        # its size is that of the character's data as JSON
+        return {
+            "name": row['name'],
+            "file": self.path.name,
+            "day": row['day'],
+            "class": row['class'],
+            "mtime": row['mtime'],
+            "size": row['size']
+        }
+
+    def read_index(self) -> dict:
+        """Character name -> entry, in the same shape as the file save index."""
+        return {
+            row['name']: self._entry(row)
+            for row in self.db.execute(f"SELECT {ENTRY_COLUMNS} FROM characters")
+        }
+
+    def saves_past_day(self, day) -> list:
+        """Entries for every character past the given day, furthest along first."""
+        return [self._entry(row) for row in self.db.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM characters WHERE day > ? ORDER BY day DESC", (day,)
+        )]
+
+    def saves_of_class(self, class_name) -> list:
+        return [self._entry(row) for row in self.db.execute(
+            f"SELECT {ENTRY_COLUMNS} FROM characters WHERE class = ? ORDER BY mtime DESC", (class_name,)
+        )]
+
+    def top_treasures(self, limit=10) -> list:
+        """(character name, Treasure) for the most valuable treasures across all saves."""
+        return [
+            (row['owner'], Treasure(*(row[k] for k in TREASURE_COLUMNS)))
+            for row in self.db.execute(
+                """SELECT c.name AS owner, t.* FROM treasures t
+                   JOIN characters c ON c.id = t.character_id
+                   ORDER BY t.value DESC LIMIT ?""",
+                (limit,)
+            )
+        ]
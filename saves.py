@@ -0,0 +1,400 @@
+# saves.py
+# Save files for characters.
+#
+# Characters/<name>.json is a full snapshot. Day-to-day saves only append the
+# fields that changed to Characters/<name>.journal, one JSON object per line,
+# and every COMPACT_EVERY entries the journal is folded back into a fresh
+# snapshot. Loading reads the snapshot and replays whatever journal is left.
+#
+# Snapshots are JSON by default; with SNAPSHOT_FORMAT = 'binary' they are
+# written as compact .zvb files (see savecodec.py) instead. Both kinds load.
+#
+# Characters/index.jsonl lists every save (name, day, class, mtime, size) so
+# the Load Game screen never has to open the saves themselves. Each save
+# appends that character's new line; later lines win, and the file is
+# rewritten once it holds too many outdated ones.
+#
+# With BACKEND = 'sqlite' all of the above is replaced by one database,
+# Characters/saves.db (see savedb.py); save_character, load_character and
+# read_index hand off to it and the rest of the game doesn't notice.
+#
+# Saves written by older versions are upgraded by migrations.py when they
+# load and written straight back in the current layout.
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import catalog
+import migrations
+import savecodec
+from character import Character, MemberRegistry, Treasure, find_character_class
+
+SAVE_DIR = Path("Characters")
+JOURNAL_SUFFIX = ".journal"
+SNAPSHOT_FORMAT = 'json'  # 'json' or 'binary'
+SNAPSHOT_SUFFIXES = {'json': '.json', 'binary': savecodec.SUFFIX}
+INDEX_FILE = "index.jsonl"
+COMPACT_EVERY = 20  # Journal entries before they're folded into the snapshot
+BACKEND = 'files'  # 'files' or 'sqlite'
+DB_FILE = "saves.db"
+
+SCALAR_FIELDS = [
+    "name", "endurance", "scavenging", "charisma", "combat", "crafting",
+    "resources", "base_upgrades", "camp_members", "current_ap", "current_day",
+    "objectives_completed", "shop_inventory", "money", "shop_prices", "resource_values"
+]
+TREASURE_FIELDS = ["treasures", "shop_treasures"]
+
+class _SavedState:
+    """What the files on disk currently hold for one character."""
+    def __init__(self, data, treasures, seq):
+        self.data = data  # JSON copies of SCALAR_FIELDS
+        self.treasures = treasures  # Field name -> list of the saved Treasure objects
+        self.seq = seq  # Sequence number of the last journal entry written
+
+_saved = {}  # Snapshot path -> _SavedState
+_indexes = {}  # Save directory -> [entries by name, lines in the index file]
+_lock = threading.RLock()  # Saves may be written from the autosave thread
+_stores = {}  # Database path -> savedb.SqliteStore
+
+def _locked(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+def get_store(save_dir=None):
+    """The database store when BACKEND is 'sqlite', otherwise None."""
+    if BACKEND != 'sqlite':
+        return None
+    path = Path(save_dir or SAVE_DIR) / DB_FILE
+    if path not in _stores:
+        import savedb  # Only needed with this backend
+        _stores[path] = savedb.SqliteStore(path)
+    return _stores[path]
+
+def entry_key(entry, save_dir=None) -> str:
+    """What load_character takes to load the save behind an index entry."""
+    if get_store(save_dir):
+        return entry['name']
+    return str(Path(save_dir or SAVE_DIR) / entry['file'])
+
+def save_path(name, save_dir=None) -> Path:
+    return Path(save_dir or SAVE_DIR) / f"{name}{SNAPSHOT_SUFFIXES[SNAPSHOT_FORMAT]}"
+
+def list_saves(save_dir=None) -> list:
+    """Snapshot files in the save directory, one per character name."""
+    found = {}
+    for suffix in SNAPSHOT_SUFFIXES.values():
+        for path in Path(save_dir or SAVE_DIR).glob(f"*{suffix}"):
+            found.setdefault(path.stem, path)
+    return list(found.values())
+
+def journal_path(snapshot: Path) -> Path:
+    return snapshot.with_suffix(JOURNAL_SUFFIX)
+
+def treasure_to_dict(t) -> dict:
+    return {
+        "name": t.name,
+        "category": t.category,
+        "value": t.value,
+        "location_found": t.location_found,
+        "description": t.description,
+        "day_found": t.day_found
+    }
+
+def treasure_from_dict(t) -> Treasure:
+    # Catalog treasures reuse the catalog's strings instead of fresh copies
+    return Treasure(
+        name=catalog.shared(t['name']),
+        category=catalog.shared(t['category']),
+        value=t['value'],
+        location_found=catalog.shared(t['location_found']),
+        description=catalog.shared(t['description']),
+        day_found=t['day_found']
+    )
+
+def _plain(value):
+    # Character keeps its tables as dict-style views; saves want real dicts
+    if isinstance(value, Mapping):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, MemberRegistry):
+        return value.as_dicts()
+    return value
+
+def character_to_dict(character) -> dict:
+    data = {field: _plain(getattr(character, field)) for field in SCALAR_FIELDS}
+    for field in TREASURE_FIELDS:
+        data[field] = [treasure_to_dict(t) for t in getattr(character, field, [])]
+    return data
+
+def character_from_dict(data) -> Character:
+    """Build a character from current-version save data (see migrations.upgrade)."""
+    character = Character(
+        name=data['name'],
+        endurance=data['endurance'],
+        scavenging=data['scavenging'],
+        charisma=data['charisma'],
+        combat=data['combat'],
+        crafting=data['crafting']
+    )
+    for field in SCALAR_FIELDS[6:]:  # Everything after the name and stats
+        setattr(character, field, data[field])
+    for field in TREASURE_FIELDS:
+        setattr(character, field, [treasure_from_dict(t) for t in data[field]])
+    return character
+
+def _copy(value):
+    # Cheap deep copy for the plain JSON values we keep as the saved baseline
+    return json.loads(json.dumps(value))
+
+def _remember(path, character, seq):
+    data = {field: _copy(_plain(getattr(character, field))) for field in SCALAR_FIELDS}
+    treasures = {field: list(getattr(character, field)) for field in TREASURE_FIELDS}
+    _saved[path] = _SavedState(data, treasures, seq)
+
+def _write_file(path, data: bytes):
+    # Write next to the target and rename so a crash never leaves half a file
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+@_locked
+def write_snapshot(character, save_dir=None, path=None) -> Path:
+    """Write a full snapshot and drop the journal.
+
+    The format follows path's suffix; by default the snapshot goes to the
+    character's save path in SNAPSHOT_FORMAT.
+    """
+    path = Path(path) if path else save_path(character.name, save_dir)
+    path.parent.mkdir(exist_ok=True)
+    state = _saved.get(path)
+    seq = state.seq if state else 0
+
+    if path.suffix == savecodec.SUFFIX:
+        _write_file(path, savecodec.encode(character, seq))
+    else:
+        data = character_to_dict(character)
+        data['version'] = migrations.SAVE_VERSION
+        data['journal_seq'] = seq
+        _write_file(path, json.dumps(data, indent=4).encode('utf-8'))
+
+    journal = journal_path(path)
+    if journal.exists():
+        journal.unlink()
+    for suffix in SNAPSHOT_SUFFIXES.values():
+        # A snapshot left in the other format is now stale
+        other = path.with_suffix(suffix)
+        if other != path and other.exists():
+            other.unlink()
+    _remember(path, character, seq)
+    return path
+
+def _journal_entry(character, state):
+    entry = {}
+    changed = {}
+    for field in SCALAR_FIELDS:
+        value = _plain(getattr(character, field))
+        if value != state.data[field]:
+            changed[field] = value
+
+    appended = {}
+    for field in TREASURE_FIELDS:
+        old = state.treasures[field]
+        new = list(getattr(character, field))
+        if len(new) >= len(old) and all(a is b for a, b in zip(old, new)):
+            if len(new) > len(old):
+                appended[field] = [treasure_to_dict(t) for t in new[len(old):]]
+        else:
+            changed[field] = [treasure_to_dict(t) for t in new]
+
+    if changed:
+        entry['set'] = changed
+    if appended:
+        entry['append'] = appended
+    return entry
+
+def save_character(character, save_dir=None):
+    store = get_store(save_dir)
+    if store:
+        return store.save_character(character)
+    return save_file(character, save_dir)
+
+@_locked
+def save_file(character, save_dir=None):
+    """Save the character, appending only what changed since the last save."""
+    path = save_path(character.name, save_dir)
+    state = _saved.get(path)
+    if state is None or not path.exists():
+        write_snapshot(character, save_dir)
+        _update_index(path, character)
+        return True
+
+    entry = _journal_entry(character, state)
+    if not entry:
+        return True
+
+    entry['seq'] = state.seq + 1
+    with open(journal_path(path), 'a') as f:
+        f.write(json.dumps(entry) + "\n")
+    _remember(path, character, entry['seq'])
+
+    if entry['seq'] % COMPACT_EVERY == 0:
+        write_snapshot(character, save_dir)
+    _update_index(path, character)
+    return True
+
+def _apply(character, entry):
+    for field, value in entry.get('set', {}).items():
+        if field in TREASURE_FIELDS:
+            value = [treasure_from_dict(t) for t in value]
+        setattr(character, field, value)
+    for field, items in entry.get('append', {}).items():
+        getattr(character, field).extend(treasure_from_dict(t) for t in items)
+
+def _replay(character, journal, seq):
+    if not journal.exists():
+        return seq
+
+    good = 0  # Byte offset just past the last complete entry
+    with open(journal, 'rb') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break  # A torn final line from an interrupted save
+            good += len(line)
+            if entry.get('seq', 0) <= seq:
+                continue  # Already folded into the snapshot
+            _apply(character, entry)
+            seq = entry['seq']
+
+    if good < journal.stat().st_size:
+        # Cut the torn line off so the next append starts on a clean line
+        os.truncate(journal, good)
+    return seq
+
+def load_character(key, save_dir=None) -> Character:
+    """Load a save by the key entry_key gives for its index entry."""
+    store = get_store(save_dir)
+    if store:
+        return store.load_character(key)
+    return load_file(key)
+
+@_locked
+def load_file(file_path) -> Character:
+    """Load a snapshot in either format plus its journal."""
+    path = Path(file_path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    if savecodec.is_binary(raw):
+        upgraded = savecodec.version(raw) < savecodec.SCHEMA_VERSION
+        character, seq = savecodec.decode(raw)
+    else:
+        data = json.loads(raw)
+        upgraded = migrations.upgrade(data)
+        character = character_from_dict(data)
+        seq = data.get('journal_seq', 0)
+
+    seq = _replay(character, journal_path(path), seq)
+    _remember(path, character, seq)
+    if upgraded:
+        # Store the upgraded save so the migrations never run for it again. It
+        # stays in the format and file it was read from, which the index points to
+        write_snapshot(character, path=path)
+    return character
+
+# --- Save index ---
+
+def index_entry(path, character) -> dict:
+    size = path.stat().st_size
+    journal = journal_path(path)
+    if journal.exists():
+        size += journal.stat().st_size
+    return {
+        "name": character.name,
+        "file": path.name,
+        "day": character.current_day,
+        "class": find_character_class(character),
+        "mtime": time.time(),
+        "size": size
+    }
+
+def _write_index(save_dir, entries):
+    lines = "".join(json.dumps(e) + "\n" for e in entries.values())
+    _write_file(save_dir / INDEX_FILE, lines.encode('utf-8'))
+    _indexes[save_dir] = [entries, len(entries)]
+
+def _update_index(path, character):
+    save_dir = path.parent
+    _read_index(save_dir)
+    index = _indexes[save_dir]
+    entry = index_entry(path, character)
+    index[0][character.name] = entry
+    index[1] += 1
+
+    if index[1] > 2 * len(index[0]) + COMPACT_EVERY:
+        _write_index(save_dir, index[0])
+    else:
+        with open(save_dir / INDEX_FILE, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+@_locked
+def rebuild_index(save_dir=None) -> dict:
+    """Scan and open every save to recreate the index from scratch."""
+    save_dir = Path(save_dir or SAVE_DIR)
+    entries = {}
+    for path in list_saves(save_dir):
+        try:
+            character = load_file(path)
+        except (OSError, ValueError, KeyError):
+            continue  # Unreadable saves can't be offered for loading anyway
+        entry = index_entry(path, character)
+        entry["mtime"] = path.stat().st_mtime
+        entries[character.name] = entry
+    save_dir.mkdir(exist_ok=True)
+    _write_index(save_dir, entries)
+    return entries
+
+@_locked
+def read_index(save_dir=None) -> dict:
+    """Character name -> index entry for every save in the directory."""
+    store = get_store(save_dir)
+    if store:
+        return store.read_index()
+    return dict(_read_index(save_dir))
+
+def _read_index(save_dir=None) -> dict:
+    save_dir = Path(save_dir or SAVE_DIR)
+    if save_dir in _indexes:
+        return _indexes[save_dir][0]
+
+    index_file = save_dir / INDEX_FILE
+    if not index_file.exists():
+        return rebuild_index(save_dir)
+
+    entries = {}
+    lines = 0
+    torn = False
+    with open(index_file, 'rb') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                torn = True  # Interrupted write
+                continue
+            entries[entry['name']] = entry
+            lines += 1
+
+    if torn:
+        _write_index(save_dir, entries)
+    else:
+        _indexes[save_dir] = [entries, lines]
+    return entries
@@ -0,0 +1,26 @@
+# startup.py
+# Times the stages of a cold start: importing main (Kivy, mostly), loading
+# the kv file, building the root widget and drawing the first frame.
+#
+# Import this before anything else so the clock starts with the process. Each
+# mark() records the time since the previous one; report() prints the lot once
+# the first frame is up, so a slow start shows up in the console.
+import time
+
+STAGES = ('import', 'kv load', 'build', 'first frame')
+
+_last = time.perf_counter()
+timings = {}  # Stage -> seconds
+
+def mark(stage):
+    global _last
+    now = time.perf_counter()
+    timings[stage] = now - _last
+    _last = now
+
+def total() -> float:
+    return sum(timings.values())
+
+def report() -> str:
+    parts = [f"{stage} {timings[stage] * 1000:.0f}ms" for stage in STAGES if stage in timings]
+    return f"Startup: {', '.join(parts)} (total {total() * 1000:.0f}ms)"
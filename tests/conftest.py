@@ -0,0 +1,13 @@
+# conftest.py
+# The game's modules live at the top of the repo; make them importable from
+# the tests however pytest is started.
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Kivy reads these on import: don't parse pytest's arguments, don't open a window
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
@@ -0,0 +1,86 @@
+# test_autosave.py
+import threading
+import time
+
+import engine
+from autosave import SaveWorker
+
+class GatedSave:
+    """A save function that records what it was given and can be held up."""
+    def __init__(self, delay=0.0):
+        self.saved = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.delay = delay
+
+    def __call__(self, snapshot):
+        self.started.set()
+        self.gate.wait(5)
+        time.sleep(self.delay)
+        self.saved.append((snapshot.name, snapshot.current_day))
+
+def test_saves_queued_behind_a_write_are_coalesced():
+    save = GatedSave()
+    save.gate.clear()
+    worker = SaveWorker(save=save)
+    character = engine.new_character("Busy", "Survivor")
+    results = []
+
+    worker.submit(character, on_done=lambda ok, error: results.append(ok))
+    assert save.started.wait(5)  # The first save is being written
+    for day in range(2, 7):
+        character.current_day = day
+        worker.submit(character, on_done=lambda ok, error: results.append(ok))
+    save.gate.set()
+
+    assert worker.flush(5)
+    # One write for the first submit, one for the five queued behind it
+    assert save.saved == [("Busy", 1), ("Busy", 6)]
+    assert results == [True] * 6
+
+def test_each_character_has_its_own_slot():
+    save = GatedSave()
+    save.gate.clear()
+    worker = SaveWorker(save=save)
+    first = engine.new_character("First", "Survivor")
+    worker.submit(first)
+    assert save.started.wait(5)
+    worker.submit(engine.new_character("Second", "Scavenger"))
+    worker.submit(engine.new_character("Third", "Trader"))
+    save.gate.set()
+
+    assert worker.flush(5)
+    assert sorted(name for name, _ in save.saved) == ["First", "Second", "Third"]
+
+def test_the_snapshot_is_taken_at_submit_time():
+    save = GatedSave()
+    save.gate.clear()
+    worker = SaveWorker(save=save)
+    character = engine.new_character("Moving", "Survivor")
+    worker.submit(character)
+    character.current_day = 9  # Changes after submit don't reach the save
+    save.gate.set()
+
+    assert worker.flush(5)
+    assert save.saved == [("Moving", 1)]
+
+def test_errors_are_reported_to_the_callback():
+    def failing(snapshot):
+        raise OSError("disk full")
+    worker = SaveWorker(save=failing)
+    results = []
+    worker.submit(engine.new_character("Unlucky", "Survivor"),
+                  on_done=lambda ok, error: results.append((ok, str(error))))
+    assert worker.flush(5)
+    assert results == [(False, "disk full")]
+
+def test_app_flushes_pending_saves_on_stop(monkeypatch):
+    import main
+    save = GatedSave(delay=0.2)
+    worker = SaveWorker(save=save)
+    monkeypatch.setattr(main, 'save_worker', worker)
+    worker.submit(engine.new_character("Closing", "Survivor"))
+
+    main.ZombieVibeApp.on_stop(None)
+    assert save.saved == [("Closing", 1)]
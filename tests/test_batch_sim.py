@@ -0,0 +1,57 @@
+# test_batch_sim.py
+import random
+
+import pytest
+
+import batch_sim
+import engine
+from character import Character
+
+MEMBERS = 200  # Per job, in every camp
+AP = 6
+DAYS = 50
+
+def camp(member_type):
+    return ([{'name': f"G{i}", 'type': member_type, 'mode': 'gather', 'ap': AP} for i in range(MEMBERS)]
+            + [{'name': f"A{i}", 'type': member_type, 'mode': 'adventure', 'ap': AP} for i in range(MEMBERS)]
+            + [{'name': "Guard", 'type': member_type, 'mode': 'guard', 'ap': AP}])
+
+def scalar_days(member_type, seed):
+    """Totals from engine.process_member_activities over DAYS days."""
+    rng = random.Random(seed)
+    character = Character("Scalar", 5, 5, 5, 5, 5)
+    character.camp_members = camp(member_type)
+    gathered = dict.fromkeys(engine.GATHERABLE_RESOURCES, 0)
+    outcomes = dict.fromkeys(batch_sim.OUTCOMES, 0)
+    for _ in range(DAYS):
+        results = engine.process_member_activities(character, rng)
+        for resource, amount in results['gathered_resources'].items():
+            gathered[resource] += amount
+        for outcome, count in results['outcome_counts'].items():
+            outcomes[outcome] += count
+    return gathered, outcomes
+
+def batch_days(member_type, seed):
+    """The same totals from one batch of DAYS identical camps."""
+    result = batch_sim.simulate_camps([camp(member_type)] * DAYS, rng=seed)
+    gathered = dict(zip(engine.GATHERABLE_RESOURCES, result.gathered.sum(axis=0).tolist()))
+    outcomes = dict(zip(batch_sim.OUTCOMES, result.outcomes.sum(axis=0).tolist()))
+    return gathered, outcomes
+
+@pytest.mark.parametrize('member_type', batch_sim.MEMBER_TYPES)
+def test_batch_agrees_with_scalar(member_type):
+    scalar_gathered, scalar_outcomes = scalar_days(member_type, 1)
+    batch_gathered, batch_outcomes = batch_days(member_type, 1)
+
+    adventures = MEMBERS * (AP // engine.ADVENTURE_AP_COST) * DAYS
+    assert sum(scalar_outcomes.values()) == sum(batch_outcomes.values()) == adventures
+    for outcome in batch_sim.OUTCOMES:
+        assert batch_outcomes[outcome] / adventures == pytest.approx(scalar_outcomes[outcome] / adventures, abs=0.02)
+    good = engine.member_adventure_chance(member_type)
+    assert batch_outcomes['good'] / adventures == pytest.approx(good, abs=0.02)
+
+    # Each attempt succeeds with the member's chance and finds 1 or 2
+    expected = MEMBERS * AP * DAYS * engine.member_gather_chance(member_type) * 1.5
+    assert sum(batch_gathered.values()) == pytest.approx(expected, rel=0.05)
+    for resource in engine.GATHERABLE_RESOURCES:
+        assert batch_gathered[resource] == pytest.approx(scalar_gathered[resource], rel=0.08)
@@ -0,0 +1,37 @@
+# test_bench.py
+import json
+
+import pytest
+
+import bench
+
+QUICK = 'character_from_presets'
+
+def test_parametrized_benchmarks_are_registered_per_value():
+    names = [name for name in bench.BENCHMARKS if name.startswith('process_member_activities')]
+    assert names == [f"process_member_activities[members={n}]" for n in (1, 10, 100, 1000)]
+
+def test_measure_reports_time_per_operation():
+    result = bench.measure(lambda: sum(range(1000)), ops=4, min_time=0.001, rounds=3)
+    assert set(result) == {'best_us', 'median_us'}
+    assert 0 < result['best_us'] <= result['median_us']
+
+def test_compare_gives_the_fractional_change():
+    baseline = {'results': {'a': {'best_us': 2.0}, 'gone': {'best_us': 1.0}}}
+    rows = bench.compare({'a': {'best_us': 3.0}, 'new': {'best_us': 1.0}}, baseline)
+    assert rows == [('a', 2.0, 3.0, pytest.approx(0.5))]
+
+def test_save_then_compare(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    bench.main([QUICK, '--save', '--baseline', str(path), '--min-time', '0.001'])
+    baseline = json.loads(path.read_text())
+    assert list(baseline['results']) == [QUICK]
+    assert baseline['environment'] == bench.environment()
+
+    # A baseline far faster than anything real is always a regression
+    baseline['results'][QUICK]['best_us'] = 1e-9
+    path.write_text(json.dumps(baseline))
+    with pytest.raises(SystemExit) as exit_info:
+        bench.main([QUICK, '--compare', '--baseline', str(path), '--min-time', '0.001'])
+    assert exit_info.value.code == 1
+    assert "REGRESSION" in capsys.readouterr().out
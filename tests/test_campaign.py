@@ -0,0 +1,29 @@
+# test_campaign.py
+from dataclasses import asdict
+
+import pytest
+
+import campaign
+
+def test_results_do_not_depend_on_worker_count():
+    runs = [
+        campaign.run_sweep(campaigns=24, days=5, seed=7, workers=workers, chunk_size=5)
+        for workers in (1, 2, 4)
+    ]
+    assert runs[0].campaigns == 24
+    assert asdict(runs[0]) == asdict(runs[1]) == asdict(runs[2])
+
+def test_results_do_not_depend_on_chunk_size():
+    # Every campaign seeds its own generator from its index
+    whole = campaign.run_sweep(campaigns=12, days=5, seed=3, workers=1, chunk_size=12)
+    split = campaign.run_sweep(campaigns=12, days=5, seed=3, workers=1, chunk_size=5)
+    assert asdict(whole) == asdict(split)
+
+def test_seed_changes_results():
+    first = campaign.run_sweep(campaigns=10, days=5, seed=1, workers=1)
+    second = campaign.run_sweep(campaigns=10, days=5, seed=2, workers=1)
+    assert asdict(first) != asdict(second)
+
+def test_unknown_preset_is_refused():
+    with pytest.raises(ValueError):
+        campaign.run_sweep(campaigns=1, days=1, preset_name="Nobody")
@@ -0,0 +1,44 @@
+# test_catalog.py
+import random
+from collections import Counter
+
+import pytest
+
+import catalog
+
+DRAWS = 30000
+
+@pytest.mark.parametrize('source', sorted(catalog.CATALOG))
+def test_sample_matches_the_weights(source):
+    rng = random.Random(14)
+    counts = Counter(catalog.sample(source, rng) for _ in range(DRAWS))
+    assert set(counts) <= set(catalog.CATALOG[source])
+    for entry, p in catalog.probabilities(source).items():
+        assert counts[entry] / DRAWS == pytest.approx(p, abs=0.015), entry.name
+
+def test_probabilities_follow_rarity():
+    probabilities = catalog.probabilities('Hospital')
+    assert sum(probabilities.values()) == pytest.approx(1.0)
+    by_rarity = {e.rarity: p for e, p in probabilities.items()}
+    assert by_rarity == {'common': 0.6, 'uncommon': 0.3, 'rare': 0.1}
+
+def test_sample_is_repeatable_for_a_seed():
+    first, second = random.Random(3), random.Random(3)
+    assert ([catalog.sample(catalog.TRADER, first) for _ in range(20)]
+            == [catalog.sample(catalog.TRADER, second) for _ in range(20)])
+
+def test_rolled_values_stay_in_range():
+    rng = random.Random(1)
+    for entry in catalog.CATALOG[catalog.TRADER]:
+        low, high = entry.value_range
+        assert all(low <= entry.roll_value(rng) <= high for _ in range(50))
+        assert entry.mean_value == (low + high) / 2
+
+def test_made_treasures_share_catalog_strings():
+    entry = catalog.sample('Hospital', random.Random(0))
+    treasure = entry.make(day=3)
+    assert treasure.name is entry.name
+    assert (treasure.value, treasure.day_found) == (entry.value, 3)
+    assert catalog.lookup(entry.name) is entry
+    assert catalog.lookup("Not A Treasure") is None
+    assert catalog.shared("".join(entry.description)) is entry.description
@@ -0,0 +1,23 @@
+# test_character.py
+from character import DEFAULT_SHOP_PRICES, Character
+
+def test_whole_prices_come_back_as_ints():
+    character = Character("Prices", 5, 5, 5, 5, 5)
+    character.shop_prices = DEFAULT_SHOP_PRICES
+    assert character.shop_prices.copy() == DEFAULT_SHOP_PRICES
+    assert type(character.shop_prices['food']['water']) is int
+    assert f"{character.shop_prices['food']['water']}" == "1"
+    assert character.shop_prices['food']['rope'] == 0.5
+
+def test_observers_hear_about_ap_and_day():
+    character = Character("Watched", 5, 5, 5, 5, 5)
+    changes = []
+    character.subscribe(lambda c, field: changes.append(field))
+    character.current_ap -= 1
+    character.current_ap = character.current_ap  # Unchanged, so no notification
+    character.current_day += 1
+    character.money += 10
+    assert changes == ['current_ap', 'current_day']
+
+    character.copy().current_ap -= 1
+    assert changes == ['current_ap', 'current_day']
@@ -0,0 +1,79 @@
+# test_gamelog.py
+import logging
+import sys
+import threading
+
+import pytest
+
+import gamelog
+
+@pytest.fixture
+def hooks(monkeypatch):
+    """Stand-in excepthooks, put back after the test."""
+    called = []
+    monkeypatch.setattr(sys, 'excepthook', lambda *exc: called.append('main'))
+    monkeypatch.setattr(threading, 'excepthook', lambda args: called.append('thread'))
+    gamelog.setup()
+    gamelog.ring.records.clear()
+    return called
+
+def test_ring_keeps_only_the_newest_records():
+    ring = gamelog.RingBuffer(capacity=3)
+    ring.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger('zombievibe.test_ring')
+    logger.propagate = False
+    logger.addHandler(ring)
+    try:
+        for day in range(5):
+            logger.warning("Day %s", day)
+    finally:
+        logger.removeHandler(ring)
+
+    assert [record.getMessage() for record in ring.records] == ["Day 2", "Day 3", "Day 4"]
+
+    class Stream:
+        text = ""
+        def write(self, s):
+            self.text += s
+    stream = Stream()
+    ring.dump(stream)
+    assert stream.text == "Day 2\nDay 3\nDay 4\n"
+
+def test_records_below_the_level_are_skipped(hooks):
+    gamelog.setup(level=logging.INFO)
+    try:
+        gamelog.log.debug("Not kept %s", 1)
+        gamelog.log.info("Kept %s", 2)
+    finally:
+        gamelog.setup()
+    assert [record.getMessage() for record in gamelog.ring.records] == ["Kept 2"]
+
+def test_crash_dump_writes_the_ring(hooks, tmp_path):
+    path = tmp_path / "crash.log"
+    gamelog.install_crash_dump(path)
+    gamelog.log.debug("Gathered %s wood", 3)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        sys.excepthook(*sys.exc_info())
+
+    text = path.read_text()
+    assert "DEBUG   zombievibe: Gathered 3 wood" in text
+    assert "Unhandled exception" in text
+    assert "RuntimeError: boom" in text
+    assert hooks == ['main']  # The previous hook still runs
+
+def test_crash_dump_covers_threads(hooks, tmp_path):
+    path = tmp_path / "crash.log"
+    gamelog.install_crash_dump(path)
+
+    def fail():
+        raise ValueError("from the worker")
+    thread = threading.Thread(target=fail, name="save-worker")
+    thread.start()
+    thread.join()
+
+    text = path.read_text()
+    assert "Unhandled exception in save-worker" in text
+    assert "ValueError: from the worker" in text
+    assert hooks == ['thread']
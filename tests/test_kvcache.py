@@ -0,0 +1,50 @@
+# test_kvcache.py
+import pickle
+
+import pytest
+
+import kvcache
+
+KV = """#:set kvcache_test_value 42
+
+<KvCacheTestLabel@Label>:
+    text: str(kvcache_test_value)
+"""
+
+def test_directives_survive_a_cache_hit(tmp_path):
+    from kivy.lang import Builder, global_idmap
+
+    kv = tmp_path / 'directives.kv'
+    kv.write_text(KV)
+    try:
+        kvcache.load_file(kv)  # Parsed, and stored in the cache
+        assert global_idmap['kvcache_test_value'] == 42
+        assert kvcache.cache_path(kv, kv.read_bytes()).exists()
+
+        Builder.unload_file(str(kv))
+        del global_idmap['kvcache_test_value']
+
+        kvcache.load_file(kv)  # From the cache this time
+        assert global_idmap['kvcache_test_value'] == 42
+    finally:
+        Builder.unload_file(str(kv))
+        global_idmap.pop('kvcache_test_value', None)
+
+@pytest.mark.parametrize('cached', [
+    b"not a pickle",
+    pickle.dumps(list(range(100)))[:20],  # Cut short
+    b"cno_such_module\nParser\n.",  # Pickled by a version with other classes
+    pickle.dumps({'rules': []})  # Something that isn't a parser
+], ids=['garbage', 'truncated', 'missing class', 'wrong type'])
+def test_bad_cache_entries_are_parsed_again(tmp_path, cached):
+    kv = tmp_path / 'stale.kv'
+    kv.write_text("<KvCacheStaleLabel@Label>:\n    text: 'fresh'\n")
+    path = kvcache.cache_path(kv, kv.read_bytes())
+    path.parent.mkdir()
+    path.write_bytes(cached)
+
+    parser = kvcache.load_parser(kv)
+    assert list(parser.dynamic_classes) == ['KvCacheStaleLabel']
+    # The bad entry was replaced by a good one
+    with open(path, 'rb') as f:
+        assert list(pickle.load(f).dynamic_classes) == ['KvCacheStaleLabel']
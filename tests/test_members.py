@@ -0,0 +1,79 @@
+# test_members.py
+import pytest
+
+from character import MEMBER_MODES, Character, MemberRegistry
+
+def camp():
+    registry = MemberRegistry()
+    for name, member_type, mode in [("Ann", "Scout", 'adventure'), ("Bob", "Trader", 'gather'),
+                                    ("Cy", "Doctor", 'guard'), ("Dee", "Scout", 'adventure')]:
+        registry.add(name, member_type, mode, 3)
+    return registry
+
+def test_ids_stay_stable_after_a_remove():
+    registry = camp()
+    registry.remove(1)
+    assert [m.id for m in registry] == [0, 2, 3]
+    assert registry.get(3)['name'] == "Dee"
+    assert len(registry) == 3
+    with pytest.raises(KeyError):
+        registry.get(1)
+    with pytest.raises(KeyError):
+        registry.remove(1)
+    # New members never take a departed member's id
+    assert registry.add("Eve", "Engineer") == 4
+
+def test_modes_keep_join_order():
+    registry = camp()
+    registry.add("Eve", "Engineer", 'adventure')
+    assert [m['name'] for m in registry.in_mode('adventure')] == ["Ann", "Dee", "Eve"]
+
+    registry.set_mode(0, 'guard')
+    registry.set_mode(0, 'adventure')  # Back again, still first
+    assert registry.ids_in_mode('adventure') == [0, 3, 4]
+    assert {mode: registry.count_in_mode(mode) for mode in MEMBER_MODES} == {
+        'gather': 1, 'adventure': 3, 'guard': 1}
+
+def test_member_views_update_the_indexes():
+    registry = camp()
+    member = registry.get(1)
+    member['mode'] = 'guard'
+    member['ap'] = 5
+    assert registry.ids_in_mode('guard') == [1, 2]
+    assert registry.ids_in_mode('gather') == []
+    assert dict(member) == {'name': "Bob", 'type': "Trader", 'mode': 'guard', 'ap': 5}
+
+    member['name'] = "Rob"
+    assert registry.named("Bob") == []
+    assert [m.id for m in registry.named("Rob")] == [1]
+    with pytest.raises(KeyError):
+        member['hunger'] = 3
+
+def test_rename_keeps_duplicate_names_apart():
+    registry = camp()
+    registry.rename(3, "Ann")
+    assert sorted(m.id for m in registry.named("Ann")) == [0, 3]
+    registry.remove(0)
+    assert [m.id for m in registry.named("Ann")] == [3]
+    assert registry.named("Dee") == []
+
+def test_copy_is_independent():
+    registry = camp()
+    registry.remove(2)
+    clone = registry.copy()
+    clone.set_mode(0, 'gather')
+    clone.rename(1, "Rob")
+    clone.add("Eve", "Engineer")
+
+    assert registry.ids_in_mode('adventure') == [0, 3]
+    assert [m['name'] for m in registry] == ["Ann", "Bob", "Dee"]
+    assert [m.id for m in clone] == [0, 1, 3, 4]
+    assert clone.ids_in_mode('gather') == [0, 1, 4]
+
+def test_character_accepts_member_dicts():
+    character = Character("Leader", 5, 5, 5, 5, 5)
+    members = [{'name': "Ann", 'type': "Scout", 'mode': 'guard', 'ap': 2}]
+    character.camp_members = members
+    assert isinstance(character.camp_members, MemberRegistry)
+    assert character.camp_members.as_dicts() == members
+    assert [m['name'] for m in character.camp_members.in_mode('guard')] == ["Ann"]
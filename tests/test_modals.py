@@ -0,0 +1,84 @@
+# test_modals.py
+import pytest
+
+from modals import ModalQueue
+
+@pytest.fixture
+def modals():
+    from kivy.core.window import Window
+    queue = ModalQueue(schedule=lambda fn: fn(), animate=False)
+    queue.attach(Window)
+    yield queue
+    for view in list(queue.open_views):
+        view.dismiss(force=True, animation=False)
+    Window.unbind(children=queue._on_children)
+
+def view():
+    from kivy.uix.modalview import ModalView
+    view = ModalView()
+    view.open(animation=False)
+    return view
+
+def test_followups_run_before_steps_waiting_for_idle(modals):
+    calls = []
+    first, second = view(), view()
+    modals.when_idle(lambda: calls.append('idle'))
+    modals.after(first, lambda: calls.append('after first'))
+    assert calls == []
+
+    first.dismiss(animation=False)
+    assert calls == ['after first']  # second is still open
+    assert modals.top is second
+
+    second.dismiss(animation=False)
+    assert calls == ['after first', 'idle']
+    assert modals.idle
+
+def test_popup_opened_by_a_followup_holds_back_idle_steps(modals):
+    calls = []
+    first = view()
+    modals.when_idle(lambda: calls.append('idle'))
+    modals.after(first, lambda: calls.append(view()))
+
+    first.dismiss(animation=False)
+    second = calls[0]
+    assert modals.top is second
+    second.dismiss(animation=False)
+    assert calls[1:] == ['idle']
+
+def test_queued_popup_opens_once_the_screen_is_clear(modals):
+    from kivy.uix.modalview import ModalView
+    first, queued = view(), ModalView()
+    modals.queue(queued)
+    assert not queued._is_open
+
+    first.dismiss(animation=False)
+    assert queued._is_open
+    assert modals.top is queued
+
+def test_cancelled_dismiss_keeps_the_popup_open(modals):
+    calls = []
+    popup = view()
+    popup.bind(on_dismiss=lambda view: True)  # Refuses to close
+    modals.after(popup, lambda: calls.append('after'))
+
+    popup.dismiss(animation=False)
+    assert popup._is_open
+    assert modals.top is popup
+    assert calls == []
+
+    popup.dismiss(force=True, animation=False)
+    assert calls == ['after']
+    assert modals.idle
+
+def test_close_all_drops_queued_steps(modals):
+    calls = []
+    first, second = view(), view()
+    modals.after(first, lambda: calls.append('after'))
+    modals.when_idle(lambda: calls.append('idle'))
+
+    modals.close_all()
+    for popup in (first, second):
+        popup._anim_alpha = 0  # Finish the fade out
+    assert calls == []
+    assert modals.idle
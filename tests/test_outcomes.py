@@ -0,0 +1,43 @@
+# test_outcomes.py
+import random
+from collections import Counter
+
+import pytest
+
+import engine
+import outcomes
+
+TRIALS = 20000
+
+@pytest.mark.parametrize('preset', ["Survivor", "Scavenger", "Fighter"])
+@pytest.mark.parametrize('location_type', list(engine.LOCATIONS))
+def test_probabilities_match_rolled_outcomes(preset, location_type):
+    rng = random.Random(f"{preset}:{location_type}")
+    location = engine.LOCATIONS[location_type][0]
+
+    rolled = Counter()
+    for _ in range(TRIALS):
+        # A fresh character each time, so nothing found carries over
+        character = engine.new_character("Roller", preset)
+        rolled[engine.determine_outcome(character, location_type, location, rng).outcome] += 1
+
+    expected = outcomes.outcome_probabilities(engine.new_character("Roller", preset), location_type)
+    assert sum(expected.values()) == pytest.approx(1.0)
+    for outcome, p in expected.items():
+        assert rolled[outcome] / TRIALS == pytest.approx(p, abs=0.015)
+
+def test_probabilities_are_clamped_for_extreme_stats():
+    # Skill bonuses big enough to push every regular roll past the good threshold
+    character = engine.new_character("Maxed", "Survivor")
+    character.scavenging = character.charisma = 60
+    probabilities = outcomes.outcome_probabilities(character, 'city')
+    assert all(0.0 <= p <= 1.0 for p in probabilities.values())
+    assert sum(probabilities.values()) == pytest.approx(1.0)
+    assert probabilities['bad'] == 0.0
+
+def test_distribution_uses_the_same_probabilities():
+    character = engine.new_character("Planner", "Scavenger")
+    for location_type, locations in engine.LOCATIONS.items():
+        distribution = outcomes.adventure_distribution(character, location_type, locations[0])
+        expected = outcomes.outcome_probabilities(character, location_type)
+        assert {name: o.probability for name, o in distribution.outcomes.items()} == pytest.approx(expected)
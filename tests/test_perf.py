@@ -0,0 +1,35 @@
+# test_perf.py
+import threading
+
+import pytest
+
+import perf
+
+def test_percentiles_use_the_window():
+    histogram = perf.Histogram(size=100)
+    for ms in range(1, 201):
+        histogram.add(ms / 1000)
+    assert histogram.percentiles() == pytest.approx([0.15, 0.195, 0.199])
+    summary = histogram.summary()
+    assert summary['count'] == 200
+    assert summary['max_ms'] == 200.0
+    assert perf.Histogram().summary()['p99_ms'] == 0.0
+
+def test_reads_while_another_thread_records():
+    histogram = perf.Histogram(size=50)
+    done = threading.Event()
+
+    def record():
+        while not done.is_set():
+            histogram.add(0.001)
+    worker = threading.Thread(target=record)
+    worker.start()
+    try:
+        for _ in range(2000):
+            histogram.summary()
+    finally:
+        done.set()
+        worker.join()
+    count, samples = histogram.snapshot()
+    assert count == histogram.count
+    assert samples == list(histogram.samples)
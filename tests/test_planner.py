@@ -0,0 +1,22 @@
+# test_planner.py
+import random
+from collections import Counter
+
+import engine
+import planner
+
+def test_gather_outcomes_match_the_game():
+    rng = random.Random(0)
+    character = engine.new_character("Planner", "Survivor")
+    trials = 20000
+    found = Counter()
+    for _ in range(trials):
+        character.current_ap = engine.GATHER_AP_COST
+        before = character.resources['wood']
+        engine.gather_resource(character, 'wood', rng)
+        found[character.resources['wood'] - before] += 1
+
+    expected = dict((amount, p) for p, amount in planner._gather_outcomes(character.scavenging))
+    assert found.keys() == expected.keys()
+    for amount, p in expected.items():
+        assert abs(found[amount] / trials - p) < 0.015
@@ -0,0 +1,23 @@
+# test_savedb.py
+import engine
+import saves
+import savedb
+
+def test_index_entries_match_the_file_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(saves, '_saved', {})
+    monkeypatch.setattr(saves, '_indexes', {})
+    character = engine.new_character("Indexed", "Survivor")
+
+    saves.save_file(character, tmp_path / "files")
+    file_entry = saves.read_index(tmp_path / "files")["Indexed"]
+
+    store = savedb.SqliteStore(tmp_path / "db" / saves.DB_FILE)
+    try:
+        store.save_character(character)
+        db_entry = store.read_index()["Indexed"]
+        assert db_entry.keys() == file_entry.keys()
+        assert db_entry['size'] > 0
+        assert store.saves_past_day(0) == [db_entry]
+        assert store.load_character(db_entry['name']).name == "Indexed"
+    finally:
+        store.close()
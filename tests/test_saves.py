@@ -0,0 +1,96 @@
+# test_saves.py
+import json
+
+import pytest
+
+import engine
+import migrations
+import savecodec
+import saves
+from character import Character, Treasure
+
+V0_SAVE = {
+    "name": "Old Timer",
+    "endurance": 6, "scavenging": 5, "charisma": 4, "combat": 3, "crafting": 2,
+    "resources": {"wood": 7, "water": 1, "food": 2, "rope": 3},
+    "current_day": 4
+}
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    # Module-level caches are keyed by path, but start each test clean anyway
+    monkeypatch.setattr(saves, '_saved', {})
+    monkeypatch.setattr(saves, '_indexes', {})
+    return tmp_path
+
+def played_character():
+    character = engine.new_character("Round Trip", "Trader")
+    character.resources['wood'] = 12
+    character.current_day = 9
+    character.money = 250
+    character.base_upgrades.append("Shop Counter")
+    character.camp_members.append({'name': "Ann", 'type': "Scout", 'mode': 'adventure', 'ap': 4})
+    gem = Treasure("Gem", "Valuable", 100, "Hospital", "Shiny", 3)
+    character.treasures.extend([gem, Treasure("Map", "Document", 20, "Mall", "Old", 5)])
+    character.shop_treasures.append(gem)
+    return character
+
+def test_v0_save_is_upgraded_and_written_back(save_dir):
+    path = save_dir / "Old Timer.json"
+    path.write_text(json.dumps(V0_SAVE))
+
+    character = saves.load_file(path)
+    defaults = saves.character_to_dict(Character("Defaults", 0, 0, 0, 0, 0))
+    assert character.current_day == 4
+    assert character.resources['wood'] == 7
+    assert character.money == 100
+    assert saves.character_to_dict(character)['shop_prices'] == defaults['shop_prices']
+    assert list(character.treasures) == []
+
+    data = json.loads(path.read_text())
+    assert data['version'] == migrations.SAVE_VERSION == 2
+    assert not migrations.upgrade(data)  # Nothing left to run on the next load
+
+def test_migrations_start_from_the_saved_version(save_dir):
+    # A version 1 save already has every field version 0 was missing; only
+    # the economy is added
+    data = dict(V0_SAVE, version=1, current_ap=3, base_upgrades=["Shop Counter"], camp_members=[],
+                objectives_completed={}, shop_inventory={"wood": 2}, treasures=[], shop_treasures=[])
+    assert migrations.upgrade(data)
+    assert data['version'] == 2
+    assert data['current_ap'] == 3
+    assert data['shop_inventory'] == {"wood": 2}
+    assert data['money'] == 100
+
+def test_newer_save_is_refused(save_dir):
+    path = save_dir / "Future.json"
+    path.write_text(json.dumps(dict(V0_SAVE, name="Future", version=migrations.SAVE_VERSION + 1)))
+    with pytest.raises(ValueError):
+        saves.load_file(path)
+
+@pytest.mark.parametrize('fmt', ['json', 'binary'])
+def test_snapshots_are_written_at_the_current_version(save_dir, monkeypatch, fmt):
+    monkeypatch.setattr(saves, 'SNAPSHOT_FORMAT', fmt)
+    character = played_character()
+
+    path = saves.write_snapshot(character, save_dir)
+    raw = path.read_bytes()
+    if fmt == 'binary':
+        assert savecodec.version(raw) == savecodec.SCHEMA_VERSION
+    else:
+        assert json.loads(raw)['version'] == migrations.SAVE_VERSION
+
+    saves._saved.clear()  # Load from the file, not from memory
+    loaded = saves.load_file(path)
+    assert saves.character_to_dict(loaded) == saves.character_to_dict(character)
+
+def test_upgraded_save_stays_where_the_index_points(save_dir, monkeypatch):
+    monkeypatch.setattr(saves, 'SNAPSHOT_FORMAT', 'binary')
+    (save_dir / "Old Timer.json").write_text(json.dumps(V0_SAVE))
+
+    for _ in range(2):  # The first load upgrades the file, the second reads the upgrade
+        entry = saves.read_index(save_dir)["Old Timer"]
+        character = saves.load_character(saves.entry_key(entry, save_dir), save_dir)
+        assert character.current_day == 4
+        assert character.resources['wood'] == 7
+    assert json.loads((save_dir / "Old Timer.json").read_text())['version'] == migrations.SAVE_VERSION
@@ -0,0 +1,26 @@
+# test_startup.py
+import pytest
+
+import startup
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [10.0]
+    monkeypatch.setattr(startup.time, 'perf_counter', lambda: now[0])
+    monkeypatch.setattr(startup, '_last', 10.0)
+    monkeypatch.setattr(startup, 'timings', {})
+    return now
+
+def test_each_mark_times_the_stage_since_the_last(clock):
+    for stage, seconds in [('import', 0.5), ('kv load', 0.1), ('build', 0.25)]:
+        clock[0] += seconds
+        startup.mark(stage)
+    assert startup.timings == {'import': 0.5, 'kv load': pytest.approx(0.1), 'build': 0.25}
+    assert startup.total() == pytest.approx(0.85)
+
+def test_report_lists_stages_in_startup_order(clock):
+    clock[0] += 0.002
+    startup.mark('first frame')
+    clock[0] += 0.3
+    startup.mark('import')
+    assert startup.report() == "Startup: import 300ms, first frame 2ms (total 302ms)"
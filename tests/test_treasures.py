@@ -0,0 +1,77 @@
+# test_treasures.py
+import dataclasses
+
+import pytest
+
+from character import Character, Treasure, TreasureInventory
+
+GEM = Treasure("Gem", "Valuable", 100, "Hospital", "Shiny", 3)
+MAP = Treasure("Map", "Document", 20, "Mall", "Old", 5)
+WATCH = Treasure("Watch", "Luxury", 60, "Mall", "Ticking", 2)
+
+def test_treasures_are_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        GEM.value = 1
+    assert GEM == Treasure("Gem", "Valuable", 100, "Hospital", "Shiny", 3)
+
+def test_remove_takes_the_oldest_equal_copy():
+    inventory = TreasureInventory([GEM, MAP, GEM])
+    first, _, last = (tid for tid, _ in inventory.items())
+    assert inventory.id_of(GEM) == first
+
+    inventory.remove(GEM)
+    assert [tid for tid, _ in inventory.items()] == [1, last]
+    assert list(inventory) == [MAP, GEM]
+    assert inventory.count(GEM) == 1
+
+    inventory.remove(GEM)
+    assert GEM not in inventory
+    with pytest.raises(ValueError):
+        inventory.remove(GEM)
+
+def test_pop_by_id():
+    inventory = TreasureInventory()
+    ids = [inventory.add(t) for t in (GEM, MAP, WATCH)]
+    assert inventory.pop(ids[1]) is MAP
+    assert list(inventory) == [GEM, WATCH]
+    assert inventory.get(ids[2]) is WATCH
+    with pytest.raises(KeyError):
+        inventory.pop(ids[1])
+    # Ids are never reused
+    assert inventory.add(MAP) == 3
+
+def test_category_and_value_queries():
+    inventory = TreasureInventory([GEM, MAP, WATCH, MAP])
+    assert inventory.categories() == ["Valuable", "Document", "Luxury"]
+    assert inventory.by_category("Document") == [MAP, MAP]
+    assert inventory.by_category("Medical") == []
+    assert inventory.by_value() == [MAP, MAP, WATCH, GEM]
+    assert inventory.by_value(20, 60) == [MAP, MAP, WATCH]
+    assert inventory.by_value(low=61) == [GEM]
+    assert inventory.by_value(high=19) == []
+    assert inventory.most_valuable() == [GEM]
+    assert inventory.most_valuable(2) == [GEM, WATCH]
+    assert inventory.most_valuable(0) == []
+
+    inventory.remove(MAP)
+    inventory.pop(inventory.id_of(WATCH))
+    assert inventory.categories() == ["Valuable", "Document"]
+    assert inventory.by_value() == [MAP, GEM]
+
+def test_total_value_is_kept_up_to_date():
+    inventory = TreasureInventory([GEM, MAP])
+    assert inventory.total_value == 120
+    inventory.add(WATCH)
+    assert inventory.total_value == 180
+    inventory.remove(GEM)
+    assert inventory.total_value == 80
+    assert inventory.total_value == sum(t.value for t in inventory)
+
+def test_character_wraps_assigned_lists():
+    character = Character("Collector", 5, 5, 5, 5, 5)
+    character.treasures = [GEM, MAP]
+    character.shop_treasures = [WATCH]
+    assert isinstance(character.treasures, TreasureInventory)
+    assert isinstance(character.shop_treasures, TreasureInventory)
+    assert list(character.treasures) == [GEM, MAP]
+    assert character.shop_treasures.total_value == 60